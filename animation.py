@@ -0,0 +1,156 @@
+import time
+import tkinter as tk
+from typing import Callable
+
+from perf import Profiler
+
+TARGET_FPS = 60
+
+StepFn = Callable[[float], None]
+
+
+class Animation:
+    # step(elapsed_s) is called once per frame; animations with a duration
+    # get a final step(duration) call and then on_end.
+
+    __slots__ = ('handle', 'step', 'duration', 'on_end', 'group', 'name', 'start')
+
+    def __init__(self, handle: int, step: StepFn, duration: float | None,
+                 on_end: Callable[[], None] | None, group: str, name: str,
+                 start: float) -> None:
+        self.handle = handle
+        self.step = step
+        self.duration = duration
+        self.on_end = on_end
+        self.group = group
+        self.name = name
+        self.start = start
+
+
+class FrameClock:
+    # One after() timer drives every registered animation at a fixed
+    # target rate. Animations see elapsed monotonic time, not frame counts,
+    # so they keep their real-time duration when ticks arrive late.
+
+    def __init__(self, root: tk.Misc, fps: int = TARGET_FPS,
+                 now: Callable[[], float] = time.monotonic,
+                 profiler: Profiler | None = None) -> None:
+        self.root = root
+        self.profiler = profiler
+        self.period = 1.0 / fps
+        self.now = now
+        self.animations: dict[int, Animation] = {}
+        self.frame = 0
+        self.frame_time = now()
+        self.paused = False
+        self._next_handle = 1
+        self._after_id: str | None = None
+        self._paused_at = 0.0
+        self._next_tick = 0.0
+        self._ticking = False
+        # Called with the ms between consecutive ticks of one unbroken run
+        self.on_frame: Callable[[float], None] | None = None
+        self._last_tick: float | None = None
+
+    def animate(self, step: StepFn, duration: float | None = None,
+                on_end: Callable[[], None] | None = None, group: str = 'effects',
+                name: str | None = None) -> int:
+        handle = self._next_handle
+        self._next_handle += 1
+        start = self._paused_at if self.paused else self.now()
+        if self.profiler is not None and name is not None:
+            step = self.profiler.timed(name, step)
+        self.animations[handle] = Animation(handle, step, duration, on_end, group,
+                                            name or group, start)
+        self._ensure_running()
+        return handle
+
+    def cancel(self, handle: int, finish: bool = True) -> None:
+        # finish=True runs on_end so the effect can delete its canvas items
+        anim = self.animations.pop(handle, None)
+        if anim is not None and finish and anim.on_end is not None:
+            anim.on_end()
+
+    def cancel_group(self, group: str, finish: bool = True) -> None:
+        for handle in [h for h, a in self.animations.items() if a.group == group]:
+            self.cancel(handle, finish)
+
+    def cancel_all(self, finish: bool = True) -> None:
+        for handle in list(self.animations):
+            self.cancel(handle, finish)
+
+    def pause(self) -> None:
+        if self.paused:
+            return
+        self.paused = True
+        self._paused_at = self.now()
+        self._cancel_timer()
+
+    def resume(self) -> None:
+        if not self.paused:
+            return
+        # Shift start times so animations continue where they froze
+        shift = self.now() - self._paused_at
+        for anim in self.animations.values():
+            anim.start += shift
+        self.paused = False
+        self._ensure_running()
+
+    def stop(self) -> None:
+        self.cancel_all()
+        self._cancel_timer()
+
+    def _cancel_timer(self) -> None:
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _ensure_running(self) -> None:
+        if (self._after_id is None and not self._ticking and not self.paused
+                and self.animations):
+            self._next_tick = self.now()
+            self._last_tick = None
+            self._after_id = self.root.after_idle(self._tick)
+
+    def advance(self) -> None:
+        # Step every animation once at the current time (one frame)
+        now = self.now()
+        self.frame += 1
+        self.frame_time = now
+        self._ticking = True
+        try:
+            for anim in list(self.animations.values()):
+                if anim.handle not in self.animations:
+                    continue
+                elapsed = now - anim.start
+                if anim.duration is not None and elapsed >= anim.duration:
+                    del self.animations[anim.handle]
+                    anim.step(anim.duration)
+                    if anim.on_end is not None:
+                        anim.on_end()
+                else:
+                    anim.step(elapsed)
+        finally:
+            self._ticking = False
+
+    def _tick(self) -> None:
+        self._after_id = None
+        if self.profiler is not None:
+            self.profiler.record_lateness('frame', (self.now() - self._next_tick) * 1000)
+            t0 = time.perf_counter()
+            self.advance()
+            self.profiler.record('frame', (time.perf_counter() - t0) * 1000)
+        else:
+            self.advance()
+        now = self.frame_time
+        if self.on_frame is not None and self._last_tick is not None:
+            self.on_frame((now - self._last_tick) * 1000)
+        self._last_tick = now
+        if self.animations and not self.paused:
+            # Aim at fixed deadlines; a late frame shortens the next wait and
+            # a frame more than one period late drops the missed deadlines
+            self._next_tick += self.period
+            if self._next_tick <= now:
+                self._next_tick = now + self.period
+            delay = max(1, int((self._next_tick - self.now()) * 1000))
+            self._after_id = self.root.after(delay, self._tick)
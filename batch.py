@@ -0,0 +1,143 @@
+import argparse
+import itertools
+import json
+import sys
+import time
+
+import numpy as np
+
+from core import GRID_COLS, GRID_ROWS, MOLE_INTERVAL_MS, MOLE_VISIBLE_MS, TARGET_SCORE
+
+# Hole buttons are 100 px images with 12 px padding on every side
+HOLE_SIZE_PX = 100
+HOLE_PITCH_PX = 124
+
+# Player model: log-normal base reaction time plus Fitts' law movement
+# time between consecutive holes, and an independent stray-click rate.
+REACTION_MEDIAN_MS = 350.0
+REACTION_SIGMA = 0.35
+FITTS_A_MS = 50.0
+FITTS_B_MS = 150.0
+MISCLICK_RATE = 0.05
+
+# Bound the (games x rounds) working set per step
+CHUNK_CELLS = 4_000_000
+
+
+def simulate_batch(n_games: int, visible_ms: float = MOLE_VISIBLE_MS,
+                   interval_ms: float = MOLE_INTERVAL_MS, target_score: int = TARGET_SCORE,
+                   rows: int = GRID_ROWS, cols: int = GRID_COLS,
+                   reaction_median_ms: float = REACTION_MEDIAN_MS,
+                   reaction_sigma: float = REACTION_SIGMA, misclick_rate: float = MISCLICK_RATE,
+                   max_rounds: int | None = None, seed: int | None = None) -> dict[str, np.ndarray]:
+    # Vectorised version of GameCore's rules: one row per game, one column
+    # per spawn. A mole is hit if the player's reaction lands before it
+    # hides (its visible time, or the next spawn if that comes first).
+    rng = np.random.default_rng(seed)
+    max_rounds = max_rounds or target_score * 20
+    window_ms = min(visible_ms, interval_ms)
+    block = max(8, 2 * target_score)
+
+    won = np.zeros(n_games, dtype=bool)
+    rounds_played = np.full(n_games, max_rounds, dtype=np.int32)
+    hits = np.zeros(n_games, dtype=np.int32)
+    misses = np.zeros(n_games, dtype=np.int32)
+    duration_ms = np.full(n_games, max_rounds * interval_ms + window_ms)
+    prev_cell = rng.integers(0, rows * cols, size=n_games)
+
+    # Simulate a block of rounds at a time and keep only unfinished games,
+    # so the cost tracks the rounds actually played rather than max_rounds.
+    active = np.arange(n_games)
+    done = 0
+    while active.size and done < max_rounds:
+        width = min(block, max_rounds - done)
+        for lo in range(0, active.size, max(1, CHUNK_CELLS // width)):
+            idx = active[lo:lo + CHUNK_CELLS // width]
+            n = idx.size
+            cells = rng.integers(0, rows * cols, size=(n, width))
+            r, c = np.divmod(np.concatenate([prev_cell[idx, None], cells], axis=1), cols)
+            dist = np.hypot(np.diff(r, axis=1), np.diff(c, axis=1)) * HOLE_PITCH_PX
+            move_ms = FITTS_A_MS + FITTS_B_MS * np.log2(dist / HOLE_SIZE_PX + 1)
+            reaction_ms = move_ms + rng.lognormal(np.log(reaction_median_ms), reaction_sigma,
+                                                  size=(n, width))
+            hit = reaction_ms < window_ms
+            round_misses = (~hit).astype(np.int32) + (rng.random((n, width)) < misclick_rate)
+
+            reached = hits[idx, None] + np.cumsum(hit, axis=1, dtype=np.int32) >= target_score
+            finished = reached.any(axis=1)
+            last = np.where(finished, reached.argmax(axis=1), width - 1)
+            upto = np.arange(width) <= last[:, None]
+
+            hits[idx] += np.where(upto, hit, False).sum(axis=1)
+            misses[idx] += np.where(upto, round_misses, 0).sum(axis=1)
+            prev_cell[idx] = cells[:, -1]
+            fin = idx[finished]
+            won[fin] = True
+            rounds_played[fin] = done + last[finished] + 1
+            duration_ms[fin] = (rounds_played[fin] * interval_ms
+                                + reaction_ms[finished, last[finished]])
+        active = active[~won[active]]
+        done += width
+
+    return {'won': won, 'rounds': rounds_played, 'hits': hits,
+            'misses': misses, 'duration_ms': duration_ms}
+
+
+def summarize(result: dict[str, np.ndarray]) -> dict:
+    won = result['won']
+    duration_s = result['duration_ms'][won] / 1000
+    rounds = result['rounds'].sum()
+    summary = {
+        'games': int(won.size),
+        'rounds': int(rounds),
+        'win_rate': round(float(won.mean()), 4),
+        'hit_rate': round(float(result['hits'].sum() / max(1, rounds)), 4),
+        'mean_misses': round(float(result['misses'].mean()), 3),
+    }
+    if duration_s.size:
+        p50, p90 = np.percentile(duration_s, [50, 90])
+        summary.update(duration_p50_s=round(float(p50), 2), duration_p90_s=round(float(p90), 2))
+    return summary
+
+
+def sweep(visible: list[float], interval: list[float], target: list[int],
+          n_games: int, seed: int | None = None, **player: float) -> list[dict]:
+    rows = []
+    for v, i, t in itertools.product(visible, interval, target):
+        result = simulate_batch(n_games, visible_ms=v, interval_ms=i, target_score=t,
+                                seed=seed, **player)
+        rows.append({'visible_ms': v, 'interval_ms': i, 'target_score': t, **summarize(result)})
+    return rows
+
+
+def _floats(text: str) -> list[float]:
+    return [float(v) for v in text.split(',')]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Simulate many whack-a-mole games at once')
+    parser.add_argument('--games', type=int, default=100_000)
+    parser.add_argument('--visible', type=_floats, default=[MOLE_VISIBLE_MS],
+                        help='comma-separated MOLE_VISIBLE_MS values')
+    parser.add_argument('--interval', type=_floats, default=[MOLE_INTERVAL_MS],
+                        help='comma-separated MOLE_INTERVAL_MS values')
+    parser.add_argument('--target', type=lambda s: [int(v) for v in s.split(',')],
+                        default=[TARGET_SCORE], help='comma-separated TARGET_SCORE values')
+    parser.add_argument('--reaction-ms', type=float, default=REACTION_MEDIAN_MS)
+    parser.add_argument('--reaction-sigma', type=float, default=REACTION_SIGMA)
+    parser.add_argument('--misclick-rate', type=float, default=MISCLICK_RATE)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    rows = sweep(args.visible, args.interval, args.target, args.games, seed=args.seed,
+                 reaction_median_ms=args.reaction_ms, reaction_sigma=args.reaction_sigma,
+                 misclick_rate=args.misclick_rate)
+    json.dump({'elapsed_s': round(time.perf_counter() - t0, 3), 'results': rows},
+              sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
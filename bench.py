@@ -0,0 +1,750 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+from pathlib import Path
+from typing import Callable, Iterator
+
+from core import GameCore, VirtualClock
+from eventlog import Event, EventLogWriter, MemoryLog, Recorder, read_log, replay, session_header
+from leaderboard import GameResult, Leaderboard
+from main import CANVAS_H, CANVAS_W, CONFETTI_COLORS, WhackAMoleGame
+from particles import ParticlePool
+from quality import TIERS, QualityGovernor
+from scenery import CLOUD_ORIGINS, draw_garden, draw_garden_items, draw_sun_rays, make_cloud
+from sprites import STARTUP_SPRITES, SpriteCache, rasterize
+from stats import StreamingStats
+
+
+def _timeit(fn: Callable[[], object], repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return {
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'repeat': repeat,
+    }
+
+
+# ---------------------------------------------------------------------- #
+#  Sprites                                                                 #
+# ---------------------------------------------------------------------- #
+
+def _build_per_pixel() -> list[tk.PhotoImage]:
+    # The pre-cache approach: one PhotoImage.put round trip per pixel
+    images = []
+    for _name, draw, size, kwargs in STARTUP_SPRITES:
+        img = tk.PhotoImage(width=size, height=size)
+        for x, y, color in rasterize(draw, size, **kwargs).pixels():
+            img.put(color, (x, y))
+        images.append(img)
+    return images
+
+
+def _build_cached(cache: SpriteCache) -> list[tk.PhotoImage]:
+    return [cache.photo(name, draw, size, **kwargs)
+            for name, draw, size, kwargs in STARTUP_SPRITES]
+
+
+def bench_sprites(root: tk.Tk, repeat: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        warm = SpriteCache(Path(tmp))
+        _build_cached(warm)
+        return {
+            'per_pixel_put': _timeit(_build_per_pixel, repeat),
+            'bulk_uncached': _timeit(lambda: _build_cached(SpriteCache(enabled=False)), repeat),
+            'bulk_disk_cache': _timeit(lambda: _build_cached(warm), repeat),
+        }
+
+
+# ---------------------------------------------------------------------- #
+#  Background layering                                                     #
+# ---------------------------------------------------------------------- #
+
+def _garden_canvas(root: tk.Tk, flat: bool, cache: SpriteCache) -> tuple[tk.Toplevel, tk.Canvas]:
+    top = tk.Toplevel(root)
+    canvas = tk.Canvas(top, width=CANVAS_W, height=CANVAS_H, highlightthickness=0)
+    canvas.pack()
+    if flat:
+        # Keep a reference on the canvas so the image outlives this frame
+        canvas.image = cache.photo('garden', draw_garden, (CANVAS_W, CANVAS_H))
+        canvas.create_image(0, 0, anchor='nw', image=canvas.image)
+    else:
+        draw_garden_items(canvas, CANVAS_W, CANVAS_H)
+    draw_sun_rays(canvas)
+    for x, y in CLOUD_ORIGINS:
+        make_cloud(canvas, x, y)
+    top.update()
+    return top, canvas
+
+
+def bench_background(root: tk.Tk, repeat: int) -> dict:
+    # Redraw cost: 38 small moving items (a burst of sparkles + confetti)
+    # forcing a repaint per frame over each background variant.
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SpriteCache(Path(tmp))
+        for mode, flat in (('items', False), ('flat', True)):
+            top, canvas = _garden_canvas(root, flat, cache)
+            item_count = len(canvas.find_all())
+            movers = [canvas.create_oval(x, 200, x + 8, 208, fill='#FFD700', outline='')
+                      for x in range(40, 40 + 38 * 14, 14)]
+
+            def frames(canvas: tk.Canvas = canvas, movers: list[int] = movers) -> None:
+                for step in range(60):
+                    d = 2 if step % 2 else -2
+                    for oid in movers:
+                        canvas.move(oid, d, d)
+                    canvas.update_idletasks()
+
+            timing = _timeit(frames, repeat)
+            timing['per_frame_ms'] = round(timing['median_ms'] / 60, 4)
+            results[mode] = {'canvas_items': item_count, 'redraw_60_frames': timing}
+            top.destroy()
+    return results
+
+
+# ---------------------------------------------------------------------- #
+#  Idle animation Tcl traffic                                              #
+# ---------------------------------------------------------------------- #
+
+def _pump(root: tk.Misc, seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        root.update()
+        time.sleep(0.001)
+
+
+def _idle_game(root: tk.Tk, **options: object) -> WhackAMoleGame:
+    # A game in its own Toplevel with spawning disabled, so only the
+    # scenery animations run unless a benchmark drives the core itself
+    game = WhackAMoleGame(tk.Toplevel(root), **options)
+    game.core.game_over = True
+    # Steady state: build the decorations startup would defer
+    game._finish_startup()
+    return game
+
+
+def _virtual_time(game: WhackAMoleGame) -> list[float]:
+    # Freeze the frame clock on a value the benchmark advances by hand
+    now = [game.clock.now()]
+    game.clock.now = lambda: now[0]
+    return now
+
+
+def _run_frames(game: WhackAMoleGame, now: list[float], seconds: float) -> list[float]:
+    # Step the frame clock at 60 fps of virtual time; returns per-frame ms
+    samples = []
+    for _ in range(int(seconds * 60) + 1):
+        now[0] += 1 / 60
+        t0 = time.perf_counter()
+        game.clock.advance()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def _dist(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        'mean_ms': round(statistics.fmean(ordered), 4),
+        'p50_ms': round(ordered[len(ordered) // 2], 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        'max_ms': round(ordered[-1], 4),
+        'n': len(ordered),
+    }
+
+
+def bench_idle_calls(root: tk.Tk, repeat: int) -> dict:
+    # Steady-state Tk calls per frame with only clouds and sun rays running
+    # Pump through the bench root so the pumping itself is not counted
+    game = _idle_game(root, count_tcl_calls=True)
+    _pump(root, 0.3)
+    samples = []
+    commands: dict[str, int] = {}
+    for _ in range(repeat):
+        total0, by0 = game.tcl_calls.snapshot()
+        frame0 = game.clock.frame
+        _pump(root, 1.0)
+        total1, by1 = game.tcl_calls.snapshot()
+        frames = max(1, game.clock.frame - frame0)
+        samples.append((total1 - total0) / frames)
+        commands = {k: round(v / frames, 3) for k, v in (by1 - by0).most_common()}
+    game.close()
+    return {
+        'calls_per_frame_median': round(statistics.median(samples), 3),
+        'calls_per_frame_max': round(max(samples), 3),
+        'per_frame_by_command': commands,
+    }
+
+
+# ---------------------------------------------------------------------- #
+#  Startup, frame and effect costs                                         #
+# ---------------------------------------------------------------------- #
+
+@contextlib.contextmanager
+def _sprite_cache_dir(path: str) -> Iterator[None]:
+    previous = os.environ.get('WHACK_SPRITE_CACHE')
+    os.environ['WHACK_SPRITE_CACHE'] = path
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop('WHACK_SPRITE_CACHE', None)
+        else:
+            os.environ['WHACK_SPRITE_CACHE'] = previous
+
+
+def bench_startup(root: tk.Tk, repeat: int) -> dict:
+    # Construction through the first processed frame (the playable board),
+    # then until every deferred stage has run, with an empty and a warm
+    # sprite cache
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ('cold_cache', 'warm_cache'):
+            first, decorated = [], []
+            items = 0
+            for _ in range(repeat):
+                cache_dir = tempfile.mkdtemp(dir=tmp) if mode == 'cold_cache' else tmp
+                with _sprite_cache_dir(cache_dir):
+                    t0 = time.perf_counter()
+                    game = WhackAMoleGame(tk.Toplevel(root))
+                    game.root.update()
+                    first.append((time.perf_counter() - t0) * 1000)
+                    # Count the first frame as shown even without Expose events
+                    game._mark_interactive()
+                    while 'decorated_ms' not in game.startup:
+                        game.root.update()
+                    decorated.append((time.perf_counter() - t0) * 1000)
+                items = len(game.canvas.find_all())
+                game.close()
+            results[mode] = {'time_to_first_frame': _dist(first),
+                             'time_to_decorated': _dist(decorated), 'canvas_items': items}
+    return results
+
+
+# Fullscreen on a 1080p display and back, then a larger window and back
+RESIZE_STEPS = [(1920, 1080), (620, 760), (1240, 1520), (620, 760)]
+
+
+def bench_resize(root: tk.Tk, repeat: int) -> dict:
+    # Relayout for a sequence of window sizes: the first pass rasterizes
+    # each variant, later passes should be served by the sprite atlas
+    with tempfile.TemporaryDirectory() as tmp, _sprite_cache_dir(tmp):
+        game = _idle_game(root, board='canvas')
+        first, later = [], []
+        for n in range(repeat + 1):
+            for size in RESIZE_STEPS:
+                game._pending_size = size
+                t0 = time.perf_counter()
+                game._relayout()
+                (later if n else first).append((time.perf_counter() - t0) * 1000)
+        result = {'sizes': len(RESIZE_STEPS), 'first_pass': _dist(first),
+                  'later_passes': _dist(later) if later else None,
+                  'atlas': game.sprites.stats()}
+        game.close()
+    return result
+
+
+def bench_animation_tick(root: tk.Tk, repeat: int) -> dict:
+    # Cost of one frame of the cloud and sun-ray animations alone
+    game = _idle_game(root)
+    now = _virtual_time(game)
+    samples = []
+    for _ in range(repeat):
+        samples += _run_frames(game, now, 2.0)
+    result = {'per_tick': _dist(samples), 'canvas_items': len(game.canvas.find_all())}
+    game.close()
+    return result
+
+
+def bench_hit(root: tk.Tk, repeat: int) -> dict:
+    # A hit fires sparkles, floating text, score pulse and screen shake;
+    # measure the trigger and the frames until every effect has finished
+    game = _idle_game(root)
+    now = _virtual_time(game)
+    _run_frames(game, now, 0.1)
+    baseline = _dist(_run_frames(game, now, 1.0))
+    trigger, frames, peak_items = [], [], 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        game.on_hit(5, 0.0)
+        trigger.append((time.perf_counter() - t0) * 1000)
+        peak_items = max(peak_items, len(game.canvas.find_all()))
+        frames += _run_frames(game, now, 0.8)
+    result = {
+        'trigger': _dist(trigger),
+        'frames_during_effects': _dist(frames),
+        'idle_frames': baseline,
+        'peak_canvas_items': peak_items,
+    }
+    game.close()
+    return result
+
+
+def bench_confetti(root: tk.Tk, repeat: int) -> dict:
+    # The end_game confetti shower, without the blocking summary dialog
+    game = _idle_game(root)
+    now = _virtual_time(game)
+    trigger, frames, peak_items = [], [], 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        game._confetti()
+        trigger.append((time.perf_counter() - t0) * 1000)
+        peak_items = max(peak_items, len(game.canvas.find_all()))
+        frames += _run_frames(game, now, 2.5)
+    result = {
+        'trigger': _dist(trigger),
+        'frames_during_confetti': _dist(frames),
+        'peak_canvas_items': peak_items,
+    }
+    game.close()
+    return result
+
+
+# Particles alive at once in the renderer comparison
+RENDER_PARTICLES = [100, 400, 1000]
+
+
+def _render_frames(game: WhackAMoleGame, now: list[float], seconds: float) -> list[float]:
+    # Like _run_frames, but each frame also includes getting it on screen:
+    # Tk's idle redraw, and for the framebuffer its composite and blit
+    samples = []
+    for _ in range(int(seconds * 60) + 1):
+        now[0] += 1 / 60
+        t0 = time.perf_counter()
+        game.clock.advance()
+        game.root.update_idletasks()
+        if game.compositor is not None:
+            game.compositor.flush()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def bench_render(root: tk.Tk, repeat: int) -> dict:
+    # Frame time with many confetti-style particles in flight: canvas items
+    # redrawn by Tk against one software framebuffer with a dirty box
+    results: dict[str, dict] = {}
+    renderers = {'canvas': {'board': 'canvas'}, 'framebuffer': {'render': 'framebuffer'}}
+    for name, options in renderers.items():
+        results[name] = {}
+        for count in RENDER_PARTICLES:
+            game = _idle_game(root, count_tcl_calls=True, **options)
+            now = _virtual_time(game)
+            pool = ParticlePool(game.surface, game.clock, count, shape='rect', group='confetti')
+            rng = random.Random(0)
+            frames = []
+            calls0, _ = game.tcl_calls.snapshot()
+            for _ in range(repeat):
+                for _ in range(count):
+                    pool.spawn(rng.randint(0, game.width), rng.randint(-20, game.height // 2),
+                               vx=rng.uniform(-50, 50), vy=rng.uniform(50, 125),
+                               size=rng.randint(4, 8), life=1.0, color=rng.choice(CONFETTI_COLORS),
+                               sway=5.0, sway_freq=7.5)
+                frames += _render_frames(game, now, 1.0)
+            calls1, _ = game.tcl_calls.snapshot()
+            result = {'frames': _dist(frames),
+                      'tk_calls_per_frame': round((calls1 - calls0) / len(frames), 1)}
+            if game.compositor is not None:
+                flushes = max(1, game.compositor.flushes)
+                result['blit_kpx_per_frame'] = round(game.compositor.blit_pixels / flushes / 1000, 1)
+            results[name][str(count)] = result
+            game.close()
+    return results
+
+
+def _governor_trace(frames: list[float]) -> list[dict]:
+    # Tier changes for a sequence of frame intervals at 60 fps
+    t = [0.0]
+    changes: list[dict] = []
+    governor = QualityGovernor(1000 / 60, lambda tier: changes.append(
+        {'at_s': round(t[0] / 1000, 2), 'tier': tier.name}))
+    for interval in frames:
+        t[0] += interval
+        governor.frame(interval)
+    return changes
+
+
+def bench_quality(root: tk.Tk, repeat: int) -> dict:
+    # Tk traffic of one hit and one game-over shower at each tier, plus
+    # how the governor walks the tiers when frames slow to 25 fps for
+    # five seconds and then recover
+    tiers = {}
+    for index, tier in enumerate(TIERS):
+        game = _idle_game(root, count_tcl_calls=True)
+        game.governor.pinned = True
+        game.governor.index = index
+        game._set_quality(tier)
+        now = _virtual_time(game)
+        _run_frames(game, now, 0.1)
+        idle0, _ = game.tcl_calls.snapshot()
+        _run_frames(game, now, 1.0)
+        idle1, before = game.tcl_calls.snapshot()
+        trigger, frames = [], []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            game.on_hit(5, 0.0)
+            game._confetti()
+            trigger.append((time.perf_counter() - t0) * 1000)
+            frames += _run_frames(game, now, 2.5)
+        total, after = game.tcl_calls.snapshot()
+        tiers[tier.name] = {
+            'idle_calls_per_s': idle1 - idle0,
+            'calls_per_hit': round((total - idle1) / repeat, 1),
+            'wm_calls_per_hit': round((after - before).get('wm', 0) / repeat, 1),
+            'trigger': _dist(trigger),
+            'frames': _dist(frames),
+        }
+        game.close()
+    return {
+        'tiers': tiers,
+        'governor': _governor_trace([1000 / 60] * 120 + [40.0] * 125 + [1000 / 60] * 1800),
+    }
+
+
+def _cursor_run(root: tk.Tk, coalesce: bool, rate_hz: int, seconds: float) -> dict:
+    # Replays a high-rate mouse against a single-threaded event loop model:
+    # each motion event and each 60 fps frame runs when the loop is free,
+    # taking as long as it measurably takes. Input-to-screen latency is the
+    # gap from an event's arrival to the overlay write that shows it.
+    game = _idle_game(root, count_tcl_calls=True, coalesce_cursor=coalesce)
+    now = _virtual_time(game)
+    t_start = now[0]
+    events = [(i / rate_hz, 'motion') for i in range(int(seconds * rate_hz))]
+    frames = [(k / 60, 'frame') for k in range(int(seconds * 60) + 1)]
+    busy_until = 0.0
+    pending: list[float] = []
+    latencies: list[float] = []
+    calls0, _ = game.tcl_calls.snapshot()
+    handler_ms = 0.0
+    for t, kind in sorted(events + frames):
+        start = max(t, busy_until)
+        now[0] = t_start + start
+        t0 = time.perf_counter()
+        if kind == 'motion':
+            x = 200 + int(150 * (t * 3 % 1))
+            game._move_hammer(_MotionEvent(x, 300))
+            cost = time.perf_counter() - t0
+            handler_ms += cost * 1000
+            if coalesce:
+                pending.append(t)
+            else:
+                latencies.append((start + cost - t) * 1000)
+        else:
+            game.clock.advance()
+            cost = time.perf_counter() - t0
+            latencies += [(start + cost - a) * 1000 for a in pending]
+            pending.clear()
+        busy_until = start + cost
+    calls1, by_command = game.tcl_calls.snapshot()
+    game.close()
+    return {
+        'events': len(events),
+        'input_to_screen': _dist(latencies),
+        'tk_calls_per_event': round((calls1 - calls0) / len(events), 3),
+        'wm_calls': by_command.get('wm', 0),
+        'handler_total_ms': round(handler_ms, 3),
+    }
+
+
+class _MotionEvent:
+    def __init__(self, x_root: int, y_root: int) -> None:
+        self.x_root = x_root
+        self.y_root = y_root
+
+
+def bench_cursor(root: tk.Tk, repeat: int) -> dict:
+    # A 1000 Hz mouse sweeping the board for two seconds
+    return {
+        'immediate': _cursor_run(root, coalesce=False, rate_hz=1000, seconds=2.0),
+        'coalesced': _cursor_run(root, coalesce=True, rate_hz=1000, seconds=2.0),
+    }
+
+
+DEFAULT_CLICK_SCRIPT = ['hit', 'miss', 'hit', 'hit', 'miss', 'hit', 'hit', 'hit',
+                        'miss', 'miss', 'hit', 'hit', 'hit', 'miss', 'hit']
+click_script: list[str] = DEFAULT_CLICK_SCRIPT
+
+
+def bench_clicks(root: tk.Tk, repeat: int) -> dict:
+    # Replay a scripted hit/miss sequence through handle_click. Each step
+    # spawns a mole through the core, then clicks on it or beside it with
+    # a press timestamp, and runs the idle queue so the game can time its
+    # input-to-feedback latency.
+    per_click: dict[str, list[float]] = {'hit': [], 'miss': []}
+    latency = StreamingStats(quantiles=(0.5, 0.9, 0.99))
+    outcome = {}
+    for _ in range(repeat):
+        game = _idle_game(root)
+        game.input_latency = latency
+        now = _virtual_time(game)
+        core = game.core
+        core.game_over = False
+        cells = core.cells
+        for action in click_script:
+            if core.game_over:
+                break
+            if not core.mole_visible:
+                core.spawn_mole()
+            target = core.current_mole_index
+            index = target if action == 'hit' else (target + 1) % cells
+            pressed = int(time.monotonic() * 1000)
+            t0 = time.perf_counter()
+            game.handle_click(index, pressed)
+            per_click[action].append((time.perf_counter() - t0) * 1000)
+            game.root.update()
+            _run_frames(game, now, 0.05)
+        outcome = {'score': core.score, 'misses': core.misses, 'game_over': core.game_over}
+        game.clock.stop()
+        game.close()
+    return {
+        'script_length': len(click_script),
+        'hit_click': _dist(per_click['hit']) if per_click['hit'] else None,
+        'miss_click': _dist(per_click['miss']) if per_click['miss'] else None,
+        'input_to_feedback': latency.as_dict(),
+        'outcome': outcome,
+    }
+
+
+# ---------------------------------------------------------------------- #
+#  Event log and replay                                                    #
+# ---------------------------------------------------------------------- #
+
+trace_path: Path | None = None
+
+
+def _bot_session(spawns: int, reaction_ms: float = 350.0) -> tuple[dict, list[Event]]:
+    # A headless player that clicks each mole after a fixed reaction time
+    # and misclicks beside every seventh one
+    clock = VirtualClock()
+    log = MemoryLog()
+    core = GameCore(clock, Recorder(clock, log), rng=random.Random(0), target_score=spawns)
+    header = session_header(core, 0)
+    core.start()
+    for k in range(1, spawns + 1):
+        clock.advance_to(k * core.interval_ms + reaction_ms)
+        if core.game_over:
+            break
+        if core.mole_visible:
+            cell = core.current_mole_index
+            core.click(cell if k % 7 else (cell + 1) % core.cells)
+    clock.advance(core.visible_ms)
+    return header, log.events
+
+
+def _view_replay(root: tk.Tk, path: Path) -> dict:
+    # Feed a recorded trace through the full view, running 60 fps of
+    # virtual time between events so effects cost what they did live
+    game = WhackAMoleGame(tk.Toplevel(root), replay=str(path))
+    now = _virtual_time(game)
+    replayer = game.replayer
+    per_event, frames = [], []
+    last = replayer.events[replayer.position - 1][1] if replayer.position else 0.0
+    while not replayer.done:
+        t_ms = replayer.events[replayer.position][1]
+        frames += _run_frames(game, now, min(1.0, (t_ms - last) / 1000))
+        last = t_ms
+        t0 = time.perf_counter()
+        replayer.step()
+        per_event.append((time.perf_counter() - t0) * 1000)
+    replayer.verify()
+    result = {'events': len(replayer.events), 'per_event': _dist(per_event),
+              'frames': _dist(frames) if frames else None,
+              'score': game.core.score, 'misses': game.core.misses}
+    game.close()
+    return result
+
+
+def bench_replay(root: tk.Tk, repeat: int) -> dict:
+    header, events = _bot_session(2000)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bench.wamlog'
+
+        def write() -> None:
+            log = EventLogWriter(path, header)
+            for event in events:
+                log.append(*event)
+            log.close()
+
+        t0 = time.perf_counter()
+        log = EventLogWriter(path, header)
+        for event in events:
+            log.append(*event)
+        append_us = (time.perf_counter() - t0) * 1e6 / len(events)
+        log.close()
+        result = {
+            'events': len(events),
+            'log_bytes': path.stat().st_size,
+            'append_us': round(append_us, 3),
+            'write_log': _timeit(write, repeat),
+            'read_log': _timeit(lambda: read_log(path), repeat),
+            'headless_replay': _timeit(lambda: replay(header, events), repeat),
+        }
+    if trace_path is not None:
+        result['trace'] = _view_replay(root, trace_path)
+    return result
+
+
+# ---------------------------------------------------------------------- #
+#  Leaderboard                                                             #
+# ---------------------------------------------------------------------- #
+
+def bench_leaderboard(root: tk.Tk, repeat: int, rows: int = 200_000) -> dict:
+    # Query latency against a large table, and what submitting a result
+    # costs the caller (the insert itself runs on the worker thread)
+    rng = random.Random(0)
+    players = [f'player{i}' for i in range(1000)]
+
+    def result() -> GameResult:
+        hits = rng.randint(0, 30)
+        return GameResult(rng.choice(players), hits, hits, rng.randint(0, 10), rng.randint(0, 10),
+                          rng.uniform(5_000, 60_000), 4, 4,
+                          [(rng.randrange(16), rng.uniform(200, 800)) for _ in range(hits)])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        board = Leaderboard(Path(tmp) / 'scores.db')
+        t0 = time.perf_counter()
+        pending = [board.submit(result()) for _ in range(rows)]
+        enqueue_s = time.perf_counter() - t0
+        pending[-1].result()
+        fill_s = time.perf_counter() - t0
+        submit = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            future = board.submit(result())
+            submit.append((time.perf_counter() - t0) * 1000)
+            future.result()
+
+        def query(fn: Callable[[], object]) -> Callable[[], object]:
+            return lambda: fn().result()
+
+        report = {
+            'rows': rows,
+            'fill_rows_per_s': round(rows / fill_s),
+            'enqueue_us': round(enqueue_s * 1e6 / rows, 3),
+            'submit_call': _dist(submit),
+            'top10': _timeit(query(lambda: board.top(10)), repeat),
+            'player_best': _timeit(query(lambda: board.best(rng.choice(players))), repeat),
+            'rank': _timeit(query(lambda: board.rank(15, 30_000.0)), repeat),
+        }
+        board.close()
+    return report
+
+
+BENCHMARKS: dict[str, Callable[[tk.Tk, int], dict]] = {
+    'startup': bench_startup,
+    'resize': bench_resize,
+    'sprites': bench_sprites,
+    'background': bench_background,
+    'animation_tick': bench_animation_tick,
+    'idle_calls': bench_idle_calls,
+    'hit': bench_hit,
+    'confetti': bench_confetti,
+    'clicks': bench_clicks,
+    'cursor': bench_cursor,
+    'quality': bench_quality,
+    'render': bench_render,
+    'replay': bench_replay,
+    'leaderboard': bench_leaderboard,
+}
+
+
+# ---------------------------------------------------------------------- #
+#  Display backends                                                        #
+# ---------------------------------------------------------------------- #
+
+def _start_xvfb() -> subprocess.Popen:
+    for display in range(99, 120):
+        if os.path.exists(f'/tmp/.X11-unix/X{display}'):
+            continue
+        proc = subprocess.Popen(['Xvfb', f':{display}', '-screen', '0', '1280x1024x24', '-nolisten', 'tcp'],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if os.path.exists(f'/tmp/.X11-unix/X{display}'):
+                os.environ['DISPLAY'] = f':{display}'
+                return proc
+            if proc.poll() is not None:
+                break
+            time.sleep(0.05)
+        proc.kill()
+    raise RuntimeError('could not start Xvfb')
+
+
+def _pick_backend(requested: str) -> str:
+    if requested != 'auto':
+        return requested
+    if os.environ.get('DISPLAY'):
+        return 'x11'
+    return 'xvfb' if shutil.which('Xvfb') else 'fake'
+
+
+def main(argv: list[str] | None = None) -> int:
+    global click_script, trace_path
+    parser = argparse.ArgumentParser(description='Whack-A-Mole performance benchmarks')
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help=f'benchmarks to run: {", ".join(BENCHMARKS)} (default: all)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--backend', choices=['auto', 'x11', 'xvfb', 'fake'], default='auto',
+                        help='x11 uses $DISPLAY, xvfb starts a virtual display, '
+                             'fake records calls without any display')
+    parser.add_argument('--clicks', type=Path,
+                        help='JSON list of "hit"/"miss" steps for the clicks benchmark')
+    parser.add_argument('--trace', type=Path,
+                        help='event log (main.py --record) to replay through the view')
+    parser.add_argument('--output', type=Path, help='write the JSON report here as well')
+    args = parser.parse_args(argv)
+    unknown = [n for n in args.names if n not in BENCHMARKS]
+    if unknown:
+        parser.error(f'unknown benchmark(s): {", ".join(unknown)}')
+    if args.clicks:
+        click_script = json.loads(args.clicks.read_text())
+    trace_path = args.trace
+
+    backend = _pick_backend(args.backend)
+    xvfb = _start_xvfb() if backend == 'xvfb' else None
+    if backend == 'fake':
+        import faketk
+        faketk.install()
+    try:
+        root = tk.Tk()
+        root.withdraw()
+        results = {}
+        for name in args.names or BENCHMARKS:
+            results[name] = BENCHMARKS[name](root, args.repeat)
+        root.destroy()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    report = {
+        'meta': {
+            'backend': backend,
+            'python': platform.python_version(),
+            'tk': tk.TkVersion,
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
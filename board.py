@@ -0,0 +1,210 @@
+import tkinter as tk
+from typing import Callable
+
+from palette import GRASS_DARK, GRASS_LIGHT
+from sprites import SpriteAtlas
+
+# Hole sprites are 100 px with 12 px of padding each side, so the classic
+# 4x4 board is a 496 px square; larger boards shrink to fit the same area.
+# All of these are at layout scale 1 and grow or shrink with the window.
+HOLE_SIZE = 100
+HOLE_PAD = 12
+HOLE_PITCH = HOLE_SIZE + 2 * HOLE_PAD
+BOARD_SIZE = 4 * HOLE_PITCH
+MISS_COLOR = '#EF5350'
+
+# Called with the cell and the press event's X timestamp
+ClickHandler = Callable[[int, int], None]
+
+
+class ButtonBoard:
+    # The original board: one tk.Button per hole gridded into a frame.
+    # Bounces re-grid the button, which relayouts the whole frame. Clicks
+    # are taken on the press rather than through command=, which only
+    # fires once the button is released.
+
+    def __init__(self, canvas: tk.Canvas, rows: int, cols: int, center: tuple[int, int],
+                 sprites: SpriteAtlas, on_click: ClickHandler,
+                 scale: float = 1.0) -> None:
+        self.root = canvas.winfo_toplevel()
+        self.canvas = canvas
+        self.rows = rows
+        self.cols = cols
+        self.sprites = sprites
+        self.on_click = on_click
+        self.enabled = True
+        self.scale = scale
+        self.pad = round(HOLE_PAD * scale)
+        self.hole_image = sprites.scaled('hole', scale)
+        self.mole_image = sprites.scaled('mole', scale)
+        self.moles = bytearray(rows * cols)
+        self._flash_bg: dict[int, str] = {}
+        self.frame = tk.Frame(self.root, bg=GRASS_LIGHT, cursor='none')
+        self.holes: list[tk.Button] = []
+        for r in range(rows):
+            for c in range(cols):
+                index = r * cols + c
+                btn = tk.Button(
+                    self.frame, text='', image=self.hole_image,
+                    compound='center', borderwidth=0, highlightthickness=0,
+                    bg=GRASS_LIGHT, activebackground=GRASS_DARK,
+                    cursor='none',
+                )
+                btn.bind('<ButtonPress-1>', lambda e, i=index: self._on_press(i, e))
+                btn.grid(row=r, column=c, padx=self.pad, pady=self.pad)
+                self.holes.append(btn)
+        self.window = canvas.create_window(*center, window=self.frame)
+
+    def resize(self, center: tuple[int, int], scale: float) -> None:
+        self.canvas.coords(self.window, *center)
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.pad = round(HOLE_PAD * scale)
+        self.hole_image = self.sprites.scaled('hole', scale)
+        self.mole_image = self.sprites.scaled('mole', scale)
+        for index, btn in enumerate(self.holes):
+            btn.config(image=self.mole_image if self.moles[index] else self.hole_image)
+            btn.grid_configure(padx=self.pad, pady=self.pad)
+
+    def cell_center(self, index: int) -> tuple[int, int]:
+        btn = self.holes[index]
+        x = btn.winfo_rootx() - self.root.winfo_rootx() + btn.winfo_width() // 2
+        y = btn.winfo_rooty() - self.root.winfo_rooty() + btn.winfo_height() // 2
+        return x, y
+
+    def _on_press(self, index: int, event: 'tk.Event[tk.Misc]') -> None:
+        # A disabled button still runs its bindings
+        if self.enabled:
+            self.on_click(index, event.time)
+
+    def show_mole(self, index: int) -> None:
+        self.moles[index] = 1
+        self.holes[index].config(bg=GRASS_DARK, image=self.mole_image, compound='center')
+
+    def hide_mole(self, index: int) -> None:
+        self.moles[index] = 0
+        self.holes[index].config(bg=GRASS_LIGHT, image=self.hole_image, compound='center')
+        self.holes[index].grid_configure(pady=self.pad)
+
+    def set_offset(self, index: int, dy: int) -> None:
+        dy = round(dy * self.scale)
+        if dy:
+            self.holes[index].grid_configure(pady=(self.pad + dy, self.pad - dy))
+        else:
+            self.holes[index].grid_configure(pady=self.pad)
+
+    def flash(self, index: int, on: bool) -> None:
+        btn = self.holes[index]
+        if on:
+            self._flash_bg.setdefault(index, btn.cget('bg'))
+            btn.config(bg=MISS_COLOR)
+        elif index in self._flash_bg:
+            btn.config(bg=self._flash_bg.pop(index))
+
+    def disable(self) -> None:
+        self.enabled = False
+        for btn in self.holes:
+            btn.config(state=tk.DISABLED)
+
+
+class CanvasBoard:
+    # Holes drawn straight onto the game canvas as image items: no widget
+    # per cell, clicks map to a cell arithmetically and bounces are plain
+    # coords() writes, so the cost of a frame no longer grows with the
+    # board and 32x32 boards stay cheap.
+
+    def __init__(self, canvas: tk.Canvas, rows: int, cols: int, center: tuple[int, int],
+                 sprites: SpriteAtlas, on_click: ClickHandler,
+                 scale: float = 1.0) -> None:
+        self.canvas = canvas
+        self.rows = rows
+        self.cols = cols
+        self.sprites = sprites
+        self.on_click = on_click
+        self.enabled = True
+        self.moles = bytearray(rows * cols)
+        self._layout(center, scale)
+
+        # One reusable flash rectangle under the holes; like the button
+        # background it shows in the padding around the sprite
+        self._flash = canvas.create_rectangle(0, 0, 0, 0, fill=MISS_COLOR, outline='',
+                                              state='hidden')
+        self._flash_index: int | None = None
+        self.items: list[int] = []
+        for index in range(rows * cols):
+            x, y = self.cell_center(index)
+            self.items.append(canvas.create_image(x, y, image=self.hole_image))
+        canvas.bind('<Button-1>', self._on_press, add='+')
+
+    def _layout(self, center: tuple[int, int], scale: float) -> None:
+        self.scale = scale
+        self.pitch = min(round(HOLE_PITCH * scale),
+                         round(BOARD_SIZE * scale) // max(self.rows, self.cols))
+        self.left = center[0] - self.pitch * self.cols // 2
+        self.top = center[1] - self.pitch * self.rows // 2
+        # Sprites drawn at the size that fits the pitch, padding included
+        size = max(1, self.pitch * HOLE_SIZE // HOLE_PITCH)
+        self.hole_image = self._sprite('hole', size)
+        self.mole_image = self._sprite('mole', size)
+
+    def _sprite(self, name: str, size: int) -> tk.PhotoImage:
+        return self.sprites.photo(name, size)
+
+    def resize(self, center: tuple[int, int], scale: float) -> None:
+        self._layout(center, scale)
+        for index, item in enumerate(self.items):
+            x, y = self.cell_center(index)
+            self.canvas.coords(item, x, y)
+            self.canvas.itemconfigure(item, image=self.mole_image if self.moles[index]
+                                      else self.hole_image)
+        if self._flash_index is not None:
+            self.flash(self._flash_index, True)
+
+    def cell_at(self, x: float, y: float) -> int | None:
+        col = int((x - self.left) // self.pitch)
+        row = int((y - self.top) // self.pitch)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return None
+
+    def cell_center(self, index: int) -> tuple[int, int]:
+        row, col = divmod(index, self.cols)
+        half = self.pitch // 2
+        return self.left + col * self.pitch + half, self.top + row * self.pitch + half
+
+    def _on_press(self, event: 'tk.Event[tk.Misc]') -> None:
+        # Canvas coordinates, so a scrolled (shaking) view still hits right
+        index = self.cell_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if index is not None and self.enabled:
+            self.on_click(index, event.time)
+
+    def show_mole(self, index: int) -> None:
+        self.moles[index] = 1
+        self.canvas.itemconfigure(self.items[index], image=self.mole_image)
+
+    def hide_mole(self, index: int) -> None:
+        self.moles[index] = 0
+        self.canvas.itemconfigure(self.items[index], image=self.hole_image)
+        self.set_offset(index, 0)
+
+    def set_offset(self, index: int, dy: int) -> None:
+        x, y = self.cell_center(index)
+        self.canvas.coords(self.items[index], x, y + dy * self.pitch // HOLE_PITCH)
+
+    def flash(self, index: int, on: bool) -> None:
+        if on:
+            x, y = self.cell_center(index)
+            r = self.pitch // 2
+            self.canvas.coords(self._flash, x - r, y - r, x + r, y + r)
+            self.canvas.itemconfigure(self._flash, state='normal')
+            self._flash_index = index
+        elif index == self._flash_index:
+            self.canvas.itemconfigure(self._flash, state='hidden')
+            self._flash_index = None
+
+    def disable(self) -> None:
+        self.enabled = False
+
+
+BOARDS = {'buttons': ButtonBoard, 'canvas': CanvasBoard}
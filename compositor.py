@@ -0,0 +1,340 @@
+import tkinter as tk
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+
+from board import CanvasBoard
+from sprites import PixelBuffer, SpriteAtlas, hex_to_rgba
+
+# Software renderer: the playfield is one RGB framebuffer shown through a
+# single canvas image item. Callers keep the canvas item API they already
+# use (create_*, coords, itemconfigure, delete), so the board, particle
+# pools and effects draw here unchanged. Every change records its old and
+# new bounds; once per idle slot their bounding box is restored from the
+# background, the items touching it are redrawn in creation order, and the
+# box goes to Tk in a single put.
+
+# Pixel arrays per sprite size, budgeted like the atlas's PhotoImages:
+# three colour bytes and a mask byte per pixel
+SPRITE_CACHE_BYTES = 32 * 1024 * 1024
+# Ellipse masks per size; particles shrink through many sizes
+ELLIPSE_CACHE_SIZE = 256
+
+# 5x7 glyphs for the floating score text; other characters are skipped
+GLYPHS = {
+    '+': ['.....', '..#..', '..#..', '#####', '..#..', '..#..', '.....'],
+    '-': ['.....', '.....', '.....', '#####', '.....', '.....', '.....'],
+    '0': ['.###.', '#...#', '#..##', '#.#.#', '##..#', '#...#', '.###.'],
+    '1': ['..#..', '.##..', '..#..', '..#..', '..#..', '..#..', '.###.'],
+    '2': ['.###.', '#...#', '....#', '...#.', '..#..', '.#...', '#####'],
+    '3': ['####.', '....#', '....#', '.###.', '....#', '....#', '####.'],
+    '4': ['...#.', '..##.', '.#.#.', '#..#.', '#####', '...#.', '...#.'],
+    '5': ['#####', '#....', '####.', '....#', '....#', '#...#', '.###.'],
+    '6': ['..##.', '.#...', '#....', '####.', '#...#', '#...#', '.###.'],
+    '7': ['#####', '....#', '...#.', '..#..', '.#...', '.#...', '.#...'],
+    '8': ['.###.', '#...#', '#...#', '.###.', '#...#', '#...#', '.###.'],
+    '9': ['.###.', '#...#', '#...#', '.####', '....#', '...#.', '.##..'],
+}
+
+Box = tuple[int, int, int, int]
+
+
+# Pixels are handled as 3-byte void scalars over the RGB buffers, so masks
+# stay two-dimensional and the framebuffer is already in PPM byte order
+def _pixels(rgb: np.ndarray) -> np.ndarray:
+    return rgb.view('V3').reshape(rgb.shape[:2])
+
+
+def _rgb(color: str) -> np.void:
+    return np.array(hex_to_rgba(color)[:3], dtype=np.uint8).view('V3')[0]
+
+
+class Sprite:
+    # An RGBA sprite split for compositing: colour, coverage mask and
+    # whether the mask can be skipped
+    __slots__ = ('rgb', 'mask', 'opaque', 'width', 'height')
+
+    def __init__(self, buf: PixelBuffer) -> None:
+        rgba = np.frombuffer(bytes(buf.data), dtype=np.uint8).reshape(buf.height, buf.width, 4)
+        self.rgb = _pixels(np.ascontiguousarray(rgba[:, :, :3]))
+        self.mask = rgba[:, :, 3] > 0
+        self.opaque = bool(self.mask.all())
+        self.width = buf.width
+        self.height = buf.height
+
+
+def _text_mask(text: str, font: tuple | None) -> np.ndarray:
+    size = int(font[1]) if font else 12
+    px = max(1, round(abs(size) / 7))
+    rows = [''.join(GLYPHS[ch][y] + '.' for ch in text if ch in GLYPHS) for y in range(7)]
+    cells = np.array([[ch == '#' for ch in row] for row in rows], dtype=bool).reshape(7, -1)
+    return cells.repeat(px, axis=0).repeat(px, axis=1)
+
+
+class _Item:
+    # One canvas-style item: its options, parsed colours and bounds in
+    # canvas pixels (right and bottom exclusive)
+    __slots__ = ('kind', 'coords', 'options', 'hidden', 'box', 'fill', 'outline', 'mask')
+
+    def __init__(self, kind: str, coords: tuple, options: dict) -> None:
+        self.kind = kind
+        self.coords = [float(c) for c in coords]
+        self.options = {}
+        self.hidden = False
+        self.fill: np.void | None = None
+        self.outline: np.void | None = None
+        self.mask: np.ndarray | None = None
+        self.configure(options)
+
+    def configure(self, options: dict) -> None:
+        self.options.update(options)
+        self.hidden = self.options.get('state') == 'hidden'
+        fill = self.options.get('fill')
+        self.fill = _rgb(fill) if fill else None
+        outline = self.options.get('outline', '' if self.kind == 'text' else '#000000')
+        self.outline = _rgb(outline) if outline else None
+        if self.kind == 'text' and ('text' in options or 'font' in options or self.mask is None):
+            self.mask = _text_mask(str(self.options.get('text', '')), self.options.get('font'))
+        self.box = self.bounds()
+
+    def bounds(self) -> Box:
+        c = self.coords
+        if self.kind == 'image':
+            image: Sprite = self.options['image']
+            x, y = round(c[0]), round(c[1])
+            if self.options.get('anchor', 'center') == 'center':
+                x, y = x - image.width // 2, y - image.height // 2
+            return x, y, x + image.width, y + image.height
+        if self.kind == 'text':
+            h, w = self.mask.shape
+            x, y = round(c[0]) - w // 2, round(c[1]) - h // 2
+            return x, y, x + w, y + h
+        x0, y0 = round(min(c[0], c[2])), round(min(c[1], c[3]))
+        x1, y1 = round(max(c[0], c[2])), round(max(c[1], c[3]))
+        if self.outline is None:
+            return x0, y0, x1, y1
+        # An outline is centred on the shape's edge
+        pad = round(float(self.options.get('width', 1))) // 2
+        return x0 - pad, y0 - pad, x1 + pad + 1, y1 + pad + 1
+
+
+class Compositor:
+    def __init__(self, canvas: tk.Canvas, sprites: SpriteAtlas) -> None:
+        self.canvas = canvas
+        self.sprites = sprites
+        self.width = self.height = 0
+        self.background = _pixels(np.zeros((0, 0, 3), dtype=np.uint8))
+        self.frame = np.zeros((0, 0, 3), dtype=np.uint8)
+        self._frame = _pixels(self.frame)
+        self.items: dict[int, _Item] = {}
+        self.flushes = 0
+        self.blit_pixels = 0
+        self.sprite_bytes = 0
+        self._next_id = 1
+        self._marks: list[Box] = []
+        self._flush_after: str | None = None
+        self._sprites: OrderedDict[tuple[str, int, int], Sprite] = OrderedDict()
+        self._ellipses: OrderedDict[tuple[int, int], np.ndarray] = OrderedDict()
+        self.photo = tk.PhotoImage(master=canvas, width=1, height=1)
+        self.image_item = canvas.create_image(0, 0, anchor='nw', image=self.photo)
+        canvas.tag_lower(self.image_item)
+
+    # -- background and sprites ------------------------------------------ #
+
+    def set_background(self, pixels: np.ndarray) -> None:
+        # A new background may also be a new size: everything is redrawn
+        self.background = pixels
+        height, width = pixels.shape
+        if (width, height) != (self.width, self.height):
+            self.width, self.height = width, height
+            self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+            self._frame = _pixels(self.frame)
+            self.photo = tk.PhotoImage(master=self.canvas, width=width, height=height)
+            self.canvas.itemconfigure(self.image_item, image=self.photo)
+        self._mark((0, 0, width, height))
+
+    def load_background(self, name: str, size: tuple[int, int]) -> None:
+        # Window-sized, so kept only as the background, not in the sprite cache
+        self.set_background(Sprite(self.sprites.pixels(name, size)).rgb)
+
+    def set_backdrop(self, width: int, height: int, horizon: int, sky: str, ground: str) -> None:
+        pixels = _pixels(np.empty((height, width, 3), dtype=np.uint8))
+        pixels[:horizon] = _rgb(sky)
+        pixels[horizon:] = _rgb(ground)
+        self.set_background(pixels)
+
+    def sprite(self, name: str, size: int | tuple[int, int]) -> Sprite:
+        width, height = (size, size) if isinstance(size, int) else size
+        key = (name, width, height)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+        sprite = self._sprites[key] = Sprite(self.sprites.pixels(name, (width, height)))
+        self.sprite_bytes += width * height * 4
+        # Least recently used first; the sprite just built is last, so kept
+        while self.sprite_bytes > SPRITE_CACHE_BYTES and len(self._sprites) > 1:
+            (_, w, h), _ = self._sprites.popitem(last=False)
+            self.sprite_bytes -= w * h * 4
+        return sprite
+
+    # -- canvas item API --------------------------------------------------- #
+
+    def _create(self, kind: str, coords: tuple, options: dict) -> int:
+        oid = self._next_id
+        self._next_id += 1
+        item = self.items[oid] = _Item(kind, coords, options)
+        if not item.hidden:
+            self._mark(item.box)
+        return oid
+
+    def create_oval(self, *coords: float, **options: object) -> int:
+        return self._create('oval', coords, options)
+
+    def create_rectangle(self, *coords: float, **options: object) -> int:
+        return self._create('rectangle', coords, options)
+
+    def create_image(self, *coords: float, **options: object) -> int:
+        return self._create('image', coords, options)
+
+    def create_text(self, *coords: float, **options: object) -> int:
+        return self._create('text', coords, options)
+
+    def coords(self, oid: int, *coords: float) -> None:
+        item = self.items[oid]
+        old = item.box
+        item.coords = [float(c) for c in coords]
+        item.box = item.bounds()
+        if not item.hidden and item.box != old:
+            self._marks += (old, item.box)
+            self._schedule()
+
+    def itemconfigure(self, oid: int, **options: object) -> None:
+        item = self.items[oid]
+        was_hidden, old = item.hidden, item.box
+        item.configure(options)
+        if not was_hidden:
+            self._mark(old)
+        if not item.hidden:
+            self._mark(item.box)
+
+    itemconfig = itemconfigure
+
+    def delete(self, *oids: int) -> None:
+        for oid in oids:
+            item = self.items.pop(oid, None)
+            if item is not None and not item.hidden:
+                self._mark(item.box)
+
+    def bind(self, sequence: str, func: Callable[..., object], add: str | None = None) -> str:
+        return self.canvas.bind(sequence, func, add)
+
+    def canvasx(self, screenx: float) -> float:
+        return self.canvas.canvasx(screenx)
+
+    def canvasy(self, screeny: float) -> float:
+        return self.canvas.canvasy(screeny)
+
+    # -- rendering --------------------------------------------------------- #
+
+    def _mark(self, box: Box) -> None:
+        # Merged into one dirty box by the next flush
+        self._marks.append(box)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._flush_after is None:
+            self._flush_after = self.canvas.after_idle(self.flush)
+
+    def _dirty_box(self) -> Box | None:
+        # Bounding box of every recorded change, clipped to the frame
+        marks = np.array(self._marks, dtype=np.int64).reshape(-1, 4)
+        self._marks.clear()
+        x0, y0 = marks[:, :2].min(axis=0).clip(0).tolist()
+        x1, y1 = marks[:, 2:].max(axis=0).tolist()
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+
+    def flush(self) -> None:
+        self._flush_after = None
+        if not self._marks:
+            return
+        dirty = self._dirty_box()
+        if dirty is None:
+            return
+        x0, y0, x1, y1 = dirty
+        self._frame[y0:y1, x0:x1] = self.background[y0:y1, x0:x1]
+        for item in self.items.values():
+            if item.hidden:
+                continue
+            bx0, by0, bx1, by1 = item.box
+            if bx0 < x1 and bx1 > x0 and by0 < y1 and by1 > y0:
+                self._draw(item, max(bx0, x0), max(by0, y0), min(bx1, x1), min(by1, y1))
+        header = f'P6 {x1 - x0} {y1 - y0} 255 '.encode()
+        self.photo.put(header + self.frame[y0:y1, x0:x1].tobytes(), to=(x0, y0))
+        self.blit_pixels += (x1 - x0) * (y1 - y0)
+        self.flushes += 1
+
+    def _draw(self, item: _Item, x0: int, y0: int, x1: int, y1: int) -> None:
+        # Draws the part of the item inside (x0, y0, x1, y1)
+        target = self._frame[y0:y1, x0:x1]
+        bx0, by0, bx1, by1 = item.box
+        local = (slice(y0 - by0, y1 - by0), slice(x0 - bx0, x1 - bx0))
+        if item.kind == 'rectangle':
+            if item.fill is not None:
+                target[...] = item.fill
+            return
+        if item.kind == 'image':
+            image: Sprite = item.options['image']
+            mask = None if image.opaque else image.mask[local]
+            color = image.rgb[local]
+        elif item.kind == 'text':
+            mask, color = item.mask[local], item.fill
+        else:
+            w, h = bx1 - bx0, by1 - by0
+            if item.fill is not None:
+                self._paint(target, self._ellipse(w, h)[local], item.fill)
+            if item.outline is not None:
+                width = max(1, round(float(item.options.get('width', 1))))
+                self._paint(target, self._ring(w, h, width)[local], item.outline)
+            return
+        if color is not None:
+            self._paint(target, mask, color)
+
+    @staticmethod
+    def _paint(target: np.ndarray, mask: np.ndarray | None, color: np.ndarray | np.void) -> None:
+        if mask is None:
+            target[...] = color
+        else:
+            np.copyto(target, color, where=mask)
+
+    def _ellipse(self, w: int, h: int) -> np.ndarray:
+        # Pixel centres inside the box-inscribed ellipse, memoized by size
+        key = (w, h)
+        mask = self._ellipses.get(key)
+        if mask is None:
+            y = (np.arange(h) + 0.5 - h / 2) / (h / 2)
+            x = (np.arange(w) + 0.5 - w / 2) / (w / 2)
+            mask = self._ellipses[key] = y[:, None] ** 2 + x[None, :] ** 2 <= 1
+            if len(self._ellipses) > ELLIPSE_CACHE_SIZE:
+                self._ellipses.popitem(last=False)
+        self._ellipses.move_to_end(key)
+        return mask
+
+    def _ring(self, w: int, h: int, width: int) -> np.ndarray:
+        ring = self._ellipse(w, h).copy()
+        if w > 2 * width and h > 2 * width:
+            ring[width:h - width, width:w - width] &= ~self._ellipse(w - 2 * width, h - 2 * width)
+        return ring
+
+
+class FramebufferBoard(CanvasBoard):
+    # The canvas board drawing into a compositor: same layout, hit testing
+    # and flash, with its sprites as pixel arrays
+    canvas: Compositor
+
+    def _sprite(self, name: str, size: int) -> Sprite:
+        return self.canvas.sprite(name, size)
@@ -0,0 +1,509 @@
+import functools
+import heapq
+import math
+import random
+import time
+import tkinter as tk
+from typing import TYPE_CHECKING, Callable, Iterable
+
+from perf import Profiler
+from stats import StreamingStats
+
+if TYPE_CHECKING:
+    # Only server.py needs asyncio; keep it off the GUI's import path
+    import asyncio
+
+GRID_ROWS = 4
+GRID_COLS = 4
+MOLE_VISIBLE_MS = 800
+MOLE_INTERVAL_MS = 1000
+TARGET_SCORE = 10
+
+# Adaptive difficulty keeps the recent hit rate near this target
+TARGET_HIT_RATE = 0.75
+MIN_VISIBLE_MS = 250
+MAX_VISIBLE_MS = 2000
+
+
+# ---------------------------------------------------------------------- #
+#  Clocks                                                                  #
+# ---------------------------------------------------------------------- #
+
+class VirtualClock:
+    # Deterministic clock for headless runs: time only moves on advance().
+
+    def __init__(self, start_ms: float = 0.0) -> None:
+        self.now_ms = start_ms
+        self._timers: list[tuple[float, int, Callable[[], None]]] = []
+        self._cancelled: set[int] = set()
+        self._seq = 0
+
+    def now(self) -> float:
+        return self.now_ms
+
+    def schedule(self, delay_ms: float, fn: Callable[[], None]) -> int:
+        self._seq += 1
+        heapq.heappush(self._timers, (self.now_ms + delay_ms, self._seq, fn))
+        return self._seq
+
+    def cancel(self, handle: int) -> None:
+        self._cancelled.add(handle)
+
+    def pending(self) -> int:
+        return sum(1 for _, seq, _ in self._timers if seq not in self._cancelled)
+
+    def advance_to(self, t_ms: float) -> None:
+        # Fire every timer due at or before t_ms in deadline order
+        while self._timers and self._timers[0][0] <= t_ms:
+            due, seq, fn = heapq.heappop(self._timers)
+            if seq in self._cancelled:
+                self._cancelled.discard(seq)
+                continue
+            self.now_ms = due
+            fn()
+        self.now_ms = max(self.now_ms, t_ms)
+
+    def advance(self, delta_ms: float) -> None:
+        self.advance_to(self.now_ms + delta_ms)
+
+
+class TkClock:
+    # Real-time clock backed by the Tk event loop.
+
+    def __init__(self, root: tk.Misc, profiler: Profiler | None = None) -> None:
+        self.root = root
+        self.profiler = profiler
+        self._t0 = time.monotonic()
+        self._event_offset: float | None = None
+
+    def now(self) -> float:
+        return (time.monotonic() - self._t0) * 1000
+
+    def event_time(self, event_ms: int) -> float:
+        # Maps an X event timestamp (server milliseconds) onto this clock.
+        # The offset is the smallest gap yet seen between an event's stamp
+        # and its handling, so it errs early by at most the delay of the
+        # least-delayed event plus the stamp's truncated fraction of a
+        # millisecond; adding that millisecond back means a press never
+        # maps to before it happened. A gap jumping by half the 32-bit
+        # range means the server clock wrapped.
+        now = self.now()
+        gap = now - event_ms
+        if (self._event_offset is None or gap < self._event_offset
+                or gap - self._event_offset > 2 ** 31):
+            self._event_offset = gap
+        return min(now, event_ms + self._event_offset + 1)
+
+    def schedule(self, delay_ms: float, fn: Callable[[], None]) -> str:
+        delay = max(0, int(delay_ms))
+        if self.profiler is not None:
+            fn = self._measure_lateness(fn, self.now() + delay)
+        return self.root.after(delay, fn)
+
+    def _measure_lateness(self, fn: Callable[[], None], due: float) -> Callable[[], None]:
+        # functools.partial callbacks are named after the function they wrap
+        name = getattr(getattr(fn, 'func', fn), '__name__', 'timer')
+
+        def fire() -> None:
+            self.profiler.record_lateness(name, self.now() - due)
+            fn()
+
+        return fire
+
+    def cancel(self, handle: str) -> None:
+        self.root.after_cancel(handle)
+
+
+class AsyncioClock:
+    # Clock for sessions hosted in an asyncio event loop (see server.py)
+
+    def __init__(self, loop: 'asyncio.AbstractEventLoop') -> None:
+        self.loop = loop
+        self._t0 = loop.time()
+
+    def now(self) -> float:
+        return (self.loop.time() - self._t0) * 1000
+
+    def schedule(self, delay_ms: float, fn: Callable[[], None]) -> 'asyncio.TimerHandle':
+        return self.loop.call_later(max(0.0, delay_ms) / 1000, fn)
+
+    def cancel(self, handle: 'asyncio.TimerHandle') -> None:
+        handle.cancel()
+
+
+class ReplayClock:
+    # Time is whatever the replayer last set. Timers are never fired by the
+    # clock: the log says when each spawn and timeout actually happened.
+
+    def __init__(self) -> None:
+        self.now_ms = 0.0
+        self._seq = 0
+
+    def now(self) -> float:
+        return self.now_ms
+
+    def schedule(self, delay_ms: float, fn: Callable[[], None]) -> int:
+        self._seq += 1
+        return self._seq
+
+    def cancel(self, handle: int) -> None:
+        pass
+
+
+class JitterStats:
+    # Running deviation of timer callbacks from their deadlines (Welford)
+
+    __slots__ = ('count', 'mean', 'm2', 'max')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        delta = ms - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (ms - self.mean)
+        self.max = max(self.max, abs(ms))
+
+    def as_dict(self) -> dict:
+        std = (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+        return {'count': self.count, 'mean_ms': round(self.mean, 3),
+                'std_ms': round(std, 3), 'max_abs_ms': round(self.max, 3)}
+
+
+# ---------------------------------------------------------------------- #
+#  Game rules                                                              #
+# ---------------------------------------------------------------------- #
+
+class GameListener:
+    # Hooks a view implements to mirror state changes; all default to no-ops.
+
+    def on_start(self) -> None: ...
+    def on_click(self, index: int, at_ms: float) -> None: ...
+    def on_spawn(self, index: int) -> None: ...
+    def on_hide(self, index: int) -> None: ...
+    def on_hit(self, index: int, reaction_ms: float) -> None: ...
+    def on_miss(self, index: int) -> None: ...
+    def on_timeout(self, index: int) -> None: ...
+    # A press made before the deadline hit a mole that had already timed out
+    def on_timeout_withdrawn(self, index: int) -> None: ...
+    def on_game_over(self) -> None: ...
+
+
+class ListenerGroup(GameListener):
+    # Fans every hook out to several listeners, e.g. the view and a recorder
+
+    def __init__(self, *listeners: GameListener | None) -> None:
+        self.listeners = [listener for listener in listeners if listener is not None]
+
+    def on_start(self) -> None:
+        for listener in self.listeners:
+            listener.on_start()
+
+    def on_click(self, index: int, at_ms: float) -> None:
+        for listener in self.listeners:
+            listener.on_click(index, at_ms)
+
+    def on_spawn(self, index: int) -> None:
+        for listener in self.listeners:
+            listener.on_spawn(index)
+
+    def on_hide(self, index: int) -> None:
+        for listener in self.listeners:
+            listener.on_hide(index)
+
+    def on_hit(self, index: int, reaction_ms: float) -> None:
+        for listener in self.listeners:
+            listener.on_hit(index, reaction_ms)
+
+    def on_miss(self, index: int) -> None:
+        for listener in self.listeners:
+            listener.on_miss(index)
+
+    def on_timeout(self, index: int) -> None:
+        for listener in self.listeners:
+            listener.on_timeout(index)
+
+    def on_timeout_withdrawn(self, index: int) -> None:
+        for listener in self.listeners:
+            listener.on_timeout_withdrawn(index)
+
+    def on_game_over(self) -> None:
+        for listener in self.listeners:
+            listener.on_game_over()
+
+
+class DifficultyController:
+    # Multiplicative feedback on the visible time: each resolved mole moves
+    # an exponentially weighted hit rate, and the visible time shrinks while
+    # that rate is above target and grows while it is below. The spawn
+    # interval keeps its original ratio to the visible time.
+
+    def __init__(self, visible_ms: float, interval_ms: float,
+                 target_rate: float = TARGET_HIT_RATE, gain: float = 0.4,
+                 alpha: float = 0.2) -> None:
+        self.visible_ms = visible_ms
+        self.ratio = interval_ms / visible_ms
+        self.target_rate = target_rate
+        self.gain = gain
+        self.alpha = alpha
+        self.hit_rate = target_rate
+        self.updates = 0
+
+    @property
+    def interval_ms(self) -> float:
+        return self.visible_ms * self.ratio
+
+    def update(self, hit: bool) -> None:
+        self.updates += 1
+        self.hit_rate += self.alpha * (hit - self.hit_rate)
+        step = math.exp(-self.gain * (self.hit_rate - self.target_rate))
+        self.visible_ms = min(MAX_VISIBLE_MS, max(MIN_VISIBLE_MS, self.visible_ms * step))
+
+    def amend_to_hit(self, update_no: int) -> None:
+        # Turns the miss recorded by update number update_no into a hit,
+        # leaving every other outcome in place. The rate is linear in each
+        # outcome, so the rate after each update since rises by
+        # alpha * (1 - alpha) ** age, and the visible time takes the steps
+        # those higher rates would have taken (clamped once, at the end).
+        age = self.updates - update_no
+        weights = [self.alpha * (1 - self.alpha) ** k for k in range(age + 1)]
+        self.hit_rate += weights[-1]
+        step = math.exp(-self.gain * sum(weights))
+        self.visible_ms = min(MAX_VISIBLE_MS, max(MIN_VISIBLE_MS, self.visible_ms * step))
+
+
+class GameCore:
+    # The whack-a-mole rules with no widgets: time comes from an injected
+    # clock (TkClock or VirtualClock) and input arrives through click().
+
+    def __init__(self, clock: VirtualClock | TkClock, listener: GameListener | None = None,
+                 rows: int = GRID_ROWS, cols: int = GRID_COLS,
+                 visible_ms: float = MOLE_VISIBLE_MS, interval_ms: float = MOLE_INTERVAL_MS,
+                 target_score: int = TARGET_SCORE, rng: random.Random | None = None,
+                 max_moles: int = 1, adaptive: bool = False) -> None:
+        self.clock = clock
+        self.listener = listener or GameListener()
+        self.rows = rows
+        self.cols = cols
+        self.visible_ms = visible_ms
+        self.interval_ms = interval_ms
+        self.target_score = target_score
+        self.rng = rng or random.Random()
+        self.max_moles = max_moles
+
+        self.score = 0
+        self.misses = 0
+        self.game_over = False
+        # One byte per cell (1 = mole up), plus the visible moles in spawn
+        # order mapped to their pending timeout handles
+        self.moles = bytearray(rows * cols)
+        self._active: dict[int, object] = {}
+        self._timeout_deadlines: dict[int, float] = {}
+        self._spawned_at: dict[int, float] = {}
+        # Per cell, the last mole to time out: spawn time, deadline and the
+        # number of the difficulty update that counted it as a miss
+        self._expired: dict[int, tuple[float, float, int | None]] = {}
+
+        # Spawn-to-hit times, and optional live tuning of the two timings
+        self.reaction = StreamingStats()
+        self.difficulty = DifficultyController(visible_ms, interval_ms) if adaptive else None
+
+        # Spawns land on start + k * interval so lateness never accumulates;
+        # timer handles are kept so stale ones can be cancelled.
+        self._start_ms = 0.0
+        self._spawn_no = 0
+        self._spawn_deadline = 0.0
+        self._spawn_handle: object = None
+        self.spawn_jitter = JitterStats()
+        self.timeout_jitter = JitterStats()
+
+    @property
+    def cells(self) -> int:
+        return self.rows * self.cols
+
+    @property
+    def mole_visible(self) -> bool:
+        return bool(self._active)
+
+    @property
+    def current_mole_index(self) -> int | None:
+        # The most recently spawned visible mole
+        return next(reversed(self._active), None)
+
+    @property
+    def visible_moles(self) -> list[int]:
+        return list(self._active)
+
+    def set_timing(self, visible_ms: float, interval_ms: float) -> None:
+        # The latest spawn deadline (pending or just fired) stays put; the
+        # ones after it are spaced by the new interval from there
+        self.visible_ms = visible_ms
+        if interval_ms != self.interval_ms:
+            self.interval_ms = interval_ms
+            self._start_ms = self._spawn_deadline
+            self._spawn_no = 0
+
+    def _resolved(self, hit: bool) -> None:
+        if self.difficulty is not None:
+            self.difficulty.update(hit)
+            self.set_timing(self.difficulty.visible_ms, self.difficulty.interval_ms)
+
+    def start(self) -> None:
+        self._start_ms = self.clock.now()
+        self._spawn_no = 0
+        self.listener.on_start()
+        self._schedule_next_spawn()
+
+    def _schedule_next_spawn(self) -> None:
+        now = self.clock.now()
+        self._spawn_no += 1
+        deadline = self._start_ms + self._spawn_no * self.interval_ms
+        if deadline <= now:
+            # More than a whole interval late: skip the missed slots
+            self._spawn_no = int((now - self._start_ms) // self.interval_ms) + 1
+            deadline = self._start_ms + self._spawn_no * self.interval_ms
+        self._spawn_deadline = deadline
+        self._spawn_handle = self.clock.schedule(deadline - now, self._on_spawn_timer)
+
+    def _on_spawn_timer(self) -> None:
+        self._spawn_handle = None
+        self.spawn_jitter.add(self.clock.now() - self._spawn_deadline)
+        self.spawn_mole()
+
+    def _pick_cell(self) -> int:
+        if self.max_moles == 1:
+            return self.rng.randrange(self.cells)
+        # Rejection sampling is O(1) expected while the board is sparse
+        for _ in range(8):
+            index = self.rng.randrange(self.cells)
+            if not self.moles[index]:
+                return index
+        return self.rng.choice([i for i in range(self.cells) if not self.moles[i]])
+
+    def click(self, index: int, at_ms: float | None = None) -> None:
+        # at_ms is when the press happened, for input that carries its own
+        # timestamp, and the hit is decided as of then: a press made before
+        # a mole came up misses it, and one made before a mole's deadline
+        # hits it even if its timeout fired before the press was handled.
+        # An index off the board is the caller's bug, not a miss, and
+        # raises ValueError.
+        if not 0 <= index < self.cells:
+            raise ValueError(f'cell {index} is not on the {self.rows}x{self.cols} board')
+        if self.game_over:
+            return
+        now = self.clock.now()
+        at = now if at_ms is None else min(at_ms, now)
+        self.listener.on_click(index, at)
+        if self.moles[index] and self._spawned_at[index] <= at:
+            self._hit(index, at - self._spawned_at[index])
+        elif index in self._expired and self._expired[index][0] <= at < self._expired[index][1]:
+            self._withdraw_timeout(index, at)
+        else:
+            self.misses += 1
+            self.listener.on_miss(index)
+
+    def _hit(self, index: int, reaction_ms: float) -> None:
+        self.score += 1
+        self.reaction.add(reaction_ms)
+        self.listener.on_hit(index, reaction_ms)
+        self.hide_mole(index)
+        self._resolved(True)
+        self._check_target()
+
+    def _withdraw_timeout(self, index: int, at: float) -> None:
+        # The press scores as a hit on the mole that is already gone, and
+        # its timeout's miss is taken back, in the difficulty too, where it
+        # becomes a hit with every later outcome kept; a mole that has
+        # since come up in the same cell stays up
+        spawned, _, update_no = self._expired.pop(index)
+        self.misses -= 1
+        self.listener.on_timeout_withdrawn(index)
+        self.score += 1
+        self.reaction.add(at - spawned)
+        self.listener.on_hit(index, at - spawned)
+        if update_no is not None:
+            self.difficulty.amend_to_hit(update_no)
+            self.set_timing(self.difficulty.visible_ms, self.difficulty.interval_ms)
+        self._check_target()
+
+    def _check_target(self) -> None:
+        if self.score >= self.target_score:
+            self.end_game()
+
+    def spawn_mole(self) -> None:
+        if self.game_over:
+            return
+        if len(self._active) >= self.max_moles:
+            self.hide_mole(next(iter(self._active)))
+            self._resolved(False)
+        index = self._pick_cell()
+        self.moles[index] = 1
+        self._spawned_at[index] = self.clock.now()
+        self._timeout_deadlines[index] = self.clock.now() + self.visible_ms
+        self._active[index] = self.clock.schedule(
+            self.visible_ms, functools.partial(self._on_timeout_timer, index))
+        self.listener.on_spawn(index)
+        if self._spawn_handle is None:
+            self._schedule_next_spawn()
+
+    def _on_timeout_timer(self, index: int) -> None:
+        if self._active.get(index) is None:
+            return
+        self._active[index] = None
+        self.timeout_jitter.add(self.clock.now() - self._timeout_deadlines[index])
+        self.on_mole_timeout(index)
+
+    def hide_mole(self, index: int | None = None) -> None:
+        # Without an index every visible mole is hidden. A hidden mole's
+        # timeout is stale, so it is cancelled rather than left to fire
+        # against whatever spawns in that cell next.
+        for i in list(self._active) if index is None else [index]:
+            if i not in self._active:
+                continue
+            handle = self._active.pop(i)
+            if handle is not None:
+                self.clock.cancel(handle)
+            self._timeout_deadlines.pop(i, None)
+            self._spawned_at.pop(i, None)
+            self.moles[i] = 0
+            self.listener.on_hide(i)
+
+    def on_mole_timeout(self, index: int | None = None) -> None:
+        if self.game_over:
+            return
+        if index is None:
+            index = self.current_mole_index
+        if index is not None and self.moles[index]:
+            self.misses += 1
+            spawned, deadline = self._spawned_at[index], self._timeout_deadlines[index]
+            self.listener.on_timeout(index)
+            self.hide_mole(index)
+            self._resolved(False)
+            self._expired[index] = (spawned, deadline, None if self.difficulty is None
+                                    else self.difficulty.updates)
+
+    def end_game(self) -> None:
+        self.game_over = True
+        if self._spawn_handle is not None:
+            self.clock.cancel(self._spawn_handle)
+            self._spawn_handle = None
+        self.hide_mole()
+        self.listener.on_game_over()
+
+
+def run_inputs(game: GameCore, clock: VirtualClock, clicks: Iterable[tuple[float, int]],
+               until_ms: float | None = None) -> GameCore:
+    # Feed (time_ms, cell) clicks through a headless game on a virtual clock
+    game.start()
+    for t_ms, index in clicks:
+        clock.advance_to(t_ms)
+        if game.game_over:
+            break
+        game.click(index)
+    if until_ms is not None:
+        clock.advance_to(until_ms)
+    return game
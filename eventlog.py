@@ -0,0 +1,272 @@
+import argparse
+import json
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+from core import GameCore, GameListener, ListenerGroup, ReplayClock, TkClock, VirtualClock
+
+# Session log format: a fixed preamble and a JSON header with everything
+# needed to rebuild the core (rng seed, board and timings), followed by
+# 7-byte records of (kind, time, cell). Time is microseconds since the
+# clock started, modulo 2**32. Records are appended in time order, except
+# that a click is stamped with its press time and can come a little before
+# the record ahead of it, so the reader only counts a wrap when time steps
+# back by more than half the range.
+MAGIC = b'WAMLOG'
+VERSION = 1
+_PREAMBLE = struct.Struct('<6sBH')
+_RECORD = struct.Struct('<BIH')
+
+START, SPAWN, CLICK, HIT, MISS, TIMEOUT, END = range(7)
+KIND_NAMES = ('start', 'spawn', 'click', 'hit', 'miss', 'timeout', 'end')
+NO_CELL = 0xFFFF
+
+FLUSH_BYTES = 64 * 1024
+
+Event = tuple[int, float, int]
+
+
+def session_header(core: GameCore, seed: int) -> dict:
+    return {'seed': seed, 'rows': core.rows, 'cols': core.cols,
+            'visible_ms': core.visible_ms, 'interval_ms': core.interval_ms,
+            'target_score': core.target_score, 'max_moles': core.max_moles,
+            'adaptive': core.difficulty is not None}
+
+
+def core_from_header(header: dict, clock: VirtualClock | TkClock | ReplayClock,
+                     listener: GameListener | None = None) -> GameCore:
+    return GameCore(clock, listener, rows=header['rows'], cols=header['cols'],
+                    visible_ms=header['visible_ms'], interval_ms=header['interval_ms'],
+                    target_score=header['target_score'], rng=random.Random(header['seed']),
+                    max_moles=header['max_moles'], adaptive=header.get('adaptive', False))
+
+
+# ---------------------------------------------------------------------- #
+#  Writing                                                                 #
+# ---------------------------------------------------------------------- #
+
+class EventLogWriter:
+    # Records are packed into an in-memory buffer; full buffers are handed
+    # to a background thread, so the Tk thread never waits on the disk.
+
+    def __init__(self, path: str | Path, header: dict, flush_bytes: int = FLUSH_BYTES) -> None:
+        self.path = Path(path)
+        self.flush_bytes = flush_bytes
+        self.records = 0
+        self._buf = bytearray()
+        payload = json.dumps(header, separators=(',', ':')).encode()
+        self._file = open(self.path, 'wb')
+        self._file.write(_PREAMBLE.pack(MAGIC, VERSION, len(payload)) + payload)
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name='event-log', daemon=True)
+        self._thread.start()
+
+    def append(self, kind: int, t_ms: float, cell: int = NO_CELL) -> None:
+        self._buf += _RECORD.pack(kind, round(t_ms * 1000) & 0xFFFFFFFF, cell)
+        self.records += 1
+        if len(self._buf) >= self.flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buf:
+            self._queue.put(bytes(self._buf))
+            self._buf.clear()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def _drain(self) -> None:
+        while (chunk := self._queue.get()) is not None:
+            self._file.write(chunk)
+        self._file.flush()
+
+
+class MemoryLog:
+    # In-memory sink with the writer's interface, used when replaying
+
+    def __init__(self) -> None:
+        self.events: list[Event] = []
+
+    def append(self, kind: int, t_ms: float, cell: int = NO_CELL) -> None:
+        # Same quantisation as the file format so the two compare equal
+        self.events.append((kind, round(t_ms * 1000) / 1000, cell))
+
+
+class Recorder(GameListener):
+    # Listener that turns core events into log records stamped with clock time
+
+    def __init__(self, clock: VirtualClock | TkClock | ReplayClock,
+                 sink: EventLogWriter | MemoryLog) -> None:
+        self.clock = clock
+        self.sink = sink
+
+    def on_start(self) -> None:
+        self.sink.append(START, self.clock.now())
+
+    def on_click(self, index: int, at_ms: float) -> None:
+        self.sink.append(CLICK, at_ms, index)
+
+    def on_spawn(self, index: int) -> None:
+        self.sink.append(SPAWN, self.clock.now(), index)
+
+    def on_hit(self, index: int, reaction_ms: float) -> None:
+        self.sink.append(HIT, self.clock.now(), index)
+
+    def on_miss(self, index: int) -> None:
+        self.sink.append(MISS, self.clock.now(), index)
+
+    def on_timeout(self, index: int) -> None:
+        self.sink.append(TIMEOUT, self.clock.now(), index)
+
+    def on_game_over(self) -> None:
+        self.sink.append(END, self.clock.now())
+        if isinstance(self.sink, EventLogWriter):
+            self.sink.flush()
+
+
+# ---------------------------------------------------------------------- #
+#  Reading and replay                                                      #
+# ---------------------------------------------------------------------- #
+
+def read_log(path: str | Path) -> tuple[dict, list[Event]]:
+    data = Path(path).read_bytes()
+    magic, version, length = _PREAMBLE.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path}: not a version {VERSION} whack-a-mole event log')
+    offset = _PREAMBLE.size + length
+    header = json.loads(data[_PREAMBLE.size:offset])
+    # A writer killed mid-flush can leave a partial trailing record
+    end = offset + (len(data) - offset) // _RECORD.size * _RECORD.size
+    events = []
+    wraps = 0
+    last = 0
+    for kind, t_us, cell in _RECORD.iter_unpack(data[offset:end]):
+        if last - t_us > 1 << 31:
+            wraps += 1
+        last = t_us
+        events.append((kind, ((wraps << 32) + t_us) / 1000, cell))
+    return header, events
+
+
+class ReplayMismatch(Exception):
+    pass
+
+
+class Replayer:
+    # Rebuilds the core from a log header and feeds the logged inputs
+    # (start, clicks, spawn and timeout timers) back through it; hits,
+    # misses and spawn cells are regenerated and checked against the log.
+    # Timers fire at their recorded times, so a replay reproduces the
+    # original outcome exactly however late the live timers ran.
+
+    def __init__(self, header: dict, events: list[Event],
+                 listener: GameListener | None = None) -> None:
+        self.header = header
+        self.events = events
+        self.clock = ReplayClock()
+        self.produced = MemoryLog()
+        self.core = core_from_header(header, self.clock,
+                                     ListenerGroup(listener, Recorder(self.clock, self.produced)))
+        self.position = 0
+
+    @property
+    def done(self) -> bool:
+        return self.position >= len(self.events)
+
+    def step(self) -> Event:
+        kind, t_ms, cell = event = self.events[self.position]
+        self.position += 1
+        self.clock.now_ms = t_ms
+        if kind == START:
+            self.core.start()
+        elif kind == SPAWN:
+            self.core._on_spawn_timer()
+        elif kind == CLICK:
+            self.core.click(cell, t_ms)
+        elif kind == TIMEOUT:
+            self.core._on_timeout_timer(cell)
+        return event
+
+    def run_until(self, t_ms: float) -> None:
+        while not self.done and self.events[self.position][1] <= t_ms:
+            self.step()
+
+    def verify(self) -> None:
+        expected = self.events[:self.position]
+        produced = self.produced.events
+        for i, (want, got) in enumerate(zip(expected, produced)):
+            if want[0] != got[0] or want[2] != got[2]:
+                raise ReplayMismatch(f'event {i}: logged {_describe(want)}, replay gave {_describe(got)}')
+        if len(produced) != len(expected):
+            raise ReplayMismatch(f'logged {len(expected)} events, replay gave {len(produced)}')
+
+
+def _describe(event: Event) -> str:
+    kind, t_ms, cell = event
+    where = '' if cell == NO_CELL else f' cell {cell}'
+    return f'{KIND_NAMES[kind]}{where} at {t_ms:.3f} ms'
+
+
+def replay(header: dict, events: list[Event], speed: float = 0.0,
+           listener: GameListener | None = None) -> Replayer:
+    # speed 1.0 keeps the original pacing, 10.0 runs ten times faster and
+    # 0 applies every event back to back
+    replayer = Replayer(header, events, listener)
+    t0 = time.perf_counter()
+    first = events[0][1] if events else 0.0
+    while not replayer.done:
+        if speed > 0:
+            due = (replayer.events[replayer.position][1] - first) / 1000 / speed
+            delay = due - (time.perf_counter() - t0)
+            if delay > 0:
+                time.sleep(delay)
+        replayer.step()
+    replayer.verify()
+    return replayer
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Inspect or replay a whack-a-mole event log')
+    parser.add_argument('log', type=Path)
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help='replay pacing relative to real time (default: as fast as possible)')
+    parser.add_argument('--events', action='store_true', help='print every record')
+    args = parser.parse_args(argv)
+
+    header, events = read_log(args.log)
+    if args.events:
+        for event in events:
+            print(_describe(event))
+    t0 = time.perf_counter()
+    try:
+        replayer = replay(header, events, speed=args.speed)
+    except ReplayMismatch as exc:
+        print(f'replay diverged: {exc}', file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - t0
+    core = replayer.core
+    json.dump({
+        'header': header,
+        'events': len(events),
+        'duration_ms': round(events[-1][1] - events[0][1], 3) if events else 0.0,
+        'replay_s': round(elapsed, 4),
+        'score': core.score,
+        'misses': core.misses,
+        'game_over': core.game_over,
+    }, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
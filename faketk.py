@@ -0,0 +1,426 @@
+import heapq
+import itertools
+import time
+import tkinter as tk
+from collections import Counter
+from tkinter import messagebox
+from typing import Callable
+
+# A recording stand-in for the parts of tkinter the game uses, so the
+# benchmark suite and headless tooling can run without an X display.
+# install() swaps the classes on the real tkinter module; every widget
+# method is routed through FakeTkApp.call() so the same TclCallCounter
+# accounting works against either backend.
+
+
+class FakeTkApp:
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.total = 0
+        self._timers: list[tuple[float, int, str]] = []
+        self._callbacks: dict[str, tuple[Callable[..., object], tuple]] = {}
+        self._idle: list[str] = []
+        self._seq = itertools.count(1)
+
+    def call(self, *args: object) -> object:
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        self.total += 1
+        key = str(args[1]) if len(args) > 1 and str(args[0]).startswith('.') else str(args[0])
+        self.calls[key] += 1
+        if args[:2] == ('after', 'info'):
+            return tuple(self._callbacks)
+        return ''
+
+    def splitlist(self, value: object) -> tuple:
+        return tuple(value) if isinstance(value, (tuple, list)) else ()
+
+    # -- timers ---------------------------------------------------------- #
+
+    def after(self, ms: int, fn: Callable[..., object], args: tuple) -> str:
+        after_id = f'after#{next(self._seq)}'
+        self._callbacks[after_id] = (fn, args)
+        heapq.heappush(self._timers, (time.monotonic() + ms / 1000, next(self._seq), after_id))
+        return after_id
+
+    def after_idle(self, fn: Callable[..., object], args: tuple) -> str:
+        after_id = f'after#{next(self._seq)}'
+        self._callbacks[after_id] = (fn, args)
+        self._idle.append(after_id)
+        return after_id
+
+    def after_cancel(self, after_id: str) -> None:
+        self._callbacks.pop(after_id, None)
+
+    def pending(self) -> int:
+        return len(self._callbacks)
+
+    def run_due(self) -> int:
+        ran = 0
+        idle, self._idle = self._idle, []
+        for after_id in idle:
+            ran += self._fire(after_id)
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, after_id = heapq.heappop(self._timers)
+            ran += self._fire(after_id)
+        return ran
+
+    def _fire(self, after_id: str) -> int:
+        entry = self._callbacks.pop(after_id, None)
+        if entry is None:
+            return 0
+        fn, args = entry
+        fn(*args)
+        return 1
+
+
+_app: FakeTkApp | None = None
+
+
+class FakeMisc:
+    _names = itertools.count(1)
+
+    def __init__(self, master: 'FakeMisc | None' = None, **options: object) -> None:
+        self.master = master
+        self.tk = master.tk if master is not None else _app
+        self._w = f'.w{next(self._names)}'
+        self.options: dict[str, object] = dict(options)
+        self.children: list[FakeMisc] = []
+        self.destroyed = False
+        if master is not None:
+            master.children.append(self)
+
+    def _rec(self, name: str, *args: object) -> object:
+        return self.tk.call(self._w, name, *args)
+
+    # -- configuration ---------------------------------------------------- #
+
+    def configure(self, **options: object) -> None:
+        self._rec('configure')
+        self.options.update(options)
+
+    config = configure
+
+    def cget(self, key: str) -> object:
+        self._rec('cget')
+        return self.options.get(key, '')
+
+    def __setitem__(self, key: str, value: object) -> None:
+        self.configure(**{key: value})
+
+    def __getitem__(self, key: str) -> object:
+        return self.cget(key)
+
+    # -- geometry managers ---------------------------------------------- #
+
+    def pack(self, **options: object) -> None:
+        self._rec('pack')
+
+    def grid(self, **options: object) -> None:
+        self._rec('grid')
+        self.options.update({f'grid_{k}': v for k, v in options.items()})
+
+    def grid_configure(self, **options: object) -> None:
+        self._rec('grid_configure')
+
+    def place(self, **options: object) -> None:
+        self._rec('place')
+
+    def bind(self, sequence: str, func: Callable[..., object] | None = None,
+             add: str | None = None) -> str:
+        self._rec('bind')
+        return sequence
+
+    def unbind(self, sequence: str, funcid: str | None = None) -> None:
+        self._rec('bind')
+
+    def bind_all(self, sequence: str, func: Callable[..., object] | None = None,
+                 add: str | None = None) -> str:
+        return self.bind(sequence, func, add)
+
+    # -- event loop ------------------------------------------------------ #
+
+    def after(self, ms: int, func: Callable[..., object] | None = None, *args: object) -> str:
+        self.tk.call('after', ms)
+        return self.tk.after(ms, func, args)
+
+    def after_idle(self, func: Callable[..., object], *args: object) -> str:
+        self.tk.call('after', 'idle')
+        return self.tk.after_idle(func, args)
+
+    def after_cancel(self, after_id: str) -> None:
+        self.tk.call('after', 'cancel')
+        self.tk.after_cancel(after_id)
+
+    def update(self) -> None:
+        self.tk.call('update')
+        self.tk.run_due()
+
+    def update_idletasks(self) -> None:
+        self.tk.call('update', 'idletasks')
+
+    def mainloop(self, n: int = 0) -> None:
+        while not self.destroyed:
+            if not self.tk.run_due():
+                time.sleep(0.001)
+
+    def destroy(self) -> None:
+        self._rec('destroy')
+        self.destroyed = True
+        for child in self.children:
+            child.destroy()
+
+    # -- window info ----------------------------------------------------- #
+
+    def winfo_rootx(self) -> int:
+        self._rec('winfo')
+        return 0
+
+    def winfo_rooty(self) -> int:
+        self._rec('winfo')
+        return 0
+
+    def winfo_x(self) -> int:
+        self._rec('winfo')
+        return 0
+
+    def winfo_y(self) -> int:
+        self._rec('winfo')
+        return 0
+
+    def winfo_width(self) -> int:
+        self._rec('winfo')
+        return int(self.options.get('width', 100) or 100)
+
+    def winfo_height(self) -> int:
+        self._rec('winfo')
+        return int(self.options.get('height', 100) or 100)
+
+    def winfo_exists(self) -> bool:
+        return not self.destroyed
+
+    def winfo_toplevel(self) -> 'FakeMisc':
+        widget = self
+        while widget.master is not None and not isinstance(widget, FakeWm):
+            widget = widget.master
+        return widget
+
+
+class FakeWm(FakeMisc):
+    def title(self, text: str | None = None) -> str:
+        self._rec('wm', 'title')
+        return ''
+
+    def geometry(self, spec: str | None = None) -> str:
+        self._rec('wm', 'geometry')
+        return ''
+
+    def resizable(self, width: bool | None = None, height: bool | None = None) -> None:
+        self._rec('wm', 'resizable')
+
+    def protocol(self, name: str | None = None, func: Callable[..., object] | None = None) -> str:
+        self._rec('wm', 'protocol')
+        return ''
+
+    def attributes(self, *args: object) -> object:
+        self._rec('wm', 'attributes')
+        return ''
+
+    def overrideredirect(self, flag: bool | None = None) -> None:
+        self._rec('wm', 'overrideredirect')
+
+    def lift(self, above: object = None) -> None:
+        self._rec('raise')
+
+    def withdraw(self) -> None:
+        self._rec('wm', 'withdraw')
+
+    def deiconify(self) -> None:
+        self._rec('wm', 'deiconify')
+
+    def minsize(self, width: int | None = None, height: int | None = None) -> None:
+        self._rec('wm', 'minsize')
+
+
+class FakeTk(FakeWm):
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        global _app
+        _app = FakeTkApp()
+        super().__init__(None)
+        self._w = '.'
+
+
+class FakeToplevel(FakeWm):
+    pass
+
+
+class FakeWidget(FakeMisc):
+    pass
+
+
+class FakeCanvas(FakeMisc):
+    def __init__(self, master: FakeMisc | None = None, **options: object) -> None:
+        super().__init__(master, **options)
+        self.items: dict[int, dict] = {}
+        self._ids = itertools.count(1)
+        self.view_x = 0
+        self.view_y = 0
+
+    def _create(self, kind: str, coords: tuple, options: dict) -> int:
+        self._rec('create', kind)
+        oid = next(self._ids)
+        tags = options.get('tags', ())
+        tags = (tags,) if isinstance(tags, str) else tuple(tags)
+        self.items[oid] = {'type': kind, 'coords': [float(c) for c in coords],
+                           'options': options, 'tags': tuple(t for t in tags if t)}
+        return oid
+
+    def create_line(self, *coords: float, **options: object) -> int:
+        return self._create('line', coords, options)
+
+    def create_oval(self, *coords: float, **options: object) -> int:
+        return self._create('oval', coords, options)
+
+    def create_rectangle(self, *coords: float, **options: object) -> int:
+        return self._create('rectangle', coords, options)
+
+    def create_polygon(self, *coords: float, **options: object) -> int:
+        return self._create('polygon', coords, options)
+
+    def create_text(self, *coords: float, **options: object) -> int:
+        return self._create('text', coords, options)
+
+    def create_image(self, *coords: float, **options: object) -> int:
+        return self._create('image', coords, options)
+
+    def create_window(self, *coords: float, **options: object) -> int:
+        return self._create('window', coords, options)
+
+    def _resolve(self, tag_or_id: int | str) -> list[int]:
+        if isinstance(tag_or_id, int) or str(tag_or_id).isdigit():
+            oid = int(tag_or_id)
+            return [oid] if oid in self.items else []
+        if tag_or_id == 'all':
+            return list(self.items)
+        return [oid for oid, item in self.items.items() if tag_or_id in item['tags']]
+
+    def coords(self, tag_or_id: int | str, *args: float) -> list[float]:
+        self._rec('coords')
+        ids = self._resolve(tag_or_id)
+        if args:
+            if len(args) == 1 and isinstance(args[0], (list, tuple)):
+                args = tuple(args[0])
+            for oid in ids[:1]:
+                self.items[oid]['coords'] = [float(a) for a in args]
+            return []
+        return list(self.items[ids[0]]['coords']) if ids else []
+
+    def move(self, tag_or_id: int | str, dx: float, dy: float) -> None:
+        self._rec('move')
+        for oid in self._resolve(tag_or_id):
+            c = self.items[oid]['coords']
+            c[0::2] = [x + dx for x in c[0::2]]
+            c[1::2] = [y + dy for y in c[1::2]]
+
+    def moveto(self, tag_or_id: int | str, x: float = 0, y: float = 0) -> None:
+        self._rec('moveto')
+        for oid in self._resolve(tag_or_id):
+            c = self.items[oid]['coords']
+            dx, dy = x - min(c[0::2]), y - min(c[1::2])
+            c[0::2] = [v + dx for v in c[0::2]]
+            c[1::2] = [v + dy for v in c[1::2]]
+
+    def itemconfigure(self, tag_or_id: int | str, **options: object) -> None:
+        self._rec('itemconfigure')
+        for oid in self._resolve(tag_or_id):
+            self.items[oid]['options'].update(options)
+
+    itemconfig = itemconfigure
+
+    def delete(self, *tags_or_ids: int | str) -> None:
+        self._rec('delete')
+        for tag_or_id in tags_or_ids:
+            for oid in self._resolve(tag_or_id):
+                del self.items[oid]
+
+    def tag_raise(self, tag_or_id: int | str, above: object = None) -> None:
+        self._rec('raise')
+
+    def tag_lower(self, tag_or_id: int | str, below: object = None) -> None:
+        self._rec('lower')
+
+    def find_all(self) -> tuple[int, ...]:
+        self._rec('find')
+        return tuple(self.items)
+
+    def xview_scroll(self, number: int, what: str) -> None:
+        self._rec('xview')
+        self.view_x += number
+
+    def yview_scroll(self, number: int, what: str) -> None:
+        self._rec('yview')
+        self.view_y += number
+
+    def canvasx(self, screenx: float, gridspacing: float | None = None) -> float:
+        self._rec('canvasx')
+        return float(screenx + self.view_x)
+
+    def canvasy(self, screeny: float, gridspacing: float | None = None) -> float:
+        self._rec('canvasy')
+        return float(screeny + self.view_y)
+
+
+class FakePhotoImage:
+    def __init__(self, name: str | None = None, cnf: dict | None = None,
+                 master: object = None, **options: object) -> None:
+        self.options = options
+        self._width = int(options.get('width', 0) or 0)
+        self._height = int(options.get('height', 0) or 0)
+        self.puts = 0
+        # Like tkinter, calls go through the master's interpreter, so an
+        # image made for a counted widget is counted too
+        self.tk = getattr(master, 'tk', _app)
+        if self.tk is not None:
+            self.tk.call('image', 'create')
+
+    def put(self, data: object, to: tuple | None = None) -> None:
+        self.puts += 1
+        if self.tk is not None:
+            self.tk.call('image', 'put')
+
+    def subsample(self, x: int, y: int | None = None) -> 'FakePhotoImage':
+        y = x if y is None else y
+        return FakePhotoImage(width=-(-self._width // x), height=-(-self._height // y))
+
+    def width(self) -> int:
+        return self._width
+
+    def height(self) -> int:
+        return self._height
+
+
+class FakeEvent:
+    def __init__(self, **fields: object) -> None:
+        self.__dict__.update(fields)
+
+
+shown_messages: list[tuple[str, str]] = []
+
+
+def _showinfo(title: str | None = None, message: str | None = None, **options: object) -> str:
+    shown_messages.append((title or '', message or ''))
+    return 'ok'
+
+
+def install() -> None:
+    # Swap the tkinter classes the game touches for the recording fakes
+    tk.Tk = FakeTk
+    tk.Toplevel = FakeToplevel
+    tk.Canvas = FakeCanvas
+    tk.Frame = FakeWidget
+    tk.Label = FakeWidget
+    tk.Button = FakeWidget
+    tk.PhotoImage = FakePhotoImage
+    tk.Event = FakeEvent
+    messagebox.showinfo = _showinfo
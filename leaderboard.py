@@ -0,0 +1,258 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from core import GameListener, ReplayClock, TkClock, VirtualClock
+
+if TYPE_CHECKING:
+    # Imported by the worker thread, so the game can load this module
+    # for ResultCollector without paying for sqlite3 at startup
+    import sqlite3
+
+BATCH_SIZE = 256
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY,
+    player      TEXT    NOT NULL,
+    score       INTEGER NOT NULL,
+    hits        INTEGER NOT NULL,
+    misses      INTEGER NOT NULL,
+    timeouts    INTEGER NOT NULL,
+    duration_ms REAL    NOT NULL,
+    rows        INTEGER NOT NULL,
+    cols        INTEGER NOT NULL,
+    played_at   REAL    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reactions (
+    game_id     INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+    seq         INTEGER NOT NULL,
+    cell        INTEGER NOT NULL,
+    reaction_ms REAL    NOT NULL,
+    PRIMARY KEY (game_id, seq)
+) WITHOUT ROWID;
+-- Top-N and per-player best both read straight off an index in rank order
+CREATE INDEX IF NOT EXISTS games_rank ON games(score DESC, duration_ms);
+CREATE INDEX IF NOT EXISTS games_player_rank ON games(player, score DESC, duration_ms);
+'''
+
+_GAME_COLUMNS = 'id, player, score, hits, misses, timeouts, duration_ms, rows, cols, played_at'
+
+
+def default_db_path() -> Path:
+    override = os.environ.get('WHACK_LEADERBOARD')
+    if override:
+        return Path(override)
+    base = os.environ.get('XDG_DATA_HOME') or os.path.join(Path.home(), '.local', 'share')
+    return Path(base) / 'whack-a-mole' / 'scores.db'
+
+
+class GameResult:
+    __slots__ = ('player', 'score', 'hits', 'misses', 'timeouts', 'duration_ms',
+                 'rows', 'cols', 'played_at', 'reactions')
+
+    def __init__(self, player: str, score: int, hits: int, misses: int, timeouts: int,
+                 duration_ms: float, rows: int, cols: int,
+                 reactions: list[tuple[int, float]] | None = None,
+                 played_at: float | None = None) -> None:
+        self.player = player
+        self.score = score
+        self.hits = hits
+        self.misses = misses
+        self.timeouts = timeouts
+        self.duration_ms = duration_ms
+        self.rows = rows
+        self.cols = cols
+        # (cell, reaction_ms) per hit, in hit order
+        self.reactions = reactions or []
+        self.played_at = time.time() if played_at is None else played_at
+
+
+class ResultCollector(GameListener):
+    # Tallies one game from core events: counts plus the reaction time the
+    # core measured for each hit, from spawn to press.
+
+    def __init__(self, clock: VirtualClock | TkClock | ReplayClock) -> None:
+        self.clock = clock
+        self.started = 0.0
+        self.ended = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.timeouts = 0
+        self.reactions: list[tuple[int, float]] = []
+
+    def on_start(self) -> None:
+        self.started = self.clock.now()
+
+    def on_hit(self, index: int, reaction_ms: float) -> None:
+        self.hits += 1
+        self.reactions.append((index, reaction_ms))
+
+    def on_miss(self, index: int) -> None:
+        self.misses += 1
+
+    def on_timeout(self, index: int) -> None:
+        self.timeouts += 1
+
+    def on_timeout_withdrawn(self, index: int) -> None:
+        self.timeouts -= 1
+
+    def on_game_over(self) -> None:
+        self.ended = self.clock.now()
+
+    def result(self, player: str, score: int, rows: int, cols: int) -> GameResult:
+        # Misses on the scoreboard include timeouts; keep them apart here
+        return GameResult(player, score, self.hits, self.misses, self.timeouts,
+                          self.ended - self.started, rows, cols, list(self.reactions))
+
+
+class Leaderboard:
+    # SQLite store owned by one worker thread. Callers get Futures back
+    # immediately; the worker drains its queue in batches so a burst of
+    # results becomes one transaction, and the Tk thread never touches
+    # the database.
+
+    def __init__(self, path: str | Path | None = None, batch_size: int = BATCH_SIZE) -> None:
+        self.path = Path(path) if path is not None else default_db_path()
+        self.batch_size = batch_size
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='leaderboard', daemon=True)
+        self._thread.start()
+
+    # -- public API, safe from any thread -------------------------------- #
+
+    def submit(self, result: GameResult) -> Future[int]:
+        return self._put(True, self._insert, result)
+
+    def top(self, n: int = 10) -> Future[list[dict]]:
+        return self._put(False, self._select,
+                         f'SELECT {_GAME_COLUMNS} FROM games '
+                         'ORDER BY score DESC, duration_ms LIMIT ?', (n,))
+
+    def best(self, player: str) -> Future[list[dict]]:
+        return self._put(False, self._select,
+                         f'SELECT {_GAME_COLUMNS} FROM games WHERE player = ? '
+                         'ORDER BY score DESC, duration_ms LIMIT 1', (player,))
+
+    def rank(self, score: int, duration_ms: float) -> Future[list[dict]]:
+        # 1-based position a result with this score and time would take
+        # Two range counts rather than one OR, so both stay on games_rank
+        return self._put(False, self._select,
+                         'SELECT (SELECT COUNT(*) FROM games WHERE score > ?)'
+                         ' + (SELECT COUNT(*) FROM games WHERE score = ? AND duration_ms < ?)'
+                         ' + 1 AS rank', (score, score, duration_ms))
+
+    def reactions(self, game_id: int) -> Future[list[dict]]:
+        return self._put(False, self._select,
+                         'SELECT seq, cell, reaction_ms FROM reactions '
+                         'WHERE game_id = ? ORDER BY seq', (game_id,))
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    # -- worker ---------------------------------------------------------- #
+
+    def _put(self, write: bool, fn: Callable, *args: object) -> Future:
+        future: Future = Future()
+        self._queue.put((write, fn, args, future))
+        return future
+
+    def _connect(self) -> 'sqlite3.Connection':
+        import sqlite3
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.executescript(SCHEMA)
+        return conn
+
+    def _run(self) -> None:
+        # Connecting happens here too, so even schema setup stays off the
+        # caller's thread; if it fails every request fails with that error.
+        # Any exception a request raises goes to its future, so a bad
+        # request never stops the worker with others still queued.
+        try:
+            conn = self._connect()
+        except Exception as exc:
+            while (item := self._queue.get()) is not None:
+                item[-1].set_exception(exc)
+            return
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+            writes = [item for item in batch if item[0]]
+            if writes:
+                try:
+                    with conn:
+                        done = [(future, fn(conn, *args)) for _, fn, args, future in writes]
+                except Exception as exc:
+                    for *_, future in writes:
+                        future.set_exception(exc)
+                else:
+                    for future, value in done:
+                        future.set_result(value)
+            for write, fn, args, future in batch:
+                if write:
+                    continue
+                try:
+                    future.set_result(fn(conn, *args))
+                except Exception as exc:
+                    future.set_exception(exc)
+        conn.close()
+
+    @staticmethod
+    def _insert(conn: 'sqlite3.Connection', r: GameResult) -> int:
+        cur = conn.execute(
+            'INSERT INTO games (player, score, hits, misses, timeouts, duration_ms, '
+            'rows, cols, played_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (r.player, r.score, r.hits, r.misses, r.timeouts, r.duration_ms,
+             r.rows, r.cols, r.played_at))
+        game_id = cur.lastrowid
+        conn.executemany('INSERT INTO reactions VALUES (?, ?, ?, ?)',
+                         [(game_id, seq, cell, ms) for seq, (cell, ms) in enumerate(r.reactions)])
+        return game_id
+
+    @staticmethod
+    def _select(conn: 'sqlite3.Connection', sql: str, params: tuple) -> list[dict]:
+        return [dict(row) for row in conn.execute(sql, params)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Show the whack-a-mole leaderboard')
+    parser.add_argument('--db', type=Path, default=None,
+                        help=f'database file (default: {default_db_path()})')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--player', help='show this player\'s best game instead')
+    args = parser.parse_args(argv)
+
+    board = Leaderboard(args.db)
+    try:
+        rows = (board.best(args.player) if args.player else board.top(args.top)).result()
+    finally:
+        board.close()
+    json.dump(rows, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Drives many simulated players against server.py and reports how many
+# sessions one server core sustains and the click -> result latency.
+
+# A click with no hit, miss or error by then is counted as unanswered
+REPLY_TIMEOUT_S = 5.0
+
+
+class Player:
+    # One connection playing back-to-back games: it clicks each spawned
+    # mole after a log-normal reaction time, and misclicks now and then.
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 rng: random.Random, start: dict, reaction_ms: float, misclick_rate: float) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.rng = rng
+        self.start = start
+        self.reaction_ms = reaction_ms
+        self.misclick_rate = misclick_rate
+        self.cells = start.get('rows', 4) * start.get('cols', 4)
+        self.latencies_ms: list[float] = []
+        self.games = 0
+        self.errors = 0
+        self.unanswered = 0
+        self._sent: dict[int, float] = {}
+        self._next_id = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    def send(self, message: dict) -> None:
+        self.writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+
+    async def run(self, until: float) -> None:
+        self.send({'op': 'start', **self.start})
+        loop = asyncio.get_running_loop()
+        while loop.time() < until:
+            try:
+                line = await asyncio.wait_for(self.reader.readline(), until - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            message = json.loads(line)
+            event = message.get('event')
+            if event == 'spawn':
+                task = loop.create_task(self._click_later(message['cell']))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            elif event in ('hit', 'miss'):
+                sent = self._sent.pop(message.get('id'), None)
+                if sent is not None:
+                    self.latencies_ms.append((time.perf_counter() - sent) * 1000)
+            elif event == 'over':
+                self.games += 1
+                self.send({'op': 'start', **self.start})
+            elif event == 'error':
+                self.errors += 1
+                self._sent.pop(message.get('id'), None)
+        for task in self._tasks:
+            task.cancel()
+        self._sent.clear()
+        self.send({'op': 'quit'})
+        self.writer.close()
+
+    async def _click_later(self, cell: int) -> None:
+        await asyncio.sleep(self.rng.lognormvariate(0, 0.35) * self.reaction_ms / 1000)
+        if self.rng.random() < self.misclick_rate:
+            cell = (cell + 1) % self.cells
+        self._next_id += 1
+        self._sent[self._next_id] = time.perf_counter()
+        asyncio.get_running_loop().call_later(REPLY_TIMEOUT_S, self._expire, self._next_id)
+        self.send({'op': 'click', 'cell': cell, 'id': self._next_id})
+
+    def _expire(self, click_id: int) -> None:
+        if self._sent.pop(click_id, None) is not None:
+            self.unanswered += 1
+
+
+async def _connect(address: str) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if address.startswith('unix:'):
+        return await asyncio.open_unix_connection(address[5:])
+    host, _, port = address.rpartition(':')
+    return await asyncio.open_connection(host or '127.0.0.1', int(port))
+
+
+async def _request(address: str, message: dict) -> dict:
+    reader, writer = await _connect(address)
+    writer.write(json.dumps(message).encode() + b'\n')
+    reply = json.loads(await reader.readline())
+    writer.close()
+    return reply
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0.0
+
+
+async def run_load(address: str, sessions: int, seconds: float, start: dict,
+                   reaction_ms: float, misclick_rate: float, seed: int | None) -> dict:
+    rng = random.Random(seed)
+    before = await _request(address, {'op': 'stats'})
+    connections = await asyncio.gather(*(_connect(address) for _ in range(sessions)))
+    until = asyncio.get_running_loop().time() + seconds
+    players = [Player(reader, writer, random.Random(rng.random()), start, reaction_ms, misclick_rate)
+               for reader, writer in connections]
+    await asyncio.gather(*(p.run(until) for p in players))
+    after = await _request(address, {'op': 'stats'})
+
+    latencies = sorted(ms for p in players for ms in p.latencies_ms)
+    cpu_s = after['cpu_s'] - before['cpu_s']
+    wall_s = after['wall_s'] - before['wall_s']
+    utilisation = cpu_s / wall_s if wall_s else 0.0
+    return {
+        'sessions': sessions,
+        'seconds': seconds,
+        'games_finished': sum(p.games for p in players),
+        'clicks': len(latencies),
+        'errors': sum(p.errors for p in players),
+        'unanswered': sum(p.unanswered for p in players),
+        'server_cpu_s': round(cpu_s, 3),
+        'server_core_utilisation': round(utilisation, 4),
+        # Sessions one fully busy server core would carry at this load
+        'sessions_per_core': round(sessions / utilisation) if utilisation else None,
+        'latency_p50_ms': round(_percentile(latencies, 0.50), 3),
+        'latency_p99_ms': round(_percentile(latencies, 0.99), 3),
+        'latency_max_ms': round(latencies[-1], 3) if latencies else 0.0,
+    }
+
+
+def _spawn_server() -> tuple[subprocess.Popen, str]:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = Path(__file__).with_name('server.py')
+    proc = subprocess.Popen([sys.executable, str(server), '--port', str(port)],
+                            stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()  # "listening on ..."
+    return proc, f'127.0.0.1:{port}'
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Load-test the whack-a-mole server')
+    parser.add_argument('--address', default='127.0.0.1:8765',
+                        help='HOST:PORT or unix:PATH of a running server.py')
+    parser.add_argument('--spawn', action='store_true',
+                        help='start a private server.py on a free port for the run')
+    parser.add_argument('--sessions', type=int, default=200)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--interval', type=float, default=None, help='interval_ms per game')
+    parser.add_argument('--visible', type=float, default=None, help='visible_ms per game')
+    parser.add_argument('--moles', type=int, default=None)
+    parser.add_argument('--target', type=int, default=None)
+    parser.add_argument('--reaction-ms', type=float, default=350.0)
+    parser.add_argument('--misclick-rate', type=float, default=0.05)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = {key: value for key, value in (
+        ('interval_ms', args.interval), ('visible_ms', args.visible),
+        ('moles', args.moles), ('target', args.target)) if value is not None}
+    proc = None
+    address = args.address
+    if args.spawn:
+        proc, address = _spawn_server()
+    try:
+        report = asyncio.run(run_load(address, args.sessions, args.seconds, start,
+                                      args.reaction_ms, args.misclick_rate, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    report['client_cpus'] = os.cpu_count()
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,75 +1,215 @@
-﻿import math
+﻿import argparse
+import functools
+import getpass
+import importlib.util
+import math
 import random
+import sys
+import time
 import tkinter as tk
-from tkinter import messagebox
-
-
-GRID_ROWS = 4
-GRID_COLS = 4
-MOLE_VISIBLE_MS = 800
-MOLE_INTERVAL_MS = 1000
-TARGET_SCORE = 10
-
-# Garden palette
-SKY_TOP = '#87CEEB'
-SKY_BOTTOM = '#B0E0F6'
-GRASS_LIGHT = '#4CAF50'
-GRASS_DARK = '#388E3C'
-DIRT_COLOR = '#6D4C2E'
-FENCE_COLOR = '#DEB887'
-FENCE_POST = '#A0825A'
-SUN_COLOR = '#FFD700'
-SUN_RAY = '#FFF176'
-FLOWER_COLORS = ['#FF6F61', '#FF85A1', '#FFD700', '#E040FB', '#FF7043']
-LEAF_COLOR = '#2E7D32'
-LABEL_BG = '#E8F5E9'
-CANVAS_W = 620
-CANVAS_H = 760
+from typing import TYPE_CHECKING, Callable
+
+from animation import TARGET_FPS, FrameClock
+from board import BOARDS
+from core import GRID_COLS, GRID_ROWS, GameCore, GameListener, ListenerGroup, TkClock
+from palette import GRASS_LIGHT, LABEL_BG, SKY_BOTTOM
+from particles import ParticlePool
+from perf import Profiler, TclCallCounter
+from quality import TIERS, QualityGovernor, QualityTier
+from scenery import (CLOUD_LEFT, CLOUD_ORIGINS, CLOUD_RIGHT, CLOUD_SPEED, SCENE_H, SCENE_W,
+                     SUN_RAY_SPEED, SUN_RAY_STEP, draw_garden, draw_garden_items, draw_sun_rays,
+                     make_cloud, scene_scale, sun_ray_table)
+from sprites import SpriteAtlas, quantize_scale
+from stats import StreamingStats
+from tween import Track, keyframes
+
+if TYPE_CHECKING:
+    # Imported where used: only recording, replay, the leaderboard and the
+    # software renderer need them
+    from compositor import Compositor
+    from eventlog import EventLogWriter, Replayer
+    from leaderboard import Leaderboard, ResultCollector
+
+# Initial window size; the layout follows the window from there
+CANVAS_W = SCENE_W
+CANVAS_H = SCENE_H
+# Relayout once a resize drag has paused this long
+RESIZE_SETTLE_MS = 100
+LOW_POWER_FPS = 30
+# Below the top quality tier, how often the governor samples the event
+# loop with a one-period timer while the frame clock is idle
+QUALITY_PROBE_MS = 250
 
 SPARKLE_COLORS = ['#FFD700', '#FF6F00', '#FF1744', '#E040FB', '#00E5FF']
+CONFETTI_COLORS = ['#FF1744', '#FFD700', '#2979FF', '#00E676', '#E040FB', '#FF6D00']
+SPARKLE_POOL_SIZE = 64
+CONFETTI_POOL_SIZE = 30
+
+# Effect curves, built once and sampled by elapsed time (scene units)
+RING_SHADES = Track(['#FFD700', '#FFC107', '#FFB300', '#FFA000', '#FF8F00', '#FF6F00',
+                     '#E65100'], 0.035)
+RING_WIDTHS = Track([3, 3, 2, 2, 1, 1, 1], 0.035)
+RING_RADIUS = keyframes([(0.0, 4.0), (RING_SHADES.duration, 39.0)])
+TEXT_FADE = Track(['#FFD700', '#FFD700', '#FFD700', '#FFC107', '#FFC107',
+                   '#FFB300', '#FFA000', '#FF8F00', '#FF6F00', '#E65100',
+                   '#BF360C', '#8D6E63', '#A1887F', '#BCAAA4', '#D7CCC8'], 0.05)
+# A steady 40 px/s over the fade
+TEXT_RISE = keyframes([(0.0, 0.0), (TEXT_FADE.duration, 30.0)])
+BOUNCE = Track([-6, -10, -6, 0, -3, 0], 0.035)
+SHAKE = Track([(5, 0), (-5, 0), (0, 5), (0, -5), (3, 0), (-3, 0), (0, 0)], 0.03)
+
+# Time-to-interactive budget: construction until the board is on screen
+STARTUP_BUDGET_MS = 250
+# Start the deferred stages anyway if no Expose event ever arrives
+FIRST_FRAME_FALLBACK_MS = 200
+# Give up waiting on the leaderboard worker after this long
+LEADERBOARD_WAIT_MS = 5000
 
 
-class WhackAMoleGame:
-    def __init__(self, root: tk.Tk) -> None:
+class WhackAMoleGame(GameListener):
+    def __init__(self, root: tk.Tk, flat_background: bool = True,
+                 count_tcl_calls: bool = False, perf_hud: bool = False,
+                 perf_dump: str | None = None, coalesce_cursor: bool = True,
+                 board: str = 'buttons', rows: int = GRID_ROWS, cols: int = GRID_COLS,
+                 moles: int = 1, record: str | None = None, replay: str | None = None,
+                 replay_speed: float = 1.0,
+                 open_leaderboard: 'Callable[[], Leaderboard] | None' = None,
+                 player: str = 'player', adaptive: bool = False,
+                 startup_t0: float | None = None, log_startup: bool = False,
+                 low_power: bool = False, render: str = 'tk') -> None:
+        self.startup_t0 = time.perf_counter() if startup_t0 is None else startup_t0
+        self.log_startup = log_startup
+        self.startup: dict[str, float] = {}
         self.root = root
+        self.flat_background = flat_background
+        self.coalesce_cursor = coalesce_cursor
+        self.perf_dump = perf_dump
+        # Hot-path timings and timer lateness, only when asked for
+        self.profiler = Profiler() if perf_hud or perf_dump else None
+        # Press to hit/miss feedback on screen, per click
+        self.input_latency = StreamingStats(quantiles=(0.5, 0.9, 0.99))
         self.root.title('Whack-A-Mole  \U0001F33B')
         self.root.geometry(f'{CANVAS_W}x{CANVAS_H}')
-        self.root.resizable(False, False)
+        self.root.minsize(CANVAS_W // 2, CANVAS_H // 2)
         self.root.configure(cursor='none')
 
-        self.score = 0
-        self.misses = 0
-        self.current_mole_index: int | None = None
-        self.mole_visible = False
-        self.game_over = False
+        # Rules live in the headless core; this class only renders them. A
+        # replay rebuilds the core from the log instead of the options.
+        self.replayer: 'Replayer | None' = None
+        self.replay_speed = replay_speed
+        self.event_log: 'EventLogWriter | None' = None
+        # Opened as the last startup stage: nothing needs the database or
+        # its thread before the game ends
+        self.leaderboard: 'Leaderboard | None' = None
+        self._open_leaderboard = open_leaderboard
+        self.player = player
+        self.results: 'ResultCollector | None' = None
+        if replay:
+            import eventlog
+            self.replayer = eventlog.Replayer(*eventlog.read_log(replay), listener=self)
+            self.core = self.replayer.core
+            rows, cols = self.core.rows, self.core.cols
+        else:
+            seed = random.randrange(2 ** 32)
+            self.core = GameCore(TkClock(self.root, profiler=self.profiler), listener=self,
+                                 rows=rows, cols=cols, max_moles=moles,
+                                 rng=random.Random(seed), adaptive=adaptive)
+            extra: list[GameListener] = []
+            if record:
+                import eventlog
+                self.event_log = eventlog.EventLogWriter(
+                    record, eventlog.session_header(self.core, seed))
+                extra.append(eventlog.Recorder(self.core.clock, self.event_log))
+            if open_leaderboard is not None:
+                import leaderboard as scores
+                self.results = scores.ResultCollector(self.core.clock)
+                extra.append(self.results)
+            if extra:
+                # The view goes last so its game-over sees complete tallies
+                self.core.listener = ListenerGroup(*extra, self)
+
+        # Every animation shares one frame clock instead of its own after() chain
+        self.clock = FrameClock(self.root, fps=LOW_POWER_FPS if low_power else TARGET_FPS,
+                                profiler=self.profiler)
+        # Effects step down while frames run late and back up with headroom;
+        # low-power mode pins the cheapest tier instead
+        self.governor = QualityGovernor(self.clock.period * 1000, self._set_quality,
+                                        tier=len(TIERS) - 1 if low_power else 0,
+                                        pinned=low_power)
+        self.quality = self.governor.tier
+        self.clock.on_frame = self.governor.frame
+        self._quality_probe: str | None = None
+        self._bounce_handles: dict[int, int] = {}
+        self.root.protocol('WM_DELETE_WINDOW', self.close)
+
+        # Layout: UI positions are in 620x760 scene units, scaled by a
+        # quantized factor and centred; the garden and sky fill the canvas
+        # at the exact scale
+        self.width, self.height = CANVAS_W, CANVAS_H
+        self.scale = 1.0
+        self.scenery_scale = 1.0
+        self.origin = (0.0, 0.0)
+        self._windows: list[tuple[int, float, float]] = []
+        self._fonts: dict[tk.Widget, tuple] = {}
+        self._pending_size = (CANVAS_W, CANVAS_H)
+        self._resize_after: str | None = None
+        self._fullscreen = False
 
         # -- background canvas --
+        # Scroll increments of one pixel let the canvas shake move the view
         self.canvas = tk.Canvas(self.root, width=CANVAS_W, height=CANVAS_H,
-                                highlightthickness=0, cursor='none')
+                                highlightthickness=0, cursor='none',
+                                xscrollincrement=1, yscrollincrement=1)
         self.canvas.pack(fill='both', expand=True)
 
-        self.cloud_items: list[list[int]] = []
-        self.sun_ray_ids: list[int] = []
-        self._draw_garden_background()
+        # Optional Tcl call accounting for the canvas and root timers
+        self.tcl_calls: TclCallCounter | None = None
+        if count_tcl_calls:
+            self.tcl_calls = TclCallCounter(self.root.tk)
+            self.tcl_calls.install(self.root, self.canvas)
 
-        self.hole_image = self._create_hole_image()
-        self.mole_image = self._create_mole_image()
+        # Sprites at whatever scale the layout needs, each loaded with a
+        # single Tk call and recent sizes kept in memory
+        self.sprites = SpriteAtlas()
+        self.sprites.register('garden', draw_garden, (CANVAS_W, CANVAS_H), persist_scaled=False)
 
-        # Hammer cursor – uses a transparent Toplevel so it floats above all widgets
-        self.hammer_img = self._create_hammer_image(False)
-        self.hammer_smash_img = self._create_hammer_image(True)
+        # The board and effects draw through the canvas item API, either
+        # onto the canvas itself or into one software framebuffer shown as
+        # a single image item. The hammer stays an overlay window either
+        # way: window items such as the scoreboard always cover canvas
+        # images, and the widgets hide the system cursor.
+        self.compositor: 'Compositor | None' = None
+        self.surface: 'tk.Canvas | Compositor' = self.canvas
+        if render == 'framebuffer':
+            import compositor
+            self.compositor = self.surface = compositor.Compositor(self.canvas, self.sprites)
+
+        # Two flat rectangles stand in for the garden until it is drawn
+        self._draw_backdrop()
+
+        # Cloud positions are tracked here; the canvas is only ever written to
+        self.cloud_tags: list[str] = []
+        self.cloud_x: list[float] = []
+        self.cloud_drawn_x: list[int] = []
+        self.sun_ray_ids: list[int] = []
+        self._cloud_anim: int | None = None
+        self._sun_anim: int | None = None
+
+        # Effect pools and the hammer overlay are built after the first frame
+        self.sparkles: ParticlePool | None = None
+        self.confetti: ParticlePool | None = None
+        self.hammer_overlay: tk.Toplevel | None = None
         self.hammer_smashing = False
 
-        self.hammer_overlay = tk.Toplevel(self.root)
-        self.hammer_overlay.overrideredirect(True)
-        self.hammer_overlay.attributes('-topmost', True)
-        self.hammer_overlay.attributes('-transparentcolor', '#010101')
-        self.hammer_overlay.config(bg='#010101')
-        self.hammer_overlay.geometry('32x32+0+0')
-        self.hammer_overlay.lift()
-        self.hammer_label = tk.Label(self.hammer_overlay, image=self.hammer_img,
-                                     bg='#010101', borderwidth=0)
-        self.hammer_label.pack()
+        # Latest pointer position, applied to the overlay once per frame
+        self._pointer: tuple[int, int] | None = None
+        self._pointer_since = 0.0
+        self._shown_pointer: tuple[int, int] | None = None
+        self._shown_smash = False
+        self._hammer_needs_lift = False
+        # The frame-clock animation applying them, only while one is pending
+        self._hammer_ready = False
+        self._hammer_flush: int | None = None
 
         # -- instructions --
         instructions = (
@@ -81,7 +221,7 @@ class WhackAMoleGame:
             wraplength=560, justify='center', bg=LABEL_BG, fg='#2E7D32',
             relief='groove', padx=8, pady=4, cursor='none',
         )
-        self.canvas.create_window(CANVAS_W // 2, 30, window=self.instructions_label)
+        self._place(self.instructions_label, SCENE_W / 2, 30)
 
         # -- scoreboard --
         self.scoreboard_frame = tk.Frame(self.root, bg=LABEL_BG, relief='ridge', bd=2, cursor='none')
@@ -91,24 +231,32 @@ class WhackAMoleGame:
         self.miss_label = tk.Label(self.scoreboard_frame, text='\u274C Misses: 0',
                                     font=('Arial', 14, 'bold'), bg=LABEL_BG, fg='#B71C1C', cursor='none')
         self.miss_label.pack(side=tk.LEFT, padx=10)
-        self.canvas.create_window(CANVAS_W // 2, 70, window=self.scoreboard_frame)
-
-        # -- grid of holes --
-        self.grid_frame = tk.Frame(self.root, bg=GRASS_LIGHT, cursor='none')
-        self.holes: list[tk.Button] = []
-        for r in range(GRID_ROWS):
-            for c in range(GRID_COLS):
-                index = r * GRID_COLS + c
-                btn = tk.Button(
-                    self.grid_frame, text='', image=self.hole_image,
-                    compound='center', borderwidth=0, highlightthickness=0,
-                    bg=GRASS_LIGHT, activebackground=GRASS_DARK,
-                    command=lambda i=index: self.handle_click(i),
-                    cursor='none',
-                )
-                btn.grid(row=r, column=c, padx=12, pady=12)
-                self.holes.append(btn)
-        self.canvas.create_window(CANVAS_W // 2, 380, window=self.grid_frame)
+        self.stats_label = tk.Label(self.scoreboard_frame, text='\u23F1 --- ms',
+                                    font=('Arial', 11), bg=LABEL_BG, fg='#33691E', cursor='none')
+        self.stats_label.pack(side=tk.LEFT, padx=10)
+        self._place(self.scoreboard_frame, SCENE_W / 2, 70)
+
+        # -- optional performance HUD, right of the scoreboard --
+        self.perf_label: tk.Label | None = None
+        if perf_hud:
+            self.perf_label = tk.Label(
+                self.root, text='', font=('Courier', 9), justify='left', anchor='w',
+                bg='#263238', fg='#B2FF59', padx=4, pady=2, cursor='none',
+            )
+            self._place(self.perf_label, SCENE_W - 6, 70, anchor='e')
+
+        # Wrapped before anything holds on to the bound methods
+        if self.profiler is not None:
+            self.profiler.wrap_methods(self, '_move_hammer', 'handle_click')
+
+        # -- grid of holes: buttons, image items on the canvas, or sprites
+        # in the framebuffer --
+        board_class = BOARDS[board]
+        if self.compositor is not None:
+            import compositor
+            board_class = compositor.FramebufferBoard
+        self.board = board_class(self.surface, rows, cols, self._at(SCENE_W / 2, 380),
+                                 self.sprites, self.handle_click)
 
         # -- status --
         self.status_label = tk.Label(
@@ -116,70 +264,272 @@ class WhackAMoleGame:
             font=('Arial', 13, 'bold'), bg=LABEL_BG, fg='#33691E',
             relief='groove', padx=8, pady=4, cursor='none',
         )
-        self.canvas.create_window(CANVAS_W // 2, 660, window=self.status_label)
+        self._place(self.status_label, SCENE_W / 2, 660)
+
+        # Created at scale 1; rescaled with the layout
+        self._fonts.update({
+            self.instructions_label: ('Arial', 11, 'italic'),
+            self.score_label: ('Arial', 14, 'bold'),
+            self.miss_label: ('Arial', 14, 'bold'),
+            self.stats_label: ('Arial', 11),
+            self.status_label: ('Arial', 13, 'bold'),
+        })
+        if self.perf_label is not None:
+            self._fonts[self.perf_label] = ('Courier', 9)
 
         # Bind mouse for custom hammer cursor
         self.root.bind('<Motion>', self._move_hammer)
         self.root.bind('<Button-1>', self._hammer_down)
         self.root.bind('<ButtonRelease-1>', self._hammer_up)
+        self.canvas.bind('<Configure>', self._on_configure, add='+')
+        self.root.bind('<F11>', self._toggle_fullscreen)
+        self.root.bind('<Escape>', self._leave_fullscreen)
+
+        if self.perf_label is not None:
+            self._refresh_perf_hud()
 
-        # Start background animations
-        self._animate_clouds()
-        self._rotate_sun_rays()
+        # -- staged startup --
+        # Everything above is what a player needs. Decoration and effect
+        # assets are built one stage per idle slot once the first frame is
+        # on screen, or all at once if gameplay needs them sooner.
+        self._deferred = [self._draw_garden_background, self._load_scenery, self._load_hammer,
+                          self._load_effects]
+        if self.results is not None:
+            self._deferred.append(self._load_leaderboard)
+        self.canvas.bind('<Expose>', self._first_expose, add='+')
+        self.root.after(FIRST_FRAME_FALLBACK_MS, self._first_frame_overdue)
 
-        self.root.after(MOLE_INTERVAL_MS, self.spawn_mole)
+        if self.replayer is not None:
+            self._replay_t0 = self.clock.now()
+            self._replay_step()
+        else:
+            self.core.start()
 
     # ------------------------------------------------------------------ #
-    #  Hammer cursor                                                       #
+    #  Staged startup                                                      #
+    # ------------------------------------------------------------------ #
+
+    def _first_expose(self, event: 'tk.Event[tk.Misc]') -> None:
+        # The redraw runs as an idle handler queued by this Expose, so an
+        # idle callback queued now runs once the board has been painted
+        self.root.after_idle(self._mark_interactive)
+
+    def _first_frame_overdue(self) -> None:
+        # No Expose yet, e.g. a window manager slow to map the window: the
+        # deferred stages start anyway, but nothing has been painted, so
+        # time-to-interactive still waits for the first real Expose and
+        # fallback_ms records that this fired
+        if 'interactive_ms' in self.startup:
+            return
+        self._record_startup('fallback_ms')
+        self.root.after_idle(self._run_deferred)
+
+    def _mark_interactive(self) -> None:
+        if 'interactive_ms' in self.startup:
+            return
+        self.canvas.unbind('<Expose>')
+        self._record_startup('interactive_ms')
+        if 'fallback_ms' not in self.startup:
+            self.root.after_idle(self._run_deferred)
+
+    def _run_deferred(self) -> None:
+        if self._deferred:
+            self._deferred.pop(0)()
+            self.root.after_idle(self._run_deferred)
+        elif 'decorated_ms' not in self.startup:
+            self._record_startup('decorated_ms')
+
+    def _finish_startup(self) -> None:
+        while self._deferred:
+            self._deferred.pop(0)()
+
+    def _record_startup(self, key: str) -> None:
+        ms = (time.perf_counter() - self.startup_t0) * 1000
+        self.startup[key] = round(ms, 2)
+        if self.profiler is not None:
+            self.profiler.counters[f'startup_{key}'] = self.startup[key]
+        over = key == 'interactive_ms' and ms > STARTUP_BUDGET_MS
+        if self.log_startup or over:
+            note = f' (over the {STARTUP_BUDGET_MS} ms budget)' if over else ''
+            print(f'startup: {key.removesuffix("_ms")} after {ms:.1f} ms{note}', file=sys.stderr)
+
+    def _load_leaderboard(self) -> None:
+        self.leaderboard = self._open_leaderboard()
+
+    def _load_scenery(self) -> None:
+        self._draw_scenery()
+        self._sync_scenery()
+
+    def _load_hammer(self) -> None:
+        # Hammer cursor – uses a transparent Toplevel so it floats above all widgets
+        self.hammer_overlay = tk.Toplevel(self.root)
+        self.hammer_overlay.overrideredirect(True)
+        self.hammer_overlay.attributes('-topmost', True)
+        self.hammer_overlay.attributes('-transparentcolor', '#010101')
+        self.hammer_overlay.config(bg='#010101')
+        self.hammer_overlay.lift()
+        self.hammer_label = tk.Label(self.hammer_overlay, bg='#010101', borderwidth=0)
+        self.hammer_label.pack()
+        self._load_hammer_images()
+        if self.coalesce_cursor:
+            # Re-raise the overlay only after something has covered it
+            self.hammer_overlay.bind('<Visibility>', self._hammer_visibility)
+            self.root.bind('<FocusIn>', self._hammer_restack, add='+')
+            self._hammer_ready = True
+            self._request_hammer_flush()
+
+    def _load_hammer_images(self) -> None:
+        self.hammer_size = round(self.sprites.base_size('hammer')[0] * self.scale)
+        self.hammer_img = self.sprites.scaled('hammer', self.scale)
+        self.hammer_smash_img = self.sprites.scaled('hammer_smash', self.scale)
+        self._show_hammer(self.hammer_smash_img if self._shown_smash else self.hammer_img)
+        self._put_hammer(*(self._shown_pointer or (0, 0)))
+
+    def _show_hammer(self, image: tk.PhotoImage) -> None:
+        self.hammer_label.config(image=image)
+
+    def _put_hammer(self, x_root: int, y_root: int) -> None:
+        size = self.hammer_size
+        self.hammer_overlay.geometry(f'{size}x{size}+{x_root}+{y_root}')
+
+    def _load_effects(self) -> None:
+        # Reusable hidden canvas items for hit sparkles and game-over confetti
+        self.sparkles = ParticlePool(self.surface, self.clock, SPARKLE_POOL_SIZE,
+                                     name='_move_sparkle')
+        self.confetti = ParticlePool(self.surface, self.clock, CONFETTI_POOL_SIZE,
+                                     shape='rect', group='confetti', name='_fall_confetti')
+
+    # ------------------------------------------------------------------ #
+    #  Layout                                                              #
     # ------------------------------------------------------------------ #
 
-    def _create_hammer_image(self, smash: bool) -> tk.PhotoImage:
-        s = 32
-        img = tk.PhotoImage(width=s, height=s)
-        handle = '#8B4513'
-        handle_hi = '#A0522D'
-        head = '#757575'
-        head_hi = '#9E9E9E'
-        head_dk = '#424242'
-
-        if not smash:
-            # Handle diagonal lower-right
-            for i in range(16):
-                bx, by = 8 + i, 16 + i
-                for d in range(3):
-                    px, py = bx + d, by
-                    if 0 <= px < s and 0 <= py < s:
-                        img.put(handle if d < 2 else handle_hi, (px, py))
-            # Head block at top-left
-            for x in range(2, 20):
-                for y in range(10, 20):
-                    c = head_hi if y < 13 else head_dk if y > 17 else head
-                    img.put(c, (x, y))
-            for x in range(3, 19):
-                img.put('#BDBDBD', (x, 11))
+    def _at(self, x: float, y: float) -> tuple[int, int]:
+        # Scene units to canvas pixels
+        ox, oy = self.origin
+        return round(ox + x * self.scale), round(oy + y * self.scale)
+
+    def _place(self, widget: tk.Widget, x: float, y: float, **options: object) -> int:
+        oid = self.canvas.create_window(*self._at(x, y), window=widget, **options)
+        self._windows.append((oid, x, y))
+        return oid
+
+    def _font(self, spec: tuple) -> tuple:
+        family, size, *style = spec
+        return (family, max(6, round(size * self.scale)), *style)
+
+    def _draw_backdrop(self) -> None:
+        horizon = self.height // 2 - round(20 * self.scenery_scale)
+        if self.compositor is not None:
+            self.compositor.set_backdrop(self.width, self.height, horizon, SKY_BOTTOM, GRASS_LIGHT)
+            return
+        self.canvas.delete('backdrop')
+        self.canvas.create_rectangle(0, 0, self.width, horizon, fill=SKY_BOTTOM, outline='',
+                                     tags='backdrop')
+        self.canvas.create_rectangle(0, horizon, self.width, self.height, fill=GRASS_LIGHT,
+                                     outline='', tags='backdrop')
+        self.canvas.tag_lower('backdrop')
+
+    def _on_configure(self, event: 'tk.Event[tk.Misc]') -> None:
+        # A drag sends a stream of these; relayout once it pauses
+        self._pending_size = (event.width, event.height)
+        if self._resize_after is not None:
+            self.root.after_cancel(self._resize_after)
+        self._resize_after = self.root.after(RESIZE_SETTLE_MS, self._relayout)
+
+    def _relayout(self) -> None:
+        self._resize_after = None
+        width, height = self._pending_size
+        if (width, height) == (self.width, self.height) or width < 2 or height < 2:
+            return
+        self.width, self.height = width, height
+        self.scenery_scale = scene_scale(width, height)
+        scale = quantize_scale(self.scenery_scale)
+        self.origin = ((width - SCENE_W * scale) / 2, (height - SCENE_H * scale) / 2)
+        rescaled = scale != self.scale
+        self.scale = scale
+
+        for oid, x, y in self._windows:
+            self.canvas.coords(oid, *self._at(x, y))
+        if rescaled:
+            for widget, spec in self._fonts.items():
+                widget.config(font=self._font(spec))
+            self.instructions_label.config(wraplength=round(560 * scale))
+            if self._load_hammer not in self._deferred:
+                self._load_hammer_images()
+        self.board.resize(self._at(SCENE_W / 2, 380), scale)
+
+        # Stages that have already run are redrawn at the new size
+        if self._draw_garden_background in self._deferred:
+            self._draw_backdrop()
         else:
-            # Handle vertical
-            for i in range(16):
-                bx, by = 14, 16 + i
-                if by < s:
-                    for d in range(3):
-                        img.put(handle if d < 2 else handle_hi, (bx + d, by))
-            # Head block horizontal on top
-            for x in range(4, 28):
-                for y in range(6, 18):
-                    if x < s:
-                        c = head_hi if y < 9 else head_dk if y > 15 else head
-                        img.put(c, (x, y))
-            for x in range(5, 27):
-                if x < s:
-                    img.put('#BDBDBD', (x, 7))
-        return img
+            self._draw_garden_background()
+        if self._load_scenery not in self._deferred:
+            self._draw_scenery()
+
+    def _toggle_fullscreen(self, event: 'tk.Event[tk.Misc] | None' = None) -> None:
+        self._fullscreen = not self._fullscreen
+        self.root.attributes('-fullscreen', self._fullscreen)
+
+    def _leave_fullscreen(self, event: 'tk.Event[tk.Misc] | None' = None) -> None:
+        if self._fullscreen:
+            self._toggle_fullscreen()
+
+    # ------------------------------------------------------------------ #
+    #  Hammer cursor                                                       #
+    # ------------------------------------------------------------------ #
 
     def _move_hammer(self, event: 'tk.Event[tk.Misc]') -> None:
-        img = self.hammer_smash_img if self.hammer_smashing else self.hammer_img
-        self.hammer_label.config(image=img)
-        self.hammer_overlay.geometry(f'32x32+{event.x_root}+{event.y_root}')
-        self.hammer_overlay.lift()
+        if not self.coalesce_cursor:
+            if self.hammer_overlay is None:
+                return
+            img = self.hammer_smash_img if self.hammer_smashing else self.hammer_img
+            self.hammer_label.config(image=img)
+            size = self.hammer_size
+            self.hammer_overlay.geometry(f'{size}x{size}+{event.x_root}+{event.y_root}')
+            self.hammer_overlay.lift()
+            return
+        # Just remember the position; _flush_hammer applies it next frame
+        if self._pointer is None:
+            self._pointer_since = self.clock.now()
+        self._pointer = (event.x_root, event.y_root)
+        self._request_hammer_flush()
+
+    def _request_hammer_flush(self) -> None:
+        # Runs _flush_hammer on the next frame; nothing ticks for the
+        # cursor while the pointer is still
+        if self._hammer_ready and self._hammer_flush is None:
+            self._hammer_flush = self.clock.animate(self._flush_hammer, on_end=self._hammer_flushed,
+                                                    group='cursor', name='_flush_hammer')
+
+    def _hammer_flushed(self) -> None:
+        self._hammer_flush = None
+
+    def _flush_hammer(self, _elapsed: float) -> None:
+        handle, self._hammer_flush = self._hammer_flush, None
+        if handle is not None:
+            self.clock.cancel(handle, finish=False)
+        if self.hammer_smashing != self._shown_smash:
+            self._shown_smash = self.hammer_smashing
+            self._show_hammer(self.hammer_smash_img if self.hammer_smashing else self.hammer_img)
+        if self._pointer is not None:
+            if self._pointer != self._shown_pointer:
+                self._shown_pointer = self._pointer
+                self._put_hammer(*self._pointer)
+            if self.profiler is not None:
+                self.profiler.record_lateness('cursor', (self.clock.now() - self._pointer_since) * 1000)
+            self._pointer = None
+        if self._hammer_needs_lift:
+            self._hammer_needs_lift = False
+            self.hammer_overlay.lift()
+
+    def _hammer_visibility(self, event: 'tk.Event[tk.Misc]') -> None:
+        if event.state != 'VisibilityUnobscured':
+            self._hammer_needs_lift = True
+            self._request_hammer_flush()
+
+    def _hammer_restack(self, event: 'tk.Event[tk.Misc]') -> None:
+        self._hammer_needs_lift = True
+        self._request_hammer_flush()
 
     def _hammer_down(self, event: 'tk.Event[tk.Misc]') -> None:
         self.hammer_smashing = True
@@ -193,335 +543,544 @@ class WhackAMoleGame:
         self._move_hammer(event)
 
     def _impact_ring(self, cx: int, cy: int) -> None:
-        oid = self.canvas.create_oval(cx - 4, cy - 4, cx + 4, cy + 4,
-                                       outline='#FFD700', width=3)
-        self._grow_ring(oid, cx, cy, 4, 0)
+        s = self.scale
+        surface = self.surface
+        oid = surface.create_oval(cx - 4 * s, cy - 4 * s, cx + 4 * s, cy + 4 * s,
+                                  outline=RING_SHADES.values[0], width=round(3 * s))
+        shown = [0]
 
-    def _grow_ring(self, oid: int, cx: int, cy: int, r: int, step: int) -> None:
-        if step >= 7:
-            self.canvas.delete(oid)
-            return
-        r += 5
-        self.canvas.coords(oid, cx - r, cy - r, cx + r, cy + r)
-        shades = ['#FFD700', '#FFC107', '#FFB300', '#FFA000', '#FF8F00', '#FF6F00', '#E65100']
-        self.canvas.itemconfigure(oid, outline=shades[step], width=max(1, 3 - step // 2))
-        self.root.after(35, self._grow_ring, oid, cx, cy, r, step + 1)
+        def step(elapsed: float) -> None:
+            r = RING_RADIUS.at(elapsed) * s
+            surface.coords(oid, cx - r, cy - r, cx + r, cy + r)
+            frame = RING_SHADES.index(elapsed)
+            if frame != shown[0]:
+                shown[0] = frame
+                surface.itemconfigure(oid, outline=RING_SHADES.values[frame],
+                                      width=max(1, round(RING_WIDTHS.values[frame] * s)))
+
+        self.clock.animate(step, RING_SHADES.duration, lambda: surface.delete(oid))
 
     # ------------------------------------------------------------------ #
     #  Garden background                                                   #
     # ------------------------------------------------------------------ #
 
     def _draw_garden_background(self) -> None:
-        c = self.canvas
-        for y in range(0, CANVAS_H // 2, 2):
-            ratio = y / (CANVAS_H // 2)
-            r = int(135 + (176 - 135) * ratio)
-            g = int(206 + (224 - 206) * ratio)
-            b = int(235 + (246 - 235) * ratio)
-            c.create_line(0, y, CANVAS_W, y, fill=f'#{r:02x}{g:02x}{b:02x}')
-        c.create_rectangle(0, CANVAS_H // 2 - 20, CANVAS_W, CANVAS_H,
-                            fill=GRASS_LIGHT, outline='')
-        for y in range(CANVAS_H // 2, CANVAS_H, 18):
-            c.create_rectangle(0, y, CANVAS_W, y + 8, fill=GRASS_DARK, outline='')
-        sx, sy, sr = 80, 70, 40
-        for i in range(12):
-            angle = math.radians(i * 30)
-            x1 = sx + math.cos(angle) * (sr + 8)
-            y1 = sy + math.sin(angle) * (sr + 8)
-            x2 = sx + math.cos(angle) * (sr + 25)
-            y2 = sy + math.sin(angle) * (sr + 25)
-            ray_id = c.create_line(x1, y1, x2, y2, fill=SUN_RAY, width=4)
-            self.sun_ray_ids.append(ray_id)
-        c.create_oval(sx - sr, sy - sr, sx + sr, sy + sr,
-                        fill=SUN_COLOR, outline='#FFC107', width=2)
-        self.sun_cx, self.sun_cy, self.sun_r = sx, sy, sr
-        fence_y = CANVAS_H // 2 - 50
-        c.create_rectangle(0, fence_y, CANVAS_W, fence_y + 8, fill=FENCE_COLOR, outline=FENCE_POST)
-        c.create_rectangle(0, fence_y + 30, CANVAS_W, fence_y + 38, fill=FENCE_COLOR, outline=FENCE_POST)
-        for x in range(20, CANVAS_W, 50):
-            c.create_rectangle(x, fence_y - 15, x + 10, fence_y + 50,
-                                fill=FENCE_COLOR, outline=FENCE_POST)
-            c.create_polygon(x, fence_y - 15, x + 5, fence_y - 25, x + 10, fence_y - 15,
-                            fill=FENCE_COLOR, outline=FENCE_POST)
-        random.seed(42)
-        for _ in range(18):
-            fx = random.randint(10, CANVAS_W - 10)
-            fy = random.randint(CANVAS_H // 2 + 10, CANVAS_H - 30)
-            self._draw_flower(c, fx, fy)
-        random.seed()
-        for cx_, cy_ in [(200, 40), (420, 55), (540, 25)]:
-            cloud = self._make_cloud(c, cx_, cy_)
-            self.cloud_items.append(cloud)
-
-    def _draw_flower(self, c: tk.Canvas, x: int, y: int) -> None:
-        petal = random.choice(FLOWER_COLORS)
-        ps = random.randint(5, 8)
-        c.create_line(x, y, x, y + 18, fill=LEAF_COLOR, width=2)
-        for angle in range(0, 360, 72):
-            dx = math.cos(math.radians(angle)) * ps
-            dy = math.sin(math.radians(angle)) * ps
-            c.create_oval(x + dx - 3, y + dy - 3, x + dx + 3, y + dy + 3,
-                            fill=petal, outline='')
-        c.create_oval(x - 3, y - 3, x + 3, y + 3, fill='#FFF9C4', outline='')
-
-    def _make_cloud(self, c: tk.Canvas, x: int, y: int) -> list[int]:
-        ids = []
-        for dx, dy, r in [(-15, 0, 18), (0, -8, 22), (18, 0, 18), (8, 5, 16)]:
-            oid = c.create_oval(x + dx - r, y + dy - r, x + dx + r, y + dy + r,
-                                fill='white', outline='#E0E0E0')
-            ids.append(oid)
-        return ids
+        # Static scenery is one image item (cached per canvas size); only the
+        # animated sun rays and clouds stay as live canvas items. It replaces
+        # the startup backdrop, or the garden drawn for the previous size,
+        # and goes beneath everything drawn since.
+        if self.compositor is not None:
+            self.compositor.load_background('garden', (self.width, self.height))
+            return
+        self.canvas.delete('backdrop', 'garden')
+        if self.flat_background:
+            self.background_image = self.sprites.photo('garden', (self.width, self.height))
+            self.canvas.create_image(0, 0, anchor='nw', image=self.background_image,
+                                     tags='garden')
+        else:
+            draw_garden_items(self.canvas, self.width, self.height, tag='garden')
+        self.canvas.tag_lower('garden')
+
+    def _draw_scenery(self) -> None:
+        # Cloud positions are kept in scene units, so a redraw for a new
+        # size puts each cloud back where it was
+        s = self.scenery_scale
+        self.canvas.delete(*self.sun_ray_ids, *self.cloud_tags)
+        self.sun_ray_ids = draw_sun_rays(self.canvas, s)
+        self._sun_table = sun_ray_table(s)
+        if not self.cloud_x:
+            self.cloud_x = [float(x) for x, _ in CLOUD_ORIGINS]
+        self.cloud_tags, self.cloud_drawn_x = [], []
+        for i, (x, (_, y)) in enumerate(zip(self.cloud_x, CLOUD_ORIGINS)):
+            tag = f'cloud{i}'
+            drawn = round(x * s)
+            make_cloud(self.canvas, drawn, y * s, tag=tag, scale=s)
+            self.cloud_tags.append(tag)
+            self.cloud_drawn_x.append(drawn)
 
     # ------------------------------------------------------------------ #
     #  Background animations                                               #
     # ------------------------------------------------------------------ #
 
-    def _animate_clouds(self) -> None:
-        for cloud in self.cloud_items:
-            for oid in cloud:
-                self.canvas.move(oid, 0.3, 0)
-                coords = self.canvas.coords(oid)
-                if coords and coords[0] > CANVAS_W + 40:
-                    w = coords[2] - coords[0]
-                    h = coords[3] - coords[1]
-                    self.canvas.coords(oid, -40, coords[1], -40 + w, coords[1] + h)
-        self.root.after(50, self._animate_clouds)
-
-    def _rotate_sun_rays(self) -> None:
-        if not hasattr(self, '_sun_angle'):
-            self._sun_angle = 0
-        self._sun_angle += 1
-        sx, sy, sr = self.sun_cx, self.sun_cy, self.sun_r
-        for i, ray_id in enumerate(self.sun_ray_ids):
-            angle = math.radians(i * 30 + self._sun_angle)
-            x1 = sx + math.cos(angle) * (sr + 8)
-            y1 = sy + math.sin(angle) * (sr + 8)
-            x2 = sx + math.cos(angle) * (sr + 25)
-            y2 = sy + math.sin(angle) * (sr + 25)
-            self.canvas.coords(ray_id, x1, y1, x2, y2)
-        self.root.after(80, self._rotate_sun_rays)
+    def _sync_scenery(self) -> None:
+        # Start or stop the background animations to match the quality tier
+        if self.quality.clouds and self._cloud_anim is None:
+            self._cloud_anim = self._animate_clouds()
+        elif not self.quality.clouds and self._cloud_anim is not None:
+            self.clock.cancel(self._cloud_anim, finish=False)
+            self._cloud_anim = None
+        if self.quality.sun_rays and self._sun_anim is None:
+            self._sun_anim = self._rotate_sun_rays()
+        elif not self.quality.sun_rays and self._sun_anim is not None:
+            self.clock.cancel(self._sun_anim, finish=False)
+            self._sun_anim = None
+
+    def _animate_clouds(self) -> int:
+        last = [0.0]
+
+        def step(elapsed: float) -> None:
+            dx = CLOUD_SPEED * (elapsed - last[0])
+            last[0] = elapsed
+            s = self.scenery_scale
+            for i, tag in enumerate(self.cloud_tags):
+                x = self.cloud_x[i] + dx
+                if x + CLOUD_LEFT > self.width / s + 40:
+                    x = -CLOUD_RIGHT
+                self.cloud_x[i] = x
+                # One move per cloud group, and only once it shifts a whole pixel
+                shift = round(x * s) - self.cloud_drawn_x[i]
+                if shift:
+                    self.canvas.move(tag, shift, 0)
+                    self.cloud_drawn_x[i] += shift
+
+        return self.clock.animate(step, group='scenery', name='_animate_clouds')
+
+    def _rotate_sun_rays(self) -> int:
+        def step(elapsed: float) -> None:
+            # Rays only change on whole-degree steps
+            angle = int(SUN_RAY_SPEED * elapsed) % 360
+            if angle != self._sun_angle:
+                self._sun_angle = angle
+                table = self._sun_table
+                for i, ray_id in enumerate(self.sun_ray_ids):
+                    self.canvas.coords(ray_id, *table[(angle + i * SUN_RAY_STEP) % 360])
+
+        self._sun_angle = 0
+        return self.clock.animate(step, group='scenery', name='_rotate_sun_rays')
+
+    # ------------------------------------------------------------------ #
+    #  Effects quality                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _set_quality(self, tier: QualityTier) -> None:
+        self.quality = tier
+        if self.profiler is not None:
+            self.profiler.counters.update(quality_tier=self.governor.index,
+                                          quality_changes=self.governor.changes)
+        if self._load_scenery not in self._deferred:
+            self._sync_scenery()
+        if self.governor.index > 0 and self._quality_probe is None:
+            self._quality_probe = self.root.after(QUALITY_PROBE_MS, self._probe_quality)
+
+    def _probe_quality(self) -> None:
+        # The governor hears from the frame clock only while something
+        # animates; at a tier with nothing animated it would otherwise
+        # never see the headroom to step back up
+        if self.governor.index == 0:
+            self._quality_probe = None
+        elif self.clock.animations:
+            self._quality_probe = self.root.after(QUALITY_PROBE_MS, self._probe_quality)
+        else:
+            period_ms = round(self.clock.period * 1000)
+            self._quality_probe = self.root.after(period_ms, self._quality_probed, self.clock.now())
+
+    def _quality_probed(self, started: float) -> None:
+        self._quality_probe = None
+        interval_ms = (self.clock.now() - started) * 1000
+        # Stands for the wait since the last probe as well
+        self.governor.sample(interval_ms, QUALITY_PROBE_MS + interval_ms)
+        if self.governor.index > 0 and self._quality_probe is None:
+            self._quality_probe = self.root.after(QUALITY_PROBE_MS, self._probe_quality)
+
+    # ------------------------------------------------------------------ #
+    #  Performance HUD                                                     #
+    # ------------------------------------------------------------------ #
+
+    def _refresh_perf_hud(self) -> None:
+        last = {'t': 0.0, 'frame': self.clock.frame}
+
+        def step(elapsed: float) -> None:
+            if elapsed - last['t'] < 0.5:
+                return
+            fps = (self.clock.frame - last['frame']) / (elapsed - last['t'])
+            last['t'], last['frame'] = elapsed, self.clock.frame
+            late = max((s.take_window_max() for s in self.profiler.lateness.values()),
+                       default=0.0)
+            items = len(self.canvas.find_all())
+            timers = len(self.root.tk.splitlist(self.root.tk.call('after', 'info')))
+            spawn = self.core.spawn_jitter
+            timeout = self.core.timeout_jitter
+            self.profiler.counters.update(
+                fps=round(fps, 1), canvas_items=items, pending_timers=timers,
+                spawn_jitter_mean_ms=round(spawn.mean, 3), spawn_jitter_max_ms=round(spawn.max, 3),
+                timeout_jitter_mean_ms=round(timeout.mean, 3),
+                timeout_jitter_max_ms=round(timeout.max, 3),
+                quality_tier=self.governor.index,
+                frame_interval_ms=round(self.governor.interval_ms, 3),
+            )
+            self._count_input_latency()
+            latency = self.input_latency.quantile(0.9)
+            self.perf_label.config(text=f'FPS    {fps:5.1f}\nlate   {late:5.1f} ms\n'
+                                        f'items  {items:5d}\ntimers {timers:5d}\n'
+                                        f'jitter {spawn.mean:5.1f} ms\n'
+                                        f'input  {latency:5.1f} ms\n'
+                                        f'tier   {self.quality.name:>7}')
+
+        self.clock.animate(step, group='hud')
+
+    def _count_input_latency(self) -> None:
+        for key, value in self.input_latency.as_dict().items():
+            self.profiler.counters[f'input_latency_{key}'] = value
 
     # ------------------------------------------------------------------ #
     #  Hit / miss / game-over effects                                      #
     # ------------------------------------------------------------------ #
 
     def _sparkle_burst(self, cx: int, cy: int) -> None:
-        for _ in range(8):
+        # Per-40 ms-frame speeds from the original effect, converted to px/s
+        s = self.scale
+        for _ in range(self.quality.sparkles):
             angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            color = random.choice(SPARKLE_COLORS)
-            size = random.randint(3, 6)
-            oid = self.canvas.create_oval(cx - size, cy - size, cx + size, cy + size,
-                                           fill=color, outline='')
-            dx = math.cos(angle) * speed
-            dy = math.sin(angle) * speed
-            self._move_sparkle(oid, dx, dy, 0)
-
-    def _move_sparkle(self, oid: int, dx: float, dy: float, step: int) -> None:
-        if step >= 10:
-            self.canvas.delete(oid)
-            return
-        self.canvas.move(oid, dx, dy)
-        coords = self.canvas.coords(oid)
-        if coords:
-            cx = (coords[0] + coords[2]) / 2
-            cy = (coords[1] + coords[3]) / 2
-            new_r = max(1, (coords[2] - coords[0]) / 2 - 0.3)
-            self.canvas.coords(oid, cx - new_r, cy - new_r, cx + new_r, cy + new_r)
-        self.root.after(40, self._move_sparkle, oid, dx, dy - 0.3, step + 1)
+            speed = random.uniform(2, 5) * s
+            self.sparkles.spawn(
+                cx, cy,
+                vx=math.cos(angle) * speed / 0.04,
+                vy=(math.sin(angle) * speed + 0.15 * s) / 0.04,
+                ay=-187.5 * s, size=random.randint(3, 6) * s, shrink=7.5 * s, life=0.4,
+                color=random.choice(SPARKLE_COLORS),
+            )
 
     def _float_text(self, text: str, cx: int, cy: int, color: str) -> None:
-        tid = self.canvas.create_text(cx, cy, text=text, font=('Arial', 18, 'bold'),
-                                       fill=color)
-        self._rise_text(tid, 0)
+        tid = self.surface.create_text(cx, cy, text=text,
+                                        font=self._font(('Arial', 18, 'bold')), fill=color)
+        self._rise_text(tid, cx, cy)
 
-    def _rise_text(self, tid: int, step: int) -> None:
-        if step >= 15:
-            self.canvas.delete(tid)
-            return
-        self.canvas.move(tid, 0, -2)
-        fade = ['#FFD700', '#FFD700', '#FFD700', '#FFC107', '#FFC107',
-                '#FFB300', '#FFA000', '#FF8F00', '#FF6F00', '#E65100',
-                '#BF360C', '#8D6E63', '#A1887F', '#BCAAA4', '#D7CCC8']
-        if step < len(fade):
-            self.canvas.itemconfigure(tid, fill=fade[step])
-        self.root.after(50, self._rise_text, tid, step + 1)
-
-    def _miss_flash(self, btn: tk.Button) -> None:
-        original_bg = btn.cget('bg')
-        btn.config(bg='#EF5350')
-        self.root.after(120, lambda: btn.config(bg=original_bg))
+    def _rise_text(self, tid: int, cx: float, cy: float) -> None:
+        surface = self.surface
+        shown = [-1]
+
+        def step(elapsed: float) -> None:
+            surface.coords(tid, cx, cy - TEXT_RISE.at(elapsed) * self.scale)
+            frame = TEXT_FADE.index(elapsed)
+            if frame != shown[0]:
+                shown[0] = frame
+                surface.itemconfigure(tid, fill=TEXT_FADE.values[frame])
+
+        self.clock.animate(step, TEXT_FADE.duration, lambda: surface.delete(tid))
+
+    def _miss_flash(self, index: int) -> None:
+        self.board.flash(index, True)
+        self.clock.animate(lambda _: None, 0.12, lambda: self.board.flash(index, False))
 
     def _score_pulse(self) -> None:
-        self.score_label.config(font=('Arial', 18, 'bold'), fg='#FFD700')
-        self.root.after(150, lambda: self.score_label.config(font=('Arial', 14, 'bold'), fg='#1B5E20'))
+        self.score_label.config(font=self._font(('Arial', 18, 'bold')), fg='#FFD700')
+        self.clock.animate(lambda _: None, 0.15, lambda: self.score_label.config(
+            font=self._font(('Arial', 14, 'bold')), fg='#1B5E20'))
 
     def _screen_shake(self) -> None:
+        if self.quality.shake == 'window':
+            self._window_shake()
+        elif self.quality.shake == 'canvas':
+            self._canvas_shake()
+
+    def _window_shake(self) -> None:
+        # Moves the whole toplevel: a window manager round trip per step
         x = self.root.winfo_x()
         y = self.root.winfo_y()
-        offsets = [(5, 0), (-5, 0), (0, 5), (0, -5), (3, 0), (-3, 0), (0, 0)]
-        for i, (dx, dy) in enumerate(offsets):
-            self.root.after(i * 30, lambda nx=x + dx, ny=y + dy: self.root.geometry(f'+{nx}+{ny}'))
+        shown = [-1]
+
+        def step(elapsed: float) -> None:
+            frame = SHAKE.index(elapsed)
+            if frame != shown[0]:
+                shown[0] = frame
+                dx, dy = SHAKE.values[frame]
+                self.root.geometry(f'+{x + dx}+{y + dy}')
+
+        self.clock.animate(step, SHAKE.duration, lambda: self.root.geometry(f'+{x}+{y}'))
+
+    def _canvas_shake(self) -> None:
+        # Same offsets applied by scrolling the canvas view: no window
+        # manager involvement and no item coordinates touched
+        shown = [(0, 0)]
+
+        def shift(dx: int, dy: int) -> None:
+            ox, oy = shown[0]
+            shown[0] = (dx, dy)
+            # Content moves right when the view scrolls left
+            if dx != ox:
+                self.canvas.xview_scroll(ox - dx, 'units')
+            if dy != oy:
+                self.canvas.yview_scroll(oy - dy, 'units')
+
+        def step(elapsed: float) -> None:
+            shift(*SHAKE.at(elapsed))
+
+        self.clock.animate(step, SHAKE.duration, lambda: shift(0, 0))
 
     def _confetti(self) -> None:
-        colors = ['#FF1744', '#FFD700', '#2979FF', '#00E676', '#E040FB', '#FF6D00']
-        for _ in range(30):
-            x = random.randint(50, CANVAS_W - 50)
-            y = random.randint(-20, 0)
-            color = random.choice(colors)
-            size = random.randint(4, 8)
-            oid = self.canvas.create_rectangle(x, y, x + size, y + size * 2,
-                                                fill=color, outline='')
-            dx = random.uniform(-2, 2)
-            dy = random.uniform(2, 5)
-            self._fall_confetti(oid, dx, dy, 0)
-
-    def _fall_confetti(self, oid: int, dx: float, dy: float, step: int) -> None:
-        if step >= 60:
-            self.canvas.delete(oid)
-            return
-        self.canvas.move(oid, dx + math.sin(step * 0.3) * 1.5, dy)
-        self.root.after(40, self._fall_confetti, oid, dx, dy, step + 1)
+        s = self.scale
+        margin = round(50 * s)
+        for _ in range(self.quality.confetti):
+            self.confetti.spawn(
+                random.randint(margin, max(margin, self.width - margin)),
+                random.randint(round(-20 * s), 0),
+                vx=random.uniform(-2, 2) * s / 0.04, vy=random.uniform(2, 5) * s / 0.04,
+                size=random.randint(4, 8) * s, life=self.quality.confetti_life,
+                color=random.choice(CONFETTI_COLORS),
+                sway=5.0 * s, sway_freq=7.5,
+            )
 
     # ------------------------------------------------------------------ #
     #  Game logic                                                          #
     # ------------------------------------------------------------------ #
 
-    def handle_click(self, index: int) -> None:
-        if self.game_over:
+    def handle_click(self, index: int, event_time: int | None = None) -> None:
+        # Boards call this on the press, before the toplevel's hammer
+        # binding, with the press event's own timestamp
+        if self.replayer is not None:
             return
-        if self.mole_visible and self.current_mole_index == index:
-            self.score += 1
-            self.update_score_label()
-            self.status_label.config(text='\U0001F389 Hit!')
-            btn = self.holes[index]
-            bx = btn.winfo_rootx() - self.root.winfo_rootx() + btn.winfo_width() // 2
-            by = btn.winfo_rooty() - self.root.winfo_rooty() + btn.winfo_height() // 2
-            self._sparkle_burst(bx, by)
-            self._float_text('+1', bx, by - 20, '#FFD700')
-            self._score_pulse()
-            self._screen_shake()
-            self.hide_mole()
-            if self.score >= TARGET_SCORE:
-                self.end_game()
-        else:
-            self.misses += 1
-            self.status_label.config(text='\U0001F4A8 Miss!')
-            self.update_miss_label()
-            self._miss_flash(self.holes[index])
+        at_ms = None if event_time is None else self.core.clock.event_time(event_time)
+        self.core.click(index, at_ms)
+        if at_ms is not None:
+            # Idle callbacks run in order, so this one runs after the
+            # redraws the hit or miss just queued have been committed
+            self.root.after_idle(self._feedback_shown, at_ms)
+
+    def _feedback_shown(self, at_ms: float) -> None:
+        self.input_latency.add(self.core.clock.now() - at_ms)
+
+    def _replay_step(self) -> None:
+        # Apply every logged event due by now, then sleep until the next one
+        replayer = self.replayer
+        first = replayer.events[0][1] if replayer.events else 0.0
+        now_ms = first + (self.clock.now() - self._replay_t0) * 1000 * self.replay_speed
+        replayer.run_until(now_ms)
+        if replayer.done:
+            from eventlog import ReplayMismatch
+            try:
+                replayer.verify()
+            except ReplayMismatch as exc:
+                print(f'replay diverged: {exc}', file=sys.stderr)
+                self.status_label.config(text='\u26A0 Replay diverged')
+            return
+        delay = (replayer.events[replayer.position][1] - now_ms) / self.replay_speed
+        self.root.after(max(0, int(delay)), self._replay_step)
 
     def update_score_label(self) -> None:
-        self.score_label.config(text=f'\U0001F3AF Score: {self.score}')
+        self.score_label.config(text=f'\U0001F3AF Score: {self.core.score}')
 
     def update_miss_label(self) -> None:
-        self.miss_label.config(text=f'\u274C Misses: {self.misses}')
+        self.miss_label.config(text=f'\u274C Misses: {self.core.misses}')
 
-    def spawn_mole(self) -> None:
-        if self.game_over:
-            return
-        if self.mole_visible:
-            self.hide_mole()
-        new_index = random.randrange(GRID_ROWS * GRID_COLS)
-        self.current_mole_index = new_index
-        self.mole_visible = True
-        btn = self.holes[new_index]
-        btn.config(bg=GRASS_DARK, image=self.mole_image, compound='center')
-        self._bounce_mole(btn, 0)
-        self.root.after(MOLE_VISIBLE_MS, self.on_mole_timeout)
-        self.root.after(MOLE_INTERVAL_MS, self.spawn_mole)
-
-    def _bounce_mole(self, btn: tk.Button, step: int) -> None:
-        if step >= 6:
-            btn.grid_configure(pady=12)
-            return
-        offsets = [-6, -10, -6, 0, -3, 0]
-        btn.grid_configure(pady=(12 + offsets[step], 12 - offsets[step]))
-        self.root.after(35, self._bounce_mole, btn, step + 1)
-
-    def hide_mole(self) -> None:
-        if self.current_mole_index is not None:
-            self.holes[self.current_mole_index].config(bg=GRASS_LIGHT, image=self.hole_image, compound='center')
-            self.holes[self.current_mole_index].grid_configure(pady=12)
-        self.current_mole_index = None
-        self.mole_visible = False
-
-    def on_mole_timeout(self) -> None:
-        if self.game_over:
-            return
-        if self.mole_visible:
-            self.misses += 1
-            self.status_label.config(text='\u23F0 Too slow!')
-            self.update_miss_label()
-            self.hide_mole()
+    def update_stats_label(self) -> None:
+        reaction = self.core.reaction
+        text = '\u23F1 --- ms'
+        if reaction.count:
+            text = f'\u23F1 {reaction.ewma:.0f} ms  p90 {reaction.quantile(0.9):.0f}'
+        if self.core.difficulty is not None:
+            text += f'  \U0001F441 {self.core.visible_ms:.0f} ms'
+        self.stats_label.config(text=text)
+
+    def summary_text(self) -> str:
+        lines = [f'You reached {self.core.score} points with {self.core.misses} misses.']
+        reaction = self.core.reaction
+        if reaction.count:
+            lines.append(f'Reaction time: mean {reaction.mean:.0f} ms, '
+                         f'median {reaction.quantile(0.5):.0f} ms, '
+                         f'p90 {reaction.quantile(0.9):.0f} ms, best {reaction.min:.0f} ms.')
+        if self.core.difficulty is not None:
+            lines.append(f'Final pace: moles visible {self.core.visible_ms:.0f} ms, '
+                         f'every {self.core.interval_ms:.0f} ms.')
+        return '\n'.join(lines)
 
     # ------------------------------------------------------------------ #
-    #  Pixel-art images                                                    #
+    #  Core listener                                                       #
     # ------------------------------------------------------------------ #
 
-    def _create_hole_image(self) -> tk.PhotoImage:
-        size = 100
-        img = tk.PhotoImage(width=size, height=size)
-        img.put(GRASS_LIGHT, to=(0, 0, size, size))
-        cx, cy, r = size // 2, size // 2, size // 2 - 6
-        for x in range(size):
-            for y in range(size):
-                dist_sq = (x - cx) ** 2 + (y - cy) ** 2
-                if dist_sq <= r * r:
-                    if dist_sq >= (r - 4) ** 2:
-                        img.put('#5D4037', (x, y))
-                    else:
-                        img.put(DIRT_COLOR, (x, y))
-        return img
-
-    def _create_mole_image(self) -> tk.PhotoImage:
-        size = 100
-        img = tk.PhotoImage(width=size, height=size)
-        img.put(GRASS_LIGHT, to=(0, 0, size, size))
-        cx, cy, r = size // 2, size // 2, size // 2 - 6
-        for x in range(size):
-            for y in range(size):
-                dist_sq = (x - cx) ** 2 + (y - cy) ** 2
-                if dist_sq <= r * r:
-                    if dist_sq >= (r - 4) ** 2:
-                        img.put('#5D4037', (x, y))
-                    else:
-                        img.put(DIRT_COLOR, (x, y))
-        mole_r = r - 10
-        mole_color = '#795548'
-        for x in range(size):
-            for y in range(size):
-                if (x - cx) ** 2 + (y - cy) ** 2 <= mole_r * mole_r:
-                    img.put(mole_color, (x, y))
-        for ex in [(cx - 12, cy - 8), (cx + 6, cy - 8)]:
-            for x in range(ex[0], ex[0] + 10):
-                for y in range(ex[1], ex[1] + 10):
-                    img.put('white', (x, y))
-            for x in range(ex[0] + 3, ex[0] + 7):
-                for y in range(ex[1] + 3, ex[1] + 7):
-                    img.put('#000000', (x, y))
-        for x in range(cx - 4, cx + 4):
-            for y in range(cy + 2, cy + 8):
-                img.put('#FF8A80', (x, y))
-        for x in range(cx - 10, cx + 10):
-            for y in range(cy + 10, cy + 14):
-                img.put('#4E342E', (x, y))
-        return img
-
-    def end_game(self) -> None:
-        self.game_over = True
-        self.hide_mole()
-        for btn in self.holes:
-            btn.config(state=tk.DISABLED)
+    def on_hit(self, index: int, reaction_ms: float) -> None:
+        self._finish_startup()
+        self.update_score_label()
+        self.update_stats_label()
+        self.status_label.config(text='\U0001F389 Hit!')
+        bx, by = self.board.cell_center(index)
+        self._sparkle_burst(bx, by)
+        self._float_text('+1', bx, by - round(20 * self.scale), '#FFD700')
+        self._score_pulse()
+        self._screen_shake()
+
+    def on_miss(self, index: int) -> None:
+        self.status_label.config(text='\U0001F4A8 Miss!')
+        self.update_miss_label()
+        if 0 <= index < self.core.cells:
+            self._miss_flash(index)
+
+    def on_spawn(self, index: int) -> None:
+        if self.core.difficulty is not None:
+            self.update_stats_label()
+        self.board.show_mole(index)
+        self._bounce_mole(index)
+
+    def _bounce_mole(self, index: int) -> None:
+        shown = [0]
+
+        def step(elapsed: float) -> None:
+            off = BOUNCE.at(elapsed)
+            if off != shown[0]:
+                shown[0] = off
+                self.board.set_offset(index, off)
+
+        def done() -> None:
+            self._bounce_handles.pop(index, None)
+            self.board.set_offset(index, 0)
+
+        self._bounce_handles[index] = self.clock.animate(step, BOUNCE.duration, done)
+
+    def on_hide(self, index: int) -> None:
+        handle = self._bounce_handles.pop(index, None)
+        if handle is not None:
+            self.clock.cancel(handle, finish=False)
+        self.board.hide_mole(index)
+
+    def on_timeout(self, index: int) -> None:
+        self.status_label.config(text='\u23F0 Too slow!')
+        self.update_miss_label()
+
+    def on_timeout_withdrawn(self, index: int) -> None:
+        self.update_miss_label()
+
+    def on_game_over(self) -> None:
+        self._finish_startup()
+        self.clock.cancel_group('effects')
+        self.board.disable()
         self.status_label.config(text='\U0001F3C6 Game over!')
         self._confetti()
-        self.root.after(1500, lambda: messagebox.showinfo(
-            'Game over', f'You reached {self.score} points with {self.misses} misses.'))
+        self.root.after(1500, self._show_summary)
+        if self.leaderboard is not None and self.results is not None:
+            self._save_result()
+
+    def _show_summary(self) -> None:
+        # Only needed once per game, so it is not imported at startup
+        from tkinter import messagebox
+        messagebox.showinfo('Game over', self.summary_text())
+
+    # ------------------------------------------------------------------ #
+    #  Leaderboard                                                         #
+    # ------------------------------------------------------------------ #
+
+    def _save_result(self) -> None:
+        # All database work happens on the leaderboard thread; the queries
+        # queue behind the insert, so they already include this game
+        result = self.results.result(self.player, self.core.score, self.core.rows, self.core.cols)
+        futures = [self.leaderboard.submit(result), self.leaderboard.top(5),
+                   self.leaderboard.rank(result.score, result.duration_ms)]
+        self._when_done(futures, self._show_leaderboard,
+                        time.monotonic() + LEADERBOARD_WAIT_MS / 1000)
+
+    def _when_done(self, futures: list, fn: Callable[..., None], deadline: float) -> None:
+        if not all(f.done() for f in futures):
+            if time.monotonic() >= deadline:
+                print('leaderboard unavailable: no reply', file=sys.stderr)
+                return
+            self.root.after(50, self._when_done, futures, fn, deadline)
+            return
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors:
+            print(f'leaderboard unavailable: {errors[0]}', file=sys.stderr)
+            return
+        fn(*(f.result() for f in futures))
+
+    def _show_leaderboard(self, game_id: int, top: list[dict], rank: list[dict]) -> None:
+        lines = ['\U0001F3C6 Leaderboard']
+        for i, row in enumerate(top, 1):
+            mark = ' \u25C0' if row['id'] == game_id else ''
+            lines.append(f'{i}. {row["player"][:12]:<12} {row["score"]:>3}  '
+                         f'{row["duration_ms"] / 1000:6.1f} s{mark}')
+        lines.append(f'You placed #{rank[0]["rank"]}')
+        font = ('Courier', 12, 'bold')
+        self.leaderboard_label = tk.Label(
+            self.root, text='\n'.join(lines), font=self._font(font),
+            justify='left', bg=LABEL_BG, fg='#1B5E20', relief='ridge', bd=2,
+            padx=10, pady=6, cursor='none',
+        )
+        self._fonts[self.leaderboard_label] = font
+        self._place(self.leaderboard_label, SCENE_W / 2, 380)
+
+    def close(self) -> None:
+        self.core.game_over = True
+        self.clock.stop()
+        if self.profiler is not None and self.perf_dump:
+            self._count_input_latency()
+            self.profiler.dump(self.perf_dump)
+        if self.event_log is not None:
+            self.event_log.close()
+        # Drop any remaining one-shot timers (spawns, timeouts, summary dialog)
+        for after_id in self.root.tk.splitlist(self.root.tk.call('after', 'info')):
+            self.root.after_cancel(after_id)
+        self.root.destroy()
+
+
+def _open_leaderboard(path: str | None) -> 'Leaderboard':
+    from leaderboard import Leaderboard
+    return Leaderboard(path)
+
+
+def _default_player() -> str:
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):
+        return 'player'
+
 
+def main(argv: list[str] | None = None) -> None:
+    t0 = time.perf_counter()
+    parser = argparse.ArgumentParser(description='Whack-A-Mole')
+    parser.add_argument('--perf-hud', action='store_true',
+                        help='show live FPS, timer lateness, canvas items and pending timers')
+    parser.add_argument('--perf-dump', metavar='PATH',
+                        help='write hot-path timings on exit (.json or .csv)')
+    parser.add_argument('--board', choices=sorted(BOARDS), default='buttons',
+                        help='draw holes as buttons (classic) or straight onto the canvas')
+    parser.add_argument('--render', choices=['tk', 'framebuffer'], default='tk',
+                        help='tk items and widgets, or composite the playfield in software '
+                             'with NumPy (draws its own board; --board is ignored)')
+    parser.add_argument('--rows', type=int, default=GRID_ROWS)
+    parser.add_argument('--cols', type=int, default=GRID_COLS)
+    parser.add_argument('--moles', type=int, default=1,
+                        help='how many moles may be up at once')
+    parser.add_argument('--record', metavar='PATH',
+                        help='write every spawn, click, hit, miss and timeout to a binary log')
+    parser.add_argument('--replay', metavar='PATH', help='play back a log written by --record')
+    parser.add_argument('--replay-speed', type=float, default=1.0, metavar='FACTOR',
+                        help='replay pacing relative to the original session')
+    parser.add_argument('--player', default=_default_player(),
+                        help='name saved with your score on the leaderboard')
+    parser.add_argument('--leaderboard-db', metavar='PATH',
+                        help='SQLite file for results (default: per-user data dir)')
+    parser.add_argument('--no-leaderboard', action='store_true',
+                        help='do not save or show results')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='tune mole visibility and spawn interval to hold a steady hit rate')
+    parser.add_argument('--startup-log', action='store_true',
+                        help='print time-to-interactive and time until fully decorated')
+    parser.add_argument('--low-power', action='store_true',
+                        help=f'cheapest effects, still scenery and {LOW_POWER_FPS} fps animations '
+                             '(kiosks, battery)')
+    args = parser.parse_args(argv)
+    if args.replay_speed <= 0:
+        parser.error('--replay-speed must be positive')
+    if args.render == 'framebuffer' and importlib.util.find_spec('numpy') is None:
+        parser.error('--render framebuffer needs NumPy')
+    if (args.board == 'buttons' and args.render == 'tk'
+            and args.rows * args.cols > GRID_ROWS * GRID_COLS):
+        parser.error('boards larger than 4x4 need --board canvas')
+    if args.moles < 1 or args.moles >= args.rows * args.cols:
+        parser.error('--moles must be at least 1 and smaller than the number of holes')
 
-def main() -> None:
+    open_scores = None
+    if not (args.no_leaderboard or args.replay):
+        open_scores = functools.partial(_open_leaderboard, args.leaderboard_db)
     root = tk.Tk()
-    WhackAMoleGame(root)
-    root.mainloop()
+    game = WhackAMoleGame(root, perf_hud=args.perf_hud, perf_dump=args.perf_dump,
+                          board=args.board, rows=args.rows, cols=args.cols, moles=args.moles,
+                          record=args.record, replay=args.replay, replay_speed=args.replay_speed,
+                          open_leaderboard=open_scores, player=args.player, adaptive=args.adaptive,
+                          startup_t0=t0, log_startup=args.startup_log, low_power=args.low_power,
+                          render=args.render)
+    try:
+        root.mainloop()
+    finally:
+        if game.leaderboard is not None:
+            game.leaderboard.close()
 
 
 if __name__ == '__main__':
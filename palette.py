@@ -0,0 +1,19 @@
+# Garden palette
+SKY_TOP = '#87CEEB'
+SKY_BOTTOM = '#B0E0F6'
+GRASS_LIGHT = '#4CAF50'
+GRASS_DARK = '#388E3C'
+DIRT_COLOR = '#6D4C2E'
+DIRT_RIM = '#5D4037'
+MOLE_COLOR = '#795548'
+FENCE_COLOR = '#DEB887'
+FENCE_POST = '#A0825A'
+SUN_COLOR = '#FFD700'
+SUN_OUTLINE = '#FFC107'
+SUN_RAY = '#FFF176'
+FLOWER_COLORS = ['#FF6F61', '#FF85A1', '#FFD700', '#E040FB', '#FF7043']
+FLOWER_CENTER = '#FFF9C4'
+LEAF_COLOR = '#2E7D32'
+CLOUD_COLOR = '#FFFFFF'
+CLOUD_OUTLINE = '#E0E0E0'
+LABEL_BG = '#E8F5E9'
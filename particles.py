@@ -0,0 +1,101 @@
+import tkinter as tk
+from array import array
+
+from animation import FrameClock
+from tween import SWAY
+
+
+class ParticlePool:
+    # Fixed set of canvas items created hidden up front and reused. Particle
+    # state lives in flat arrays indexed by slot; each frame does exactly one
+    # coords() write per live particle and never reads geometry back.
+    # Motion is closed form in particle age t (seconds):
+    #   x = x0 + vx*t + sway * (1 - cos(sway_freq * t))
+    #   y = y0 + vy*t + ay*t*t/2
+    #   size = max(min_size, size0 - shrink*t)
+
+    def __init__(self, canvas: tk.Canvas, clock: FrameClock, capacity: int,
+                 shape: str = 'oval', group: str = 'effects', min_size: float = 1.0,
+                 name: str | None = None) -> None:
+        self.canvas = canvas
+        self.name = name
+        self.clock = clock
+        self.capacity = capacity
+        self.shape = shape
+        self.group = group
+        self.min_size = min_size
+        create = canvas.create_oval if shape == 'oval' else canvas.create_rectangle
+        self.items = [create(0, 0, 0, 0, outline='', state='hidden') for _ in range(capacity)]
+        zeros = [0.0] * capacity
+        self.x0 = array('d', zeros)
+        self.y0 = array('d', zeros)
+        self.vx = array('d', zeros)
+        self.vy = array('d', zeros)
+        self.ay = array('d', zeros)
+        self.size = array('d', zeros)
+        self.shrink = array('d', zeros)
+        self.sway = array('d', zeros)
+        self.sway_freq = array('d', zeros)
+        self.born = array('d', zeros)
+        self.life = array('d', zeros)
+        self.live: list[int] = []
+        self.free = list(range(capacity - 1, -1, -1))
+        self._handle: int | None = None
+
+    def spawn(self, x: float, y: float, vx: float, vy: float, size: float, life: float,
+              color: str, ay: float = 0.0, shrink: float = 0.0,
+              sway: float = 0.0, sway_freq: float = 0.0) -> None:
+        if self.free:
+            slot = self.free.pop()
+        else:
+            # Pool exhausted: recycle the oldest live particle
+            slot = self.live.pop(0)
+        self.x0[slot], self.y0[slot] = x, y
+        self.vx[slot], self.vy[slot], self.ay[slot] = vx, vy, ay
+        self.size[slot], self.shrink[slot] = size, shrink
+        self.sway[slot], self.sway_freq[slot] = sway, sway_freq
+        self.born[slot], self.life[slot] = self.clock.now(), life
+        self.live.append(slot)
+        self._place(slot, 0.0)
+        self.canvas.itemconfigure(self.items[slot], fill=color, state='normal')
+        if self._handle is None:
+            self._handle = self.clock.animate(self._step, on_end=self._on_cancel,
+                                              group=self.group, name=self.name)
+
+    def clear(self) -> None:
+        for slot in self.live:
+            self.canvas.itemconfigure(self.items[slot], state='hidden')
+            self.free.append(slot)
+        self.live.clear()
+
+    def _place(self, slot: int, t: float) -> None:
+        x = self.x0[slot] + self.vx[slot] * t
+        if self.sway[slot]:
+            x += self.sway[slot] * SWAY(self.sway_freq[slot] * t)
+        y = self.y0[slot] + self.vy[slot] * t + 0.5 * self.ay[slot] * t * t
+        s = max(self.min_size, self.size[slot] - self.shrink[slot] * t)
+        if self.shape == 'oval':
+            self.canvas.coords(self.items[slot], x - s, y - s, x + s, y + s)
+        else:
+            self.canvas.coords(self.items[slot], x, y, x + s, y + s * 2)
+
+    def _step(self, _elapsed: float) -> None:
+        now = self.clock.frame_time
+        still_live = []
+        for slot in self.live:
+            t = now - self.born[slot]
+            if t >= self.life[slot]:
+                self.canvas.itemconfigure(self.items[slot], state='hidden')
+                self.free.append(slot)
+            else:
+                self._place(slot, t)
+                still_live.append(slot)
+        self.live = still_live
+        if not still_live:
+            handle, self._handle = self._handle, None
+            if handle is not None:
+                self.clock.cancel(handle, finish=False)
+
+    def _on_cancel(self) -> None:
+        self._handle = None
+        self.clear()
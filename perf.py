@@ -0,0 +1,135 @@
+import time
+import tkinter as tk
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+
+class TclCallCounter:
+    # Stands in for a widget's `tk` attribute and counts every Tcl call made
+    # through it, keyed by subcommand ('coords', 'move', 'after', ...).
+
+    def __init__(self, tkapp: object) -> None:
+        self._tk = tkapp
+        self.total = 0
+        self.by_command: Counter[str] = Counter()
+
+    def call(self, *args: object) -> object:
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        self.total += 1
+        if len(args) > 1 and isinstance(args[0], str) and args[0].startswith('.'):
+            self.by_command[str(args[1])] += 1
+        elif args:
+            self.by_command[str(args[0])] += 1
+        return self._tk.call(*args)
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self._tk, name)
+
+    def install(self, *widgets: tk.Misc) -> None:
+        for widget in widgets:
+            widget.tk = self
+
+    def snapshot(self) -> tuple[int, Counter[str]]:
+        return self.total, Counter(self.by_command)
+
+
+class PathStats:
+    __slots__ = ('count', 'total_ms', 'max_ms', 'window_max_ms')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.window_max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if ms > self.window_max_ms:
+            self.window_max_ms = ms
+
+    def take_window_max(self) -> float:
+        # Worst sample since the previous call (for a live display)
+        value, self.window_max_ms = self.window_max_ms, 0.0
+        return value
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'mean_ms': round(self.total_ms / self.count, 4) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 3),
+        }
+
+
+class Profiler:
+    # Per-function timings for hot paths plus timer lateness (how long after
+    # its deadline a scheduled callback actually ran). Only created when
+    # profiling is requested, so the normal game pays nothing for it.
+
+    def __init__(self) -> None:
+        self.timings: dict[str, PathStats] = {}
+        self.lateness: dict[str, PathStats] = {}
+        self.counters: dict[str, float] = {}
+        self.started = time.perf_counter()
+
+    def record(self, name: str, ms: float) -> None:
+        stats = self.timings.get(name)
+        if stats is None:
+            stats = self.timings[name] = PathStats()
+        stats.add(ms)
+
+    def record_lateness(self, name: str, ms: float) -> None:
+        stats = self.lateness.get(name)
+        if stats is None:
+            stats = self.lateness[name] = PathStats()
+        stats.add(max(0.0, ms))
+
+    def timed(self, name: str, fn: Callable[..., object]) -> Callable[..., object]:
+        perf_counter = time.perf_counter
+
+        def wrapper(*args: object, **kwargs: object) -> object:
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, (perf_counter() - t0) * 1000)
+
+        wrapper.__name__ = getattr(fn, '__name__', name)
+        return wrapper
+
+    def wrap_methods(self, obj: object, *names: str) -> None:
+        # Replace bound methods on one instance with timed versions
+        for name in names:
+            setattr(obj, name, self.timed(name, getattr(obj, name)))
+
+    def summary(self) -> dict:
+        return {
+            'elapsed_s': round(time.perf_counter() - self.started, 3),
+            'timings': {k: v.as_dict() for k, v in sorted(self.timings.items())},
+            'lateness': {k: v.as_dict() for k, v in sorted(self.lateness.items())},
+            'counters': dict(self.counters),
+        }
+
+    def dump(self, path: str | Path) -> None:
+        # Only used once, on exit
+        import csv
+        import json
+        path = Path(path)
+        if path.suffix.lower() == '.csv':
+            with path.open('w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['kind', 'name', 'count', 'total_ms', 'mean_ms', 'max_ms'])
+                for kind, table in (('timing', self.timings), ('lateness', self.lateness)):
+                    for name, stats in sorted(table.items()):
+                        d = stats.as_dict()
+                        writer.writerow([kind, name, d['count'], d['total_ms'],
+                                         d['mean_ms'], d['max_ms']])
+                for name, value in self.counters.items():
+                    writer.writerow(['counter', name, '', value, '', ''])
+        else:
+            path.write_text(json.dumps(self.summary(), indent=2) + '\n')
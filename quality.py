@@ -0,0 +1,96 @@
+from typing import Callable
+
+# Effect budgets from the original look down to what a struggling or
+# power-constrained machine can afford. The governor moves one tier at a
+# time; gameplay feedback (score, status, floating "+1") is never cut.
+
+
+class QualityTier:
+    __slots__ = ('name', 'sparkles', 'confetti', 'confetti_life', 'shake', 'clouds', 'sun_rays')
+
+    def __init__(self, name: str, sparkles: int, confetti: int, confetti_life: float,
+                 shake: str | None, clouds: bool, sun_rays: bool) -> None:
+        self.name = name
+        # Particles per hit burst and per game-over shower
+        self.sparkles = sparkles
+        self.confetti = confetti
+        self.confetti_life = confetti_life
+        # 'window' moves the toplevel (the original effect), 'canvas'
+        # scrolls the canvas view instead, None skips the shake
+        self.shake = shake
+        self.clouds = clouds
+        self.sun_rays = sun_rays
+
+
+TIERS = [
+    QualityTier('full', sparkles=8, confetti=30, confetti_life=2.4, shake='window',
+                clouds=True, sun_rays=True),
+    QualityTier('reduced', sparkles=5, confetti=20, confetti_life=1.8, shake='canvas',
+                clouds=True, sun_rays=True),
+    QualityTier('low', sparkles=3, confetti=10, confetti_life=1.2, shake='canvas',
+                clouds=False, sun_rays=True),
+    QualityTier('minimal', sparkles=0, confetti=0, confetti_life=0.0, shake=None,
+                clouds=False, sun_rays=False),
+]
+
+# Smoothed frame interval, relative to the target period, beyond which the
+# governor steps down, and under which it counts as headroom
+SLOW_FACTOR = 1.5
+HEADROOM_FACTOR = 1.15
+# One stalled frame (a modal dialog, a swap to disk) counts as at most
+# this many periods, so only sustained slowness moves the tier
+STALL_CAP = 4
+# Frame time that must pass at one tier before the next step; stepping up
+# waits longer so a tier that just proved too heavy is not retried at once
+DOWN_AFTER_MS = 1000.0
+UP_AFTER_MS = 5000.0
+
+
+class QualityGovernor:
+    # Fed the interval between consecutive frame clock ticks, which covers
+    # everything the loop did in between: animation steps, Tk redraws,
+    # window manager round trips and input handling. When the frame clock
+    # is idle, a one-period probe timer stands in. A pinned governor
+    # (low-power mode) never moves.
+
+    def __init__(self, period_ms: float, on_change: Callable[[QualityTier], None],
+                 tier: int = 0, pinned: bool = False, alpha: float = 0.1) -> None:
+        self.period_ms = period_ms
+        self.on_change = on_change
+        self.index = tier
+        self.pinned = pinned
+        self.alpha = alpha
+        self.interval_ms = period_ms
+        self.changes = 0
+        self._at_tier_ms = 0.0
+
+    @property
+    def tier(self) -> QualityTier:
+        return TIERS[self.index]
+
+    def frame(self, interval_ms: float) -> None:
+        self.sample(interval_ms, interval_ms)
+
+    def sample(self, interval_ms: float, elapsed_ms: float) -> None:
+        # One interval standing for elapsed_ms of play: for frames the two
+        # are the same; while no frames run (a tier with nothing animated)
+        # a probe timer's interval stands for the time between probes
+        if self.pinned:
+            return
+        sample = min(interval_ms, self.period_ms * STALL_CAP)
+        self.interval_ms += self.alpha * (sample - self.interval_ms)
+        self._at_tier_ms += elapsed_ms
+        if (self.interval_ms > self.period_ms * SLOW_FACTOR and self._at_tier_ms >= DOWN_AFTER_MS
+                and self.index < len(TIERS) - 1):
+            self._set(self.index + 1)
+        elif (self.interval_ms < self.period_ms * HEADROOM_FACTOR
+              and self._at_tier_ms >= UP_AFTER_MS and self.index > 0):
+            self._set(self.index - 1)
+
+    def _set(self, index: int) -> None:
+        self.index = index
+        self.changes += 1
+        self._at_tier_ms = 0.0
+        # Judge the new tier on its own frames
+        self.interval_ms = self.period_ms
+        self.on_change(self.tier)
@@ -0,0 +1,166 @@
+import functools
+import math
+import random
+import tkinter as tk
+
+from palette import (CLOUD_COLOR, CLOUD_OUTLINE, FENCE_COLOR, FENCE_POST, FLOWER_CENTER,
+                     FLOWER_COLORS, GRASS_DARK, GRASS_LIGHT, LEAF_COLOR, SKY_BOTTOM,
+                     SKY_TOP, SUN_COLOR, SUN_OUTLINE, SUN_RAY)
+from sprites import PixelBuffer, hex_to_rgba
+
+# Everything below is laid out for a 620x760 scene and scaled uniformly
+# to fit larger or smaller windows
+SCENE_W, SCENE_H = 620, 760
+SUN_X, SUN_Y, SUN_R = 80, 70, 40
+SUN_RAY_COUNT = 12
+SUN_RAY_STEP = 360 // SUN_RAY_COUNT
+CLOUD_ORIGINS = [(200, 40), (420, 55), (540, 25)]
+CLOUD_PUFFS = [(-15, 0, 18), (0, -8, 22), (18, 0, 18), (8, 5, 16)]
+# Horizontal extent of a cloud relative to its origin
+CLOUD_LEFT = min(dx - r for dx, _, r in CLOUD_PUFFS)
+CLOUD_RIGHT = max(dx + r for dx, _, r in CLOUD_PUFFS)
+CLOUD_SPEED = 6.0  # px/s
+SUN_RAY_SPEED = 12.5  # deg/s
+FLOWER_SEED = 42
+FLOWER_COUNT = 18
+
+
+def scene_scale(width: int, height: int) -> float:
+    return min(width / SCENE_W, height / SCENE_H)
+
+
+def _sky_color(y: int, height: int) -> str:
+    top, bottom = hex_to_rgba(SKY_TOP), hex_to_rgba(SKY_BOTTOM)
+    ratio = y / (height // 2)
+    r, g, b = (int(t + (u - t) * ratio) for t, u in zip(top[:3], bottom[:3]))
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def _flower_spots(width: int, height: int, s: float) -> list[tuple[int, int, str, float]]:
+    # Same draw order as the original global random.seed(42) sequence
+    rng = random.Random(FLOWER_SEED)
+    spots = []
+    for _ in range(FLOWER_COUNT):
+        fx = rng.randint(round(10 * s), width - round(10 * s))
+        fy = rng.randint(height // 2 + round(10 * s), height - round(30 * s))
+        spots.append((fx, fy, rng.choice(FLOWER_COLORS), rng.randint(5, 8) * s))
+    return spots
+
+
+def _fence_posts(width: int, s: float) -> range:
+    return range(round(20 * s), width, max(1, round(50 * s)))
+
+
+# ---------------------------------------------------------------------- #
+#  Static scenery as one pre-rendered layer                                #
+# ---------------------------------------------------------------------- #
+
+def draw_garden(buf: PixelBuffer) -> None:
+    w, h = buf.width, buf.height
+    s = scene_scale(w, h)
+
+    def px(v: float) -> int:
+        return round(v * s)
+
+    for y in range(0, h // 2):
+        buf.fill_rect(_sky_color(y, h), 0, y, w, y + 1)
+    buf.fill_rect(GRASS_LIGHT, 0, h // 2 - px(20), w, h)
+    for y in range(h // 2, h, max(1, px(18))):
+        buf.fill_rect(GRASS_DARK, 0, y, w, y + px(8))
+
+    sx, sy, sr = SUN_X * s, SUN_Y * s, SUN_R * s
+    buf.fill_ellipse(SUN_OUTLINE, sx - sr - 1, sy - sr - 1, sx + sr + 1, sy + sr + 1)
+    buf.fill_ellipse(SUN_COLOR, sx - sr + 1, sy - sr + 1, sx + sr - 1, sy + sr - 1)
+
+    fence_y = h // 2 - px(50)
+    for rail_y in (fence_y, fence_y + px(30)):
+        buf.fill_rect(FENCE_COLOR, 0, rail_y, w, rail_y + px(8))
+        buf.stroke_rect(FENCE_POST, 0, rail_y, w - 1, rail_y + px(8))
+    top, peak = fence_y - px(15), px(10) / 2
+    for x in _fence_posts(w, s):
+        buf.fill_rect(FENCE_COLOR, x, top, x + px(10), fence_y + px(50))
+        buf.stroke_rect(FENCE_POST, x, top, x + px(10), fence_y + px(50))
+        buf.fill_polygon(FENCE_POST, [(x - 0.5, top), (x + peak, top - 11 * s),
+                                      (x + px(10) + 0.5, top)])
+        buf.fill_polygon(FENCE_COLOR, [(x + 0.5, top), (x + peak, top - 9 * s),
+                                       (x + px(10) - 0.5, top)])
+
+    for fx, fy, petal, ps in _flower_spots(w, h, s):
+        buf.fill_rect(LEAF_COLOR, fx - max(1, px(1)), fy, fx + max(1, px(1)), fy + px(18))
+        for angle in range(0, 360, 72):
+            dx = math.cos(math.radians(angle)) * ps
+            dy = math.sin(math.radians(angle)) * ps
+            buf.fill_ellipse(petal, fx + dx - 3 * s, fy + dy - 3 * s, fx + dx + 3 * s, fy + dy + 3 * s)
+        buf.fill_ellipse(FLOWER_CENTER, fx - 3 * s, fy - 3 * s, fx + 3 * s, fy + 3 * s)
+
+
+# ---------------------------------------------------------------------- #
+#  Static scenery as individual canvas items (legacy layout)              #
+# ---------------------------------------------------------------------- #
+
+def draw_garden_items(c: tk.Canvas, width: int, height: int, tag: str = '') -> None:
+    s = scene_scale(width, height)
+    for y in range(0, height // 2, 2):
+        c.create_line(0, y, width, y, fill=_sky_color(y, height), tags=tag)
+    c.create_rectangle(0, height // 2 - 20 * s, width, height, fill=GRASS_LIGHT, outline='',
+                       tags=tag)
+    for y in range(height // 2, height, max(1, round(18 * s))):
+        c.create_rectangle(0, y, width, y + 8 * s, fill=GRASS_DARK, outline='', tags=tag)
+    sx, sy, sr = SUN_X * s, SUN_Y * s, SUN_R * s
+    c.create_oval(sx - sr, sy - sr, sx + sr, sy + sr,
+                  fill=SUN_COLOR, outline=SUN_OUTLINE, width=2, tags=tag)
+    fence_y = height // 2 - 50 * s
+    c.create_rectangle(0, fence_y, width, fence_y + 8 * s, fill=FENCE_COLOR, outline=FENCE_POST,
+                       tags=tag)
+    c.create_rectangle(0, fence_y + 30 * s, width, fence_y + 38 * s, fill=FENCE_COLOR,
+                       outline=FENCE_POST, tags=tag)
+    for x in _fence_posts(width, s):
+        c.create_rectangle(x, fence_y - 15 * s, x + 10 * s, fence_y + 50 * s,
+                           fill=FENCE_COLOR, outline=FENCE_POST, tags=tag)
+        c.create_polygon(x, fence_y - 15 * s, x + 5 * s, fence_y - 25 * s, x + 10 * s,
+                         fence_y - 15 * s, fill=FENCE_COLOR, outline=FENCE_POST, tags=tag)
+    for fx, fy, petal, ps in _flower_spots(width, height, s):
+        c.create_line(fx, fy, fx, fy + 18 * s, fill=LEAF_COLOR, width=2, tags=tag)
+        for angle in range(0, 360, 72):
+            dx = math.cos(math.radians(angle)) * ps
+            dy = math.sin(math.radians(angle)) * ps
+            c.create_oval(fx + dx - 3 * s, fy + dy - 3 * s, fx + dx + 3 * s, fy + dy + 3 * s,
+                          fill=petal, outline='', tags=tag)
+        c.create_oval(fx - 3 * s, fy - 3 * s, fx + 3 * s, fy + 3 * s, fill=FLOWER_CENTER,
+                      outline='', tags=tag)
+
+
+# ---------------------------------------------------------------------- #
+#  Live (animated) scenery                                                 #
+# ---------------------------------------------------------------------- #
+
+def sun_ray_coords(i: int, angle_deg: float,
+                   scale: float = 1.0) -> tuple[float, float, float, float]:
+    angle = math.radians(i * (360 / SUN_RAY_COUNT) + angle_deg)
+    x, y = SUN_X * scale, SUN_Y * scale
+    inner, outer = (SUN_R + 8) * scale, (SUN_R + 25) * scale
+    return (x + math.cos(angle) * inner, y + math.sin(angle) * inner,
+            x + math.cos(angle) * outer, y + math.sin(angle) * outer)
+
+
+@functools.lru_cache(maxsize=4)
+def sun_ray_table(scale: float = 1.0) -> tuple[tuple[float, float, float, float], ...]:
+    # Ray coordinates for every whole degree: the ray i slots further round
+    # at rotation a is entry (a + i * SUN_RAY_STEP) % 360, no trig per frame
+    return tuple(sun_ray_coords(0, angle, scale) for angle in range(360))
+
+
+def draw_sun_rays(c: tk.Canvas, scale: float = 1.0) -> list[int]:
+    return [c.create_line(*sun_ray_coords(i, 0, scale), fill=SUN_RAY,
+                          width=max(1, round(4 * scale)))
+            for i in range(SUN_RAY_COUNT)]
+
+
+def make_cloud(c: tk.Canvas, x: int, y: int, tag: str = '', scale: float = 1.0) -> list[int]:
+    ids = []
+    for dx, dy, r in CLOUD_PUFFS:
+        dx, dy, r = dx * scale, dy * scale, r * scale
+        oid = c.create_oval(x + dx - r, y + dy - r, x + dx + r, y + dy + r,
+                            fill=CLOUD_COLOR, outline=CLOUD_OUTLINE, tags=tag)
+        ids.append(oid)
+    return ids
@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import random
+import sys
+import time
+
+from core import (GRID_COLS, GRID_ROWS, MOLE_INTERVAL_MS, MOLE_VISIBLE_MS, TARGET_SCORE,
+                  AsyncioClock, GameCore, GameListener)
+
+# Newline-delimited JSON over a local TCP or Unix socket. Client requests:
+#   {"op": "start", "rows": 4, "cols": 4, "moles": 1, "visible_ms": 800,
+#    "interval_ms": 1000, "target": 10, "seed": 1,
+#    "adaptive": false}                                  every field optional
+#   {"op": "click", "cell": 5, "id": 17}                 id is echoed back
+#   {"op": "stats"}
+#   {"op": "quit"}
+# Server events:
+#   {"event": "started", "session": 3, "rows": 4, "cols": 4, ...}
+#   {"event": "spawn" | "hide" | "timeout", "cell": 5, "t": 1234.5}
+#   {"event": "hit" | "miss", "cell": 5, "id": 17, "score": 1, "misses": 0}
+#   {"event": "over", "score": 10, "misses": 2, "t": 9876.5, "reaction": {...}}
+#   {"event": "stats", "sessions": 120, "games": 480, "cpu_s": 1.2, "wall_s": 30.0}
+#   {"event": "error", "message": "..."}
+# "t" is milliseconds since the session's game started.
+
+MAX_CELLS = 32 * 32
+_START_LIMITS = {'rows': (1, 32), 'cols': (1, 32), 'moles': (1, MAX_CELLS - 1),
+                 'visible_ms': (10, 60_000), 'interval_ms': (10, 60_000),
+                 'target': (1, 100_000)}
+# Counts, as opposed to the millisecond fields, which may be fractional
+_INT_FIELDS = {'rows', 'cols', 'moles', 'target'}
+# Seeds are optional; when given they must be plain non-negative ints
+_SEED_LIMIT = 2 ** 64
+# How long a connection ended over a bad request reads out what the client
+# had already sent
+LINGER_S = 1.0
+
+
+async def _discard(reader: asyncio.StreamReader) -> None:
+    while await reader.read(1 << 16):
+        pass
+
+
+class ServerStats:
+    __slots__ = ('sessions', 'peak_sessions', 'games', 'clicks', 'started_wall', 'started_cpu')
+
+    def __init__(self) -> None:
+        self.sessions = 0
+        self.peak_sessions = 0
+        self.games = 0
+        self.clicks = 0
+        self.started_wall = time.perf_counter()
+        self.started_cpu = time.process_time()
+
+    def as_dict(self) -> dict:
+        return {'sessions': self.sessions, 'peak_sessions': self.peak_sessions,
+                'games': self.games, 'clicks': self.clicks,
+                'cpu_s': round(time.process_time() - self.started_cpu, 4),
+                'wall_s': round(time.perf_counter() - self.started_wall, 4)}
+
+
+class Session(GameListener):
+    # One connection: at most one game at a time, driven by GameCore on the
+    # shared event loop. Events are written without awaiting the socket;
+    # the reader awaits drain() once per request for backpressure.
+
+    _ids = itertools.count(1)
+
+    def __init__(self, writer: asyncio.StreamWriter, stats: ServerStats) -> None:
+        self.id = next(self._ids)
+        self.writer = writer
+        self.stats = stats
+        self.core: GameCore | None = None
+        self._click_id: object = None
+
+    def send(self, message: dict) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+
+    def _t(self) -> float:
+        return round(self.core.clock.now(), 3)
+
+    # -- requests -------------------------------------------------------- #
+
+    def handle(self, request: dict) -> bool:
+        op = request.get('op')
+        if op == 'click':
+            self.click(request)
+        elif op == 'start':
+            self.start(request)
+        elif op == 'stats':
+            self.send({'event': 'stats', **self.stats.as_dict()})
+        elif op == 'quit':
+            return False
+        else:
+            self.send({'event': 'error', 'message': f'unknown op {op!r}'})
+        return True
+
+    def start(self, request: dict) -> None:
+        options = {'rows': GRID_ROWS, 'cols': GRID_COLS, 'moles': 1,
+                   'visible_ms': MOLE_VISIBLE_MS, 'interval_ms': MOLE_INTERVAL_MS,
+                   'target': TARGET_SCORE}
+        for key, (lo, hi) in _START_LIMITS.items():
+            value = request.get(key, options[key])
+            kind = int if key in _INT_FIELDS else (int, float)
+            if not isinstance(value, kind) or isinstance(value, bool) or not lo <= value <= hi:
+                noun = 'an integer' if key in _INT_FIELDS else 'a number'
+                self.send({'event': 'error',
+                           'message': f'{key} must be {noun} between {lo} and {hi}'})
+                return
+            options[key] = value
+        if options['moles'] >= options['rows'] * options['cols']:
+            self.send({'event': 'error', 'message': 'moles must be fewer than the cells'})
+            return
+        adaptive = request.get('adaptive', False)
+        if not isinstance(adaptive, bool):
+            self.send({'event': 'error', 'message': 'adaptive must be true or false'})
+            return
+        seed = request.get('seed')
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)
+                                 or not 0 <= seed < _SEED_LIMIT):
+            self.send({'event': 'error',
+                       'message': f'seed must be an integer between 0 and {_SEED_LIMIT - 1}'})
+            return
+        self.stop()
+        self.core = GameCore(
+            AsyncioClock(asyncio.get_running_loop()), self,
+            rows=options['rows'], cols=options['cols'],
+            visible_ms=options['visible_ms'], interval_ms=options['interval_ms'],
+            target_score=options['target'], rng=random.Random(seed),
+            max_moles=options['moles'], adaptive=adaptive)
+        self.stats.games += 1
+        self.send({'event': 'started', 'session': self.id, 'adaptive': adaptive, **options})
+        self.core.start()
+
+    def click(self, request: dict) -> None:
+        cell = request.get('cell')
+        if self.core is None or self.core.game_over:
+            self.send({'event': 'error', 'message': 'no game running', 'id': request.get('id')})
+            return
+        if not isinstance(cell, int) or isinstance(cell, bool) or not 0 <= cell < self.core.cells:
+            self.send({'event': 'error', 'id': request.get('id'),
+                       'message': f'cell must be an integer between 0 and {self.core.cells - 1}'})
+            return
+        self.stats.clicks += 1
+        self._click_id = request.get('id')
+        self.core.click(cell)
+        self._click_id = None
+
+    def stop(self) -> None:
+        # Drops the game's pending timers along with the game
+        if self.core is not None and not self.core.game_over:
+            self.core.end_game()
+
+    def close(self) -> None:
+        # Stop a disconnected session's game so its timers never fire
+        if self.core is not None:
+            self.core.listener = GameListener()
+            self.stop()
+
+    # -- core listener --------------------------------------------------- #
+
+    def on_spawn(self, index: int) -> None:
+        self.send({'event': 'spawn', 'cell': index, 't': self._t()})
+
+    def on_hide(self, index: int) -> None:
+        self.send({'event': 'hide', 'cell': index, 't': self._t()})
+
+    def on_timeout(self, index: int) -> None:
+        self.send({'event': 'timeout', 'cell': index, 't': self._t()})
+
+    def on_hit(self, index: int, reaction_ms: float) -> None:
+        self.send({'event': 'hit', 'cell': index, 'id': self._click_id,
+                   'score': self.core.score, 'misses': self.core.misses})
+
+    def on_miss(self, index: int) -> None:
+        self.send({'event': 'miss', 'cell': index, 'id': self._click_id,
+                   'score': self.core.score, 'misses': self.core.misses})
+
+    def on_game_over(self) -> None:
+        self.send({'event': 'over', 'score': self.core.score, 'misses': self.core.misses,
+                   't': self._t(), 'reaction': self.core.reaction.as_dict()})
+
+
+class GameServer:
+    def __init__(self) -> None:
+        self.stats = ServerStats()
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        session = Session(writer, self.stats)
+        self.stats.sessions += 1
+        self.stats.peak_sessions = max(self.stats.peak_sessions, self.stats.sessions)
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    session.send({'event': 'error', 'message': 'invalid JSON'})
+                    continue
+                if not isinstance(request, dict) or not session.handle(request):
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        except ValueError:
+            # readline() past the reader's limit; the rest of that line
+            # cannot be told apart from the next request, so end here
+            session.send({'event': 'error', 'message': 'request line too long'})
+            with contextlib.suppress(ConnectionError, asyncio.TimeoutError):
+                await writer.drain()
+                # Closing over unread input resets the connection, which
+                # can discard the reply before the client reads it
+                await asyncio.wait_for(_discard(reader), LINGER_S)
+        finally:
+            session.close()
+            self.stats.sessions -= 1
+            writer.close()
+
+    async def serve(self, host: str, port: int, unix: str | None = None) -> None:
+        if unix:
+            server = await asyncio.start_unix_server(self.handle_connection, unix)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+        print(f'listening on {addresses}', flush=True)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Host many whack-a-mole sessions in one process')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(GameServer().serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,399 @@
+import base64
+import hashlib
+import os
+import struct
+import sys
+import tkinter as tk
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+from palette import DIRT_COLOR, DIRT_RIM, GRASS_LIGHT, MOLE_COLOR
+
+# Bump when the buffer/PNG encoding changes so stale cache entries are ignored
+SPRITE_FORMAT_VERSION = 1
+
+RGBA = tuple[int, int, int, int]
+DrawFn = Callable[..., None]
+
+
+def hex_to_rgba(color: str, alpha: int = 255) -> RGBA:
+    color = color.lstrip('#')
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16), alpha
+
+
+def default_cache_dir() -> Path:
+    override = os.environ.get('WHACK_SPRITE_CACHE')
+    if override:
+        return Path(override)
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+    return Path(base) / 'whack-a-mole' / 'sprites'
+
+
+class PixelBuffer:
+    # Plain RGBA byte buffer; untouched pixels stay fully transparent.
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.data = bytearray(width * height * 4)
+
+    def put(self, color: str | RGBA, x: int, y: int) -> None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            rgba = hex_to_rgba(color) if isinstance(color, str) else color
+            i = (y * self.width + x) * 4
+            self.data[i:i + 4] = bytes(rgba)
+
+    def fill_rect(self, color: str | RGBA, x0: int, y0: int, x1: int, y1: int) -> None:
+        # Same half-open convention as PhotoImage.put(color, to=(x0, y0, x1, y1))
+        rgba = bytes(hex_to_rgba(color) if isinstance(color, str) else color)
+        x0, x1 = max(0, x0), min(self.width, x1)
+        if x1 <= x0:
+            return
+        row = rgba * (x1 - x0)
+        for y in range(max(0, y0), min(self.height, y1)):
+            i = (y * self.width + x0) * 4
+            self.data[i:i + len(row)] = row
+
+    def fill_disc(self, color: str | RGBA, cx: int, cy: int, r: int,
+                  inner: int | None = None) -> None:
+        # Fills dist_sq <= r*r, optionally only where dist_sq >= inner*inner
+        rgba = bytes(hex_to_rgba(color) if isinstance(color, str) else color)
+        r_sq = r * r
+        inner_sq = -1 if inner is None else inner * inner
+        for y in range(max(0, cy - r), min(self.height, cy + r + 1)):
+            dy_sq = (y - cy) ** 2
+            for x in range(max(0, cx - r), min(self.width, cx + r + 1)):
+                dist_sq = (x - cx) ** 2 + dy_sq
+                if inner_sq <= dist_sq <= r_sq:
+                    i = (y * self.width + x) * 4
+                    self.data[i:i + 4] = rgba
+
+    def fill_ellipse(self, color: str | RGBA, x0: float, y0: float,
+                     x1: float, y1: float) -> None:
+        # Pixel centres inside the box-inscribed ellipse, like Canvas ovals
+        rgba = bytes(hex_to_rgba(color) if isinstance(color, str) else color)
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        rx, ry = (x1 - x0) / 2, (y1 - y0) / 2
+        if rx <= 0 or ry <= 0:
+            return
+        for y in range(max(0, int(y0)), min(self.height, int(y1) + 1)):
+            ny = (y + 0.5 - cy) / ry
+            if ny * ny > 1:
+                continue
+            half = rx * (1 - ny * ny) ** 0.5
+            xa = max(0, int(cx - half + 0.5))
+            xb = min(self.width, int(cx + half + 0.5))
+            if xb > xa:
+                i = (y * self.width + xa) * 4
+                self.data[i:i + (xb - xa) * 4] = rgba * (xb - xa)
+
+    def fill_polygon(self, color: str | RGBA, points: list[tuple[float, float]]) -> None:
+        # Even-odd scanline fill sampled at pixel centres
+        rgba = bytes(hex_to_rgba(color) if isinstance(color, str) else color)
+        ys = [p[1] for p in points]
+        edges = list(zip(points, points[1:] + points[:1]))
+        for y in range(max(0, int(min(ys))), min(self.height, int(max(ys)) + 1)):
+            sy = y + 0.5
+            xs = sorted(ax + (sy - ay) * (bx - ax) / (by - ay)
+                        for (ax, ay), (bx, by) in edges
+                        if (ay <= sy < by) or (by <= sy < ay))
+            for xa, xb in zip(xs[::2], xs[1::2]):
+                a = max(0, int(xa + 0.5))
+                b = min(self.width, int(xb + 0.5))
+                if b > a:
+                    i = (y * self.width + a) * 4
+                    self.data[i:i + (b - a) * 4] = rgba * (b - a)
+
+    def stroke_rect(self, color: str | RGBA, x0: int, y0: int, x1: int, y1: int) -> None:
+        # One-pixel outline along the edges of [x0, x1] x [y0, y1]
+        self.fill_rect(color, x0, y0, x1 + 1, y0 + 1)
+        self.fill_rect(color, x0, y1, x1 + 1, y1 + 1)
+        self.fill_rect(color, x0, y0, x0 + 1, y1 + 1)
+        self.fill_rect(color, x1, y0, x1 + 1, y1 + 1)
+
+    def pixels(self) -> list[tuple[int, int, str]]:
+        # Opaque pixels as (x, y, '#rrggbb'), used by the per-pixel baseline
+        out = []
+        d = self.data
+        for y in range(self.height):
+            for x in range(self.width):
+                i = (y * self.width + x) * 4
+                if d[i + 3]:
+                    out.append((x, y, f'#{d[i]:02x}{d[i + 1]:02x}{d[i + 2]:02x}'))
+        return out
+
+    def to_png(self) -> bytes:
+        stride = self.width * 4
+        raw = b''.join(b'\x00' + bytes(self.data[y * stride:(y + 1) * stride])
+                       for y in range(self.height))
+
+        def chunk(tag: bytes, body: bytes) -> bytes:
+            return (struct.pack('>I', len(body)) + tag + body
+                    + struct.pack('>I', zlib.crc32(tag + body) & 0xFFFFFFFF))
+
+        header = struct.pack('>IIBBBBB', self.width, self.height, 8, 6, 0, 0, 0)
+        return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+                + chunk(b'IDAT', zlib.compress(raw, 6)) + chunk(b'IEND', b''))
+
+    @classmethod
+    def from_png(cls, data: bytes) -> 'PixelBuffer':
+        # Reads back what to_png writes (8-bit RGBA, no row filters), which
+        # is all the sprite cache ever holds
+        pos, idat = 8, []
+        width = height = 0
+        while pos < len(data):
+            length, tag = struct.unpack('>I4s', data[pos:pos + 8])
+            body = data[pos + 8:pos + 8 + length]
+            if tag == b'IHDR':
+                width, height = struct.unpack('>II', body[:8])
+            elif tag == b'IDAT':
+                idat.append(body)
+            pos += length + 12
+        raw = zlib.decompress(b''.join(idat))
+        stride = width * 4
+        buf = cls(width, height)
+        buf.data = bytearray(b''.join(raw[y * (stride + 1) + 1:(y + 1) * (stride + 1)]
+                                      for y in range(height)))
+        return buf
+
+
+# ---------------------------------------------------------------------- #
+#  Sprite recipes                                                          #
+# ---------------------------------------------------------------------- #
+
+def draw_hole(buf: PixelBuffer) -> None:
+    # Designed at 100 px; every offset scales with the requested size
+    size = buf.width
+    s = size / 100
+    buf.fill_rect(GRASS_LIGHT, 0, 0, size, size)
+    cx, cy, r = size // 2, size // 2, size // 2 - round(6 * s)
+    buf.fill_disc(DIRT_COLOR, cx, cy, r)
+    buf.fill_disc(DIRT_RIM, cx, cy, r, inner=r - round(4 * s))
+
+
+def draw_mole(buf: PixelBuffer) -> None:
+    draw_hole(buf)
+    size = buf.width
+    s = size / 100
+
+    def rect(color: str, x0: float, y0: float, x1: float, y1: float) -> None:
+        buf.fill_rect(color, cx + round(x0 * s), cy + round(y0 * s),
+                      cx + round(x1 * s), cy + round(y1 * s))
+
+    cx, cy, r = size // 2, size // 2, size // 2 - round(6 * s)
+    buf.fill_disc(MOLE_COLOR, cx, cy, r - round(10 * s))
+    for ex, ey in [(-12, -8), (6, -8)]:
+        rect('#FFFFFF', ex, ey, ex + 10, ey + 10)
+        rect('#000000', ex + 3, ey + 3, ex + 7, ey + 7)
+    rect('#FF8A80', -4, 2, 4, 8)
+    rect('#4E342E', -10, 10, 10, 14)
+
+
+def draw_hammer(buf: PixelBuffer, smash: bool = False) -> None:
+    # Designed at 32 px
+    s = buf.width / 32
+    handle = '#8B4513'
+    handle_hi = '#A0522D'
+    head = '#757575'
+    head_hi = '#9E9E9E'
+    head_dk = '#424242'
+
+    def rect(color: str, x0: float, y0: float, x1: float, y1: float) -> None:
+        buf.fill_rect(color, round(x0 * s), round(y0 * s), round(x1 * s), round(y1 * s))
+
+    if not smash:
+        # Handle diagonal lower-right
+        width, lit = max(1, round(3 * s)), max(1, round(2 * s))
+        for i in range(round(16 * s)):
+            bx, by = round(8 * s) + i, round(16 * s) + i
+            for d in range(width):
+                buf.put(handle if d < lit else handle_hi, bx + d, by)
+        # Head block at top-left
+        rect(head_hi, 2, 10, 20, 13)
+        rect(head, 2, 13, 20, 18)
+        rect(head_dk, 2, 18, 20, 20)
+        rect('#BDBDBD', 3, 11, 19, 12)
+    else:
+        # Handle vertical
+        for d in range(3):
+            rect(handle if d < 2 else handle_hi, 14 + d, 16, 15 + d, 32)
+        # Head block horizontal on top
+        rect(head_hi, 4, 6, 28, 9)
+        rect(head, 4, 9, 28, 16)
+        rect(head_dk, 4, 16, 28, 18)
+        rect('#BDBDBD', 5, 7, 27, 8)
+
+
+# (name, recipe, size, kwargs) for every sprite built at startup
+STARTUP_SPRITES: list[tuple[str, DrawFn, int, dict]] = [
+    ('hole', draw_hole, 100, {}),
+    ('mole', draw_mole, 100, {}),
+    ('hammer', draw_hammer, 32, {'smash': False}),
+    ('hammer_smash', draw_hammer, 32, {'smash': True}),
+]
+
+
+Size = int | tuple[int, int]
+
+
+def rasterize(draw: DrawFn, size: Size, **kwargs: object) -> PixelBuffer:
+    width, height = (size, size) if isinstance(size, int) else size
+    buf = PixelBuffer(width, height)
+    draw(buf, **kwargs)
+    return buf
+
+
+_module_digests: dict[str, bytes] = {}
+
+
+def _recipe_digest(draw: DrawFn) -> bytes:
+    # Recipes call helpers and read palette constants, so hash the source of
+    # the recipe's module and the palette rather than the function alone.
+    module = draw.__module__
+    if module not in _module_digests:
+        h = hashlib.sha256()
+        for name in (module, 'palette', __name__):
+            path = getattr(sys.modules.get(name), '__file__', None)
+            if path:
+                h.update(Path(path).read_bytes())
+        _module_digests[module] = h.digest()
+    return _module_digests[module]
+
+
+def sprite_key(name: str, draw: DrawFn, size: Size, kwargs: dict) -> str:
+    # Editing a recipe (or the palette) invalidates its cached PNG without
+    # a manual version bump.
+    h = hashlib.sha256()
+    h.update(f'{SPRITE_FORMAT_VERSION}|{name}|{size}|{sorted(kwargs.items())!r}'.encode())
+    h.update(_recipe_digest(draw))
+    dims = size if isinstance(size, int) else 'x'.join(map(str, size))
+    return f'{name}-{dims}-{h.hexdigest()[:16]}'
+
+
+class SpriteCache:
+    # Builds PhotoImages from sprite recipes with one bulk Tk load each,
+    # persisting the encoded PNGs so later launches skip rasterization.
+
+    def __init__(self, cache_dir: Path | None = None, enabled: bool = True) -> None:
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def png_bytes(self, name: str, draw: DrawFn, size: Size, **kwargs: object) -> bytes:
+        path = self.cache_dir / f'{sprite_key(name, draw, size, kwargs)}.png'
+        if self.enabled:
+            try:
+                data = path.read_bytes()
+                self.hits += 1
+                return data
+            except OSError:
+                pass
+        self.misses += 1
+        data = rasterize(draw, size, **kwargs).to_png()
+        if self.enabled:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+            except OSError:
+                # A read-only home directory just means no cache
+                pass
+        return data
+
+    def photo(self, name: str, draw: DrawFn, size: Size, **kwargs: object) -> tk.PhotoImage:
+        return photo_from_png(self.png_bytes(name, draw, size, **kwargs))
+
+
+def photo_from_png(data: bytes) -> tk.PhotoImage:
+    return tk.PhotoImage(data=base64.b64encode(data).decode('ascii'), format='png')
+
+
+# ---------------------------------------------------------------------- #
+#  Scaled variants                                                         #
+# ---------------------------------------------------------------------- #
+
+# Layout scales snap to this step so a resize drag only ever asks for a
+# handful of sprite sizes
+SCALE_STEP = 0.125
+MIN_SCALE = 0.5
+ATLAS_MAX_BYTES = 32 * 1024 * 1024
+
+
+def quantize_scale(scale: float) -> float:
+    return max(MIN_SCALE, scale // SCALE_STEP * SCALE_STEP)
+
+
+class SpriteAtlas:
+    # Every registered recipe at any size, rasterized on first request and
+    # memoized in LRU order. The budget counts decoded pixels at the four
+    # bytes each Tk keeps per pixel. Eviction only drops the atlas's own
+    # reference: an image a widget still shows stays alive through its
+    # holder until that moves on to another size.
+
+    def __init__(self, cache: SpriteCache | None = None,
+                 max_bytes: int = ATLAS_MAX_BYTES) -> None:
+        self.cache = cache or SpriteCache()
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # name -> (recipe, base size, persist every size, recipe kwargs)
+        self._recipes: dict[str, tuple[DrawFn, Size, bool, dict]] = {}
+        self._images: OrderedDict[tuple[str, int, int], tk.PhotoImage] = OrderedDict()
+        for name, draw, size, kwargs in STARTUP_SPRITES:
+            self.register(name, draw, size, **kwargs)
+
+    def register(self, name: str, draw: DrawFn, size: Size, persist_scaled: bool = True,
+                 **kwargs: object) -> None:
+        # persist_scaled=False keeps only the base size in the disk cache,
+        # for images sized to the window rather than to a quantized scale
+        self._recipes[name] = (draw, size, persist_scaled, kwargs)
+
+    def base_size(self, name: str) -> tuple[int, int]:
+        size = self._recipes[name][1]
+        return (size, size) if isinstance(size, int) else size
+
+    def scaled(self, name: str, scale: float) -> tk.PhotoImage:
+        width, height = self.base_size(name)
+        return self.photo(name, (max(1, round(width * scale)), max(1, round(height * scale))))
+
+    def photo(self, name: str, size: Size) -> tk.PhotoImage:
+        width, height = (size, size) if isinstance(size, int) else size
+        key = (name, width, height)
+        image = self._images.get(key)
+        if image is not None:
+            self.hits += 1
+            self._images.move_to_end(key)
+            return image
+        self.misses += 1
+        image = photo_from_png(self._png(name, width, height))
+        self._images[key] = image
+        self.bytes += width * height * 4
+        # Least recently used first; the image just built is last, so kept
+        while self.bytes > self.max_bytes and len(self._images) > 1:
+            (_, w, h), _ = self._images.popitem(last=False)
+            self.bytes -= w * h * 4
+            self.evictions += 1
+        return image
+
+    def pixels(self, name: str, size: Size) -> PixelBuffer:
+        # The same sprite as raw RGBA, for software compositing; goes
+        # through the disk cache but is not kept in the atlas
+        width, height = (size, size) if isinstance(size, int) else size
+        return PixelBuffer.from_png(self._png(name, width, height))
+
+    def _png(self, name: str, width: int, height: int) -> bytes:
+        draw, base, persist_scaled, kwargs = self._recipes[name]
+        dims = width if width == height and isinstance(base, int) else (width, height)
+        if persist_scaled or (width, height) == self.base_size(name):
+            return self.cache.png_bytes(name, draw, dims, **kwargs)
+        return rasterize(draw, dims, **kwargs).to_png()
+
+    def stats(self) -> dict:
+        return {'images': len(self._images), 'bytes': self.bytes, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
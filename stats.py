@@ -0,0 +1,111 @@
+import math
+
+# Constant-memory estimators for per-hit reaction times: however long a
+# session runs, each one holds a fixed handful of floats.
+
+
+class P2Quantile:
+    # Jain & Chlamtac's P-square estimator: five markers track the minimum,
+    # p/2, p, (1+p)/2 quantiles and the maximum, nudged by a piecewise
+    # parabolic fit as samples arrive. O(1) memory and time per sample.
+
+    __slots__ = ('p', 'count', 'q', 'n', 'np', 'dn')
+
+    def __init__(self, p: float) -> None:
+        self.p = p
+        self.count = 0
+        self.q: list[float] = []
+        self.n = [0, 1, 2, 3, 4]
+        self.np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        q = self.q
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        n = self.n
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.np[i] += self.dn[i]
+        for i in range(1, 4):
+            d = self.np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = qp
+                n[i] += s
+
+    @property
+    def value(self) -> float:
+        if self.count > 5:
+            return self.q[2]
+        if not self.q:
+            return 0.0
+        # Too few samples for the markers: read the sorted samples directly
+        pos = self.p * (len(self.q) - 1)
+        lo = math.floor(pos)
+        hi = min(lo + 1, len(self.q) - 1)
+        return self.q[lo] + (self.q[hi] - self.q[lo]) * (pos - lo)
+
+
+class StreamingStats:
+    # Mean and variance (Welford), an exponentially weighted mean that
+    # follows the player's current form, and P-square quantiles.
+
+    __slots__ = ('count', 'mean', 'm2', 'ewma', 'alpha', 'min', 'max', 'quantiles')
+
+    def __init__(self, quantiles: tuple[float, ...] = (0.5, 0.9), alpha: float = 0.2) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ewma = 0.0
+        self.alpha = alpha
+        self.min = math.inf
+        self.max = -math.inf
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.ewma = x if self.count == 1 else self.ewma + self.alpha * (x - self.ewma)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    def quantile(self, p: float) -> float:
+        return self.quantiles[p].value
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def as_dict(self) -> dict:
+        if not self.count:
+            return {'count': 0}
+        summary = {'count': self.count, 'mean_ms': round(self.mean, 1),
+                   'std_ms': round(self.std, 1), 'recent_ms': round(self.ewma, 1),
+                   'min_ms': round(self.min, 1), 'max_ms': round(self.max, 1)}
+        for p, estimator in self.quantiles.items():
+            summary[f'p{round(p * 100)}_ms'] = round(estimator.value, 1)
+        return summary
@@ -0,0 +1,65 @@
+import bisect
+import math
+from typing import Callable, Generic, Sequence, TypeVar
+
+# Keyframe tracks built once at import and shared by every effect that
+# uses them. Reading one is an index computation and a list lookup,
+# whatever curve, easing or colour ramp went into building it.
+
+T = TypeVar('T')
+Easing = Callable[[float], float]
+
+
+def linear(u: float) -> float:
+    return u
+
+
+class Track(Generic[T]):
+    # Values at fixed time steps from 0; sampling past the end holds the
+    # last value, like an effect's final frame.
+
+    __slots__ = ('values', 'step', 'duration', '_last')
+
+    def __init__(self, values: Sequence[T], step: float) -> None:
+        self.values = list(values)
+        self.step = step
+        self.duration = len(self.values) * step
+        self._last = len(self.values) - 1
+
+    def index(self, elapsed: float) -> int:
+        return min(self._last, int(elapsed / self.step))
+
+    def at(self, elapsed: float) -> T:
+        return self.values[min(self._last, int(elapsed / self.step))]
+
+
+def keyframes(points: Sequence[tuple[float, float]], step: float = 1 / 120,
+              easing: Easing = linear, digits: int = 2) -> Track[float]:
+    # Samples a piecewise curve through (time, value) keys, eased within
+    # each segment, rounded to `digits` so equal frames compare equal
+    times = [t for t, _ in points]
+    samples = []
+    for k in range(int(round(times[-1] / step)) + 1):
+        t = k * step
+        i = min(len(points) - 2, max(0, bisect.bisect_right(times, t) - 1))
+        (t0, v0), (t1, v1) = points[i], points[i + 1]
+        u = min(1.0, max(0.0, (t - t0) / (t1 - t0)))
+        samples.append(round(v0 + (v1 - v0) * easing(u), digits))
+    return Track(samples, step)
+
+
+class Periodic:
+    # One period of fn(phase) sampled at n points, read by phase in radians
+    __slots__ = ('values', 'n', '_per_radian')
+
+    def __init__(self, fn: Callable[[float], float], n: int = 512) -> None:
+        self.values = [fn(2 * math.pi * k / n) for k in range(n)]
+        self.n = n
+        self._per_radian = n / (2 * math.pi)
+
+    def __call__(self, phase: float) -> float:
+        return self.values[int(phase * self._per_radian) % self.n]
+
+
+# 1 - cos(phase): the side-to-side sway of falling confetti
+SWAY = Periodic(lambda phase: 1 - math.cos(phase))